@@ -0,0 +1,127 @@
+"""Benchmarks of the app's hot paths on synthetic data of increasing size.
+
+Benchmarks are registered with ``@benchmark(name, sizes)``. The decorated
+function takes a size, does its setup and returns the callable to time, so
+only the hot path is measured. Results are appended to a JSON-lines history,
+one record per benchmark and size, tagged with the git commit. ``compare``
+can then put two commits side by side.
+
+    python -m benchmarks run [--quick] [-k substring]
+    python -m benchmarks compare [BASE [HEAD]]
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HISTORY = Path(__file__).resolve().parent / "history.jsonl"
+
+# Dataset sizes: today's eight countries / 28 reservoirs up to thousands of entities and 100k sites
+ENTITY_SIZES = [8, 250, 2500]
+RESERVOIR_SIZES = [28, 1000, 10_000, 100_000]
+
+REGISTRY = {}
+
+
+def benchmark(name, sizes):
+    """Register ``setup(size) -> callable`` under ``name`` for each of ``sizes``."""
+    def register(setup):
+        REGISTRY[name] = (setup, list(sizes))
+        return setup
+    return register
+
+
+def measure(run, min_time=0.2, max_repeats=50, min_repeats=3):
+    """Wall times in seconds of ``run()``, repeated until ``min_time`` has passed."""
+    times = []
+    start = time.perf_counter()
+    while len(times) < min_repeats or (time.perf_counter() - start < min_time and len(times) < max_repeats):
+        t = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - t)
+    return times
+
+
+def git_commit():
+    """``(sha, dirty)`` of the working tree, or ``(None, None)`` outside git."""
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short=12", "HEAD"], cwd=ROOT, capture_output=True,
+                             text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return sha, dirty
+
+
+def environment():
+    return {"python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count(),
+            "platform": sys.platform}
+
+
+def run(names=None, quick=False, min_time=0.2, history=HISTORY, log=print):
+    """Run the selected benchmarks, append them to ``history`` and return the records."""
+    # Registers the benchmarks
+    from benchmarks import suite  # noqa: F401
+
+    sha, dirty = git_commit()
+    stamp = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    records = []
+    for name, (setup, sizes) in REGISTRY.items():
+        if names and not any(n in name for n in names):
+            continue
+        for size in sizes[:2] if quick else sizes:
+            call = setup(size)
+            if call is None:
+                log(f"{name:<32} {size:>8}  skipped")
+                continue
+            times = measure(call, min_time=min_time)
+            record = {"commit": sha, "dirty": dirty, "timestamp": stamp, "benchmark": name, "size": size,
+                      "median_s": statistics.median(times), "min_s": min(times), "repeats": len(times),
+                      **environment()}
+            records.append(record)
+            log(f"{name:<32} {size:>8}  median {record['median_s'] * 1e3:10.3f} ms   min {record['min_s'] * 1e3:10.3f} ms"
+                f"   ({len(times)} runs)")
+    if history is not None:
+        with open(history, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+    return records
+
+
+def load_history(history=HISTORY):
+    if not Path(history).exists():
+        return []
+    with open(history, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare(base=None, head=None, history=HISTORY, threshold=1.2):
+    """``(benchmark, size, base_s, head_s, ratio, regressed)`` rows for two commits of the history.
+
+    Without arguments the last two commits in the history are compared. The
+    latest run of each benchmark and size is used for each commit.
+    """
+    records = load_history(history)
+    commits = list(dict.fromkeys(r["commit"] for r in records))
+    if head is None:
+        head = commits[-1] if commits else None
+    if base is None:
+        earlier = [c for c in commits if c != head]
+        base = earlier[-1] if earlier else None
+    latest = {}
+    for r in records:
+        latest[(r["commit"], r["benchmark"], r["size"])] = r["median_s"]
+    rows = []
+    for (commit, name, size), head_s in latest.items():
+        if commit != head or (base, name, size) not in latest:
+            continue
+        base_s = latest[(base, name, size)]
+        ratio = head_s / base_s if base_s else float("inf")
+        rows.append((name, size, base_s, head_s, ratio, ratio > threshold))
+    return base, head, rows
@@ -0,0 +1,40 @@
+import argparse
+
+from benchmarks import HISTORY, compare, run
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark the app's hot paths")
+    parser.add_argument("--history", default=str(HISTORY), help="JSON-lines results file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run benchmarks and append the results to the history")
+    run_parser.add_argument("-k", action="append", dest="names", help="only benchmarks whose name contains this")
+    run_parser.add_argument("--quick", action="store_true", help="only the two smallest sizes")
+    run_parser.add_argument("--min-time", type=float, default=0.2, help="seconds to repeat each benchmark for")
+    run_parser.add_argument("--no-save", action="store_true", help="do not write to the history")
+
+    compare_parser = commands.add_parser("compare", help="compare two commits of the history")
+    compare_parser.add_argument("base", nargs="?", help="base commit (default: the one before head)")
+    compare_parser.add_argument("head", nargs="?", help="head commit (default: the latest)")
+    compare_parser.add_argument("--threshold", type=float, default=1.2, help="slowdown ratio flagged as a regression")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        run(args.names, args.quick, args.min_time, None if args.no_save else args.history)
+        return
+
+    base, head, rows = compare(args.base, args.head, args.history, args.threshold)
+    if not rows:
+        print("Nothing to compare: the history needs runs from two commits.")
+        return
+    print(f"{'benchmark':<32} {'size':>8} {base:>14} {head:>14}   ratio")
+    for name, size, base_s, head_s, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<32} {size:>8} {base_s * 1e3:11.3f} ms {head_s * 1e3:11.3f} ms   {ratio:5.2f}{flag}")
+    if any(row[-1] for row in rows):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""The benchmarked hot paths. Each function builds its inputs and returns what to time."""
+import functools
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks import ENTITY_SIZES, RESERVOIR_SIZES, benchmark
+from ccs import synthetic
+from ccs.emissions import SOURCES, reshape_emissions
+
+# Created once per run, removed at exit
+_TMP = tempfile.TemporaryDirectory(prefix="ccs-bench-")
+
+
+# --- Shared synthetic inputs, built once per size ---
+@functools.lru_cache(maxsize=None)
+def _wide(n):
+    return synthetic.emissions_table(n)
+
+
+@functools.lru_cache(maxsize=None)
+def _csv(n):
+    path = Path(_TMP.name) / f"emissions-{n}.csv"
+    _wide(n).to_csv(path, index=False)
+    return path
+
+
+@functools.lru_cache(maxsize=None)
+def _long(n):
+    return reshape_emissions(_wide(n))
+
+
+@functools.lru_cache(maxsize=None)
+def _cube(n):
+    from ccs.cube import EmissionsCube
+
+    return EmissionsCube.from_long(_long(n), regions=_regions(n))
+
+
+@functools.lru_cache(maxsize=None)
+def _regions(n):
+    """``{region: countries}`` for every node of the synthetic tree, like ``ccs.regions.REGIONS``."""
+    from ccs.regions import region_countries
+
+    tree = synthetic.region_tree(synthetic.country_names(n))
+    return {region: region_countries(region, tree) for region in tree}
+
+
+@functools.lru_cache(maxsize=None)
+def _catalog(n):
+    from ccs.catalog import ReservoirCatalog
+
+    df = synthetic.reservoir_table(n)
+    return ReservoirCatalog.from_frame(df, synthetic.reservoir_capacities(df), version=f"synthetic-{n}")
+
+
+def _queried(n, count=8):
+    """The same number of queried countries at every size, so timings show the effect of data size."""
+    return synthetic.country_names(n)[:count]
+
+
+# --- CSV / data load and reshape ---
+@benchmark("load.read_csv", ENTITY_SIZES)
+def read_csv(n):
+    import pandas as pd
+
+    path = _csv(n)
+    return lambda: pd.read_csv(path)
+
+
+@benchmark("load.binary_cache", ENTITY_SIZES)
+def binary_cache(n):
+    from ccs.datacache import ensure_table, load_table
+
+    path, cache = _csv(n), Path(_TMP.name) / ".cache"
+    ensure_table(path, cache)
+    return lambda: load_table(path, cache)
+
+
+@benchmark("load.melt", ENTITY_SIZES)
+def melt(n):
+    wide = _wide(n)
+    return lambda: reshape_emissions(wide)
+
+
+@benchmark("load.cube_build", ENTITY_SIZES)
+def cube_build(n):
+    from ccs.cube import EmissionsCube
+
+    long, regions = _long(n), _regions(n)
+    return lambda: EmissionsCube.from_long(long, regions=regions)
+
+
+@benchmark("load.ingest_stream", ENTITY_SIZES)
+def ingest_stream(n):
+    """Chunked ingestion of the same CSV straight into the cube arrays."""
+    from ccs.ingest import ingest
+
+    path = _csv(n)
+    return lambda: ingest(path, keep_all=True)[0].cube(_regions(n))
+
+
+# --- Table View filters and group-bys ---
+@benchmark("table.pandas_filter_groupby", ENTITY_SIZES)
+def pandas_filter(n):
+    """The filter-and-group the Table View did on the long frame before the cube."""
+    long, countries = _long(n), _queried(n)
+
+    def run():
+        for country in countries:
+            rows = long[(long["Country"] == country) & long["Year"].between(2000, 2020)]
+            rows.groupby("Year", as_index=False)["Emissions (Mt)"].sum()
+    return run
+
+
+@benchmark("table.cube_country_table", ENTITY_SIZES)
+def country_table(n):
+    cube, countries = _cube(n), _queried(n)
+
+    def run():
+        for country in countries:
+            cube.country_table(country, (2000, 2020), "All")
+            cube.country_total(country, (2000, 2020))
+    return run
+
+
+@benchmark("table.cube_region_table", ENTITY_SIZES)
+def region_table(n):
+    cube = _cube(n)
+    regions = list(_regions(n))[:8]
+
+    def run():
+        for region in regions:
+            cube.region_table(region, (2000, 2020), "All")
+    return run
+
+
+# --- Chart data preparation ---
+@benchmark("chart.by_year", ENTITY_SIZES)
+def by_year(n):
+    cube, countries = _cube(n), _queried(n)
+    return lambda: [cube.by_year((1990, 2023), SOURCES, country=c) for c in countries]
+
+
+@benchmark("chart.by_period", ENTITY_SIZES)
+def by_period(n):
+    cube, countries = _cube(n), _queried(n)
+    cube.rollup("5-year")  # precomputed in the app
+    return lambda: [cube.by_period((1993, 2021), SOURCES, "5-year", country=c) for c in countries]
+
+
+@benchmark("chart.by_country", ENTITY_SIZES)
+def by_country(n):
+    cube = _cube(n)
+    root = next(iter(_regions(n)))
+    return lambda: cube.by_country((1990, 2023), SOURCES, root)
+
+
+@benchmark("chart.forecast_fit", ENTITY_SIZES)
+def forecast_fit(n):
+    from ccs.forecast import fit_trends
+
+    cube = _cube(n)
+    return lambda: fit_trends(cube, "linear").project(100)
+
+
+# --- Capacity equations and CO₂ density ---
+@benchmark("capacity.evaluate", RESERVOIR_SIZES)
+def evaluate(n):
+    from ccs.capacity import evaluate
+
+    inputs = synthetic.reservoir_inputs(n)
+    return lambda: evaluate(inputs)
+
+
+@benchmark("capacity.density_table", RESERVOIR_SIZES)
+def density_table(n):
+    from ccs.co2_density import co2_density
+
+    inputs = synthetic.reservoir_inputs(n)
+    P, T = inputs["P (Pa)"].to_numpy(), inputs["T (K)"].to_numpy()
+    return lambda: co2_density(P, T)
+
+
+@benchmark("capacity.density_propssi", RESERVOIR_SIZES[:3])
+def density_propssi(n):
+    """The notebook's per-call CoolProp density, for comparison with the table."""
+    try:
+        from CoolProp.CoolProp import PropsSI
+    except ImportError:
+        return None
+    inputs = synthetic.reservoir_inputs(n)
+    P, T = inputs["P (Pa)"].to_numpy(), inputs["T (K)"].to_numpy()
+    return lambda: [PropsSI("D", "P", p, "T", t, "CO2") for p, t in zip(P, T)]
+
+
+# --- Balance rollups ---
+@benchmark("balance.rollup", ENTITY_SIZES)
+def rollup(n):
+    from ccs.balance import rollup
+
+    countries = synthetic.country_names(n)
+    cube = _cube(n)
+    emissions = dict(zip(cube.countries, cube.range_totals((1990, 2023)).sum(axis=1)))
+    storage = dict(zip(countries, np.linspace(10, 5000, n)))
+    tree = synthetic.region_tree(countries)
+    return lambda: rollup(emissions, storage, tree)
+
+
+# --- Map construction ---
+@benchmark("map.folium_html", RESERVOIR_SIZES)
+def folium_map(n):
+    """Full-page map HTML for small catalogs; the clustered viewport layer for large ones."""
+    from ccs import maps
+
+    catalog = _catalog(n)
+    if not maps.is_large(catalog, "America"):
+        return lambda: maps.build_map(catalog, "America").get_root().render()
+    rows = catalog.rows()
+    zoom = maps.view_center("America")[1]
+
+    def run():
+        visible, sites = maps.visible_rows(catalog, rows, zoom=zoom)
+        page = maps.base_map("America")
+        maps.cluster_layer(catalog, visible, sites).add_to(page)
+        page.get_root().render()
+    return run
+
+
+@benchmark("map.bbox_query", RESERVOIR_SIZES)
+def bbox_query(n):
+    from ccs.spatial import SpatialIndex
+
+    catalog = _catalog(n)
+    index = SpatialIndex.from_catalog(catalog)
+    return lambda: index.in_bbox(-10, -80, 10, -60)
+
+
+@benchmark("map.nearest", RESERVOIR_SIZES)
+def nearest(n):
+    from ccs.spatial import SpatialIndex
+
+    catalog = _catalog(n)
+    index = SpatialIndex.from_catalog(catalog)
+    index.tree  # built outside the timing
+    rng = np.random.default_rng(0)
+    lat, lon = rng.uniform(-40, 50, 1000), rng.uniform(-110, -40, 1000)
+    return lambda: index.nearest(lat, lon, k=5)
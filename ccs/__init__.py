@@ -0,0 +1 @@
+"""Data access and analysis helpers shared by the CCS America app."""
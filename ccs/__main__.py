@@ -0,0 +1,105 @@
+"""Command line for the ccs query API.
+
+    python -m ccs emissions --country Brazil --source Coal --years 2000 2020
+    python -m ccs balance --level Region --format json
+    python -m ccs batch queries.txt --format json
+
+``batch`` runs one query per line of a file (same arguments as on the command
+line, ``#`` starts a comment) in a single process, so the data is only loaded
+once. Each line may take its own ``--format`` and ``-o FILE``; results without
+one go to stdout in the batch's format.
+"""
+import argparse
+import shlex
+import sys
+
+from ccs import api, forecast
+from ccs.rollups import RESOLUTIONS
+
+
+def _parser():
+    parser = argparse.ArgumentParser(prog="python -m ccs", description="Query CCS America data as CSV or JSON")
+    commands = parser.add_subparsers(dest="command", required=True)
+    # Output options go after the command, also on batch lines
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("--format", choices=["csv", "json"], help="output format (default: csv)")
+    output.add_argument("-o", "--output", help="write to this file instead of stdout")
+
+    emissions = commands.add_parser("emissions", help="emissions by country or region and source", parents=[output])
+    emissions.add_argument("--country", action="append", dest="countries")
+    emissions.add_argument("--region", action="append", dest="regions")
+    emissions.add_argument("--source", action="append", dest="sources")
+    emissions.add_argument("--years", nargs=2, type=int, metavar=("FIRST", "LAST"))
+    emissions.add_argument("--per-year", action="store_true", help="one row per year instead of totals")
+    emissions.add_argument("--resolution", choices=list(RESOLUTIONS), help="one row per period instead of totals")
+
+    capacity = commands.add_parser("capacity", help="storage capacity per reservoir", parents=[output])
+    capacity.add_argument("--reservoir", action="append", dest="reservoirs")
+    capacity.add_argument("--country", action="append", dest="countries")
+    capacity.add_argument("--region", action="append", dest="regions")
+
+    balance = commands.add_parser("balance", help="carbon balance rollup", parents=[output])
+    balance.add_argument("--level", choices=["Total", "Region", "Country"])
+    balance.add_argument("--name", action="append", dest="names")
+
+    for name, help_text in (("years-to-fill", "years of projected emissions the storage absorbs"),
+                            ("projection", "historical and projected total emissions")):
+        command = commands.add_parser(name, help=help_text, parents=[output])
+        command.add_argument("--model", choices=forecast.MODELS, default="linear")
+        command.add_argument("--window", type=int, default=forecast.DEFAULT_WINDOW)
+        command.add_argument("--horizon", type=int, default=forecast.DEFAULT_HORIZON)
+        if name == "projection":
+            command.add_argument("--country", action="append", dest="countries")
+            command.add_argument("--region", action="append", dest="regions")
+
+    batch = commands.add_parser("batch", help="run one query per line of a file", parents=[output])
+    batch.add_argument("file", help="query file, '-' for stdin")
+    return parser
+
+
+def query(args):
+    """DataFrame for parsed query arguments."""
+    if args.command == "emissions":
+        years = tuple(args.years) if args.years else None
+        return api.emissions(args.countries, args.regions, args.sources, years, args.per_year, args.resolution)
+    if args.command == "capacity":
+        return api.capacity(args.reservoirs, args.countries, args.regions)
+    if args.command == "balance":
+        return api.balance(args.level, args.names)
+    if args.command == "years-to-fill":
+        return api.years_to_fill(args.model, args.window, args.horizon)
+    return api.projection(args.countries, args.regions, args.model, args.window, args.horizon)
+
+
+def _run(args, fmt):
+    df = query(args)
+    fmt = args.format or fmt
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as out:
+            api.write(df, out, fmt)
+    else:
+        api.write(df, sys.stdout, fmt)
+
+
+def main(argv=None):
+    parser = _parser()
+    args = parser.parse_args(argv)
+    try:
+        if args.command != "batch":
+            _run(args, "csv")
+            return
+        lines = sys.stdin if args.file == "-" else open(args.file, encoding="utf-8")
+        with lines:
+            for line in lines:
+                words = shlex.split(line, comments=True)
+                if words:
+                    line_args = parser.parse_args(words)
+                    if line_args.command == "batch":
+                        parser.error("batch files cannot run other batch files")
+                    _run(line_args, args.format or "csv")
+    except KeyError as error:
+        parser.exit(2, f"error: {error.args[0]}\n")
+
+
+if __name__ == "__main__":
+    main()
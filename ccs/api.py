@@ -0,0 +1,120 @@
+"""Query API for batch use: emissions, capacity, balance and projections as DataFrames.
+
+Everything here runs without Streamlit, Plotly or folium and only needs
+pandas and NumPy, so scripts and nightly jobs can import it directly or go
+through the command line (``python -m ccs --help``). Data is loaded on the
+first query and reused by every later one in the same process.
+"""
+import numpy as np
+import pandas as pd
+
+from ccs import forecast
+from ccs.balance import balance as _balance
+from ccs.capacity import default_capacities
+from ccs.catalog import load_catalog
+from ccs.cube import VALUE_COL, load_cube
+from ccs.regions import REGIONS
+from ccs.rollups import RESOLUTIONS
+
+
+def _as_list(values):
+    if values is None:
+        return None
+    return [values] if isinstance(values, str) else list(values)
+
+
+def emissions(countries=None, regions=None, sources=None, years=None, per_year=False, resolution=None):
+    """Emissions per Country or Region and Source, summed over ``years`` or one row per year.
+
+    ``countries`` and ``regions`` are names or lists of names; with neither
+    every country is returned. ``years`` is an inclusive ``(first, last)``
+    range and defaults to all years. ``resolution`` (``"5-year"`` or
+    ``"Decade"``, see ``ccs.rollups.RESOLUTIONS``) gives one row per period
+    instead. Unknown names raise ``KeyError``.
+    """
+    cube = load_cube()
+    years = (int(cube.years[0]), int(cube.years[-1])) if years is None else (int(years[0]), int(years[-1]))
+    sources = _as_list(sources) or list(cube.sources)
+    countries, regions = _as_list(countries), _as_list(regions)
+    if countries is None and regions is None:
+        countries = list(cube.countries)
+    targets = [("Country", c) for c in countries or []] + [("Region", r) for r in regions or []]
+    for kind, name in targets:
+        if name not in (cube.country_index if kind == "Country" else cube.region_index):
+            raise KeyError(f"Unknown {kind.lower()}: {name!r}")
+    unknown = [s for s in sources if s not in cube.source_index]
+    if unknown:
+        raise KeyError(f"Unknown source: {unknown[0]!r}")
+    if resolution is not None and resolution not in RESOLUTIONS:
+        raise KeyError(f"Unknown resolution: {resolution!r}")
+
+    frames = []
+    for kind, name in targets:
+        key = {"country": name} if kind == "Country" else {"region": name}
+        if resolution not in (None, "Annual"):
+            df = cube.by_period(years, sources, resolution, **key)
+        elif per_year or resolution == "Annual":
+            df = cube.by_year(years, sources, **key)
+        else:
+            total = cube.country_total if kind == "Country" else cube.region_total
+            df = pd.DataFrame({"Source": sources, VALUE_COL: [total(name, years, s) for s in sources]})
+        df.insert(0, kind, name)
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame(columns=["Country", "Source", VALUE_COL])
+    return pd.concat(frames, ignore_index=True)
+
+
+def capacity(reservoirs=None, countries=None, regions=None):
+    """Catalog capacities and the Equation 1 / Equation 2 estimates for a set of reservoirs."""
+    catalog = load_catalog()
+    rows = catalog.rows(country=_as_list(countries), region=_as_list(regions))
+    df = catalog.frame(rows, ["Reservoir", "Region", "Country", "Formation", "Capacity (Mt)"])
+    if reservoirs is not None:
+        df = df[df["Reservoir"].isin(_as_list(reservoirs))]
+    estimates = default_capacities().set_index("Reservoir")[["Eq. 1 (Mt)", "Eq. 2 (Mt)"]]
+    return df.join(estimates, on="Reservoir").reset_index(drop=True)
+
+
+def balance(level=None, names=None):
+    """Carbon-balance rollup; ``level`` is ``"Total"``, ``"Region"`` or ``"Country"``."""
+    df = _balance()
+    if level is not None:
+        df = df[df["Level"] == level]
+    if names is not None:
+        df = df[df["Name"].isin(_as_list(names))]
+    return df.reset_index(drop=True)
+
+
+def years_to_fill(model="linear", window=forecast.DEFAULT_WINDOW, horizon=forecast.DEFAULT_HORIZON):
+    """Years of projected emissions the catalog storage absorbs, per country and region."""
+    catalog = load_catalog()
+    storage = pd.Series(catalog["Capacity (Mt)"]).groupby(catalog["Country"]).sum().to_dict()
+    return forecast.years_to_fill(storage, model, window, horizon)
+
+
+def projection(countries=None, regions=None, model="linear", window=forecast.DEFAULT_WINDOW,
+               horizon=forecast.DEFAULT_HORIZON):
+    """History and projected total emissions for countries and regions, one row per year."""
+    countries, regions = _as_list(countries), _as_list(regions)
+    if countries is None and regions is None:
+        regions = list(REGIONS)
+    frames = []
+    for kind, name in [("Country", c) for c in countries or []] + [("Region", r) for r in regions or []]:
+        key = {"country": name} if kind == "Country" else {"region": name}
+        df = forecast.projection_frame(**key, model=model, window=window, horizon=horizon)
+        df.insert(0, kind, name)
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+
+# --- Output ---
+def write(df, out, fmt="csv"):
+    """Write ``df`` to a text stream as CSV or as a JSON list of records."""
+    if fmt == "json":
+        # JSON has no infinity: "never fills within the horizon" becomes null
+        df = df.replace([np.inf, -np.inf], np.nan)
+        out.write(df.to_json(orient="records", force_ascii=False, indent=None))
+        out.write("\n")
+    else:
+        df.to_csv(out, index=False, lineterminator="\n")
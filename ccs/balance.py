@@ -0,0 +1,84 @@
+"""Carbon balance rolled up from countries to regions to America.
+
+Emissions are each country's cumulative total in the emissions cube and
+storage is the capacity of its reservoirs in the catalog. Every node of the
+region tree, countries included, is a row of one membership matrix, so all
+levels are summed in a single product and the derived columns are computed
+once for the whole table. The rollup is cached per data and catalog version.
+"""
+import functools
+
+import numpy as np
+import pandas as pd
+
+from ccs.catalog import load_catalog
+from ccs.cube import load_cube
+from ccs.emissions import readonly_frame
+from ccs.regions import REGION_TREE, region_countries, region_parents
+
+BALANCE_COLUMNS = ["CO₂ emissions (Mt)", "CO₂ stored (Mt)", "CO₂ not stored (Mt)", "% Removal"]
+
+
+def _nodes(tree):
+    """``(name, level)`` for every region and country, roots first, children in tree order."""
+    parents = region_parents(tree)
+    roots = [node for node in tree if node not in parents]
+    nodes, queue = [], [(root, "Total") for root in roots]
+    while queue:
+        name, level = queue.pop(0)
+        nodes.append((name, level))
+        for child in tree.get(name, []):
+            queue.append((child, "Region" if child in tree else "Country"))
+    return nodes
+
+
+def rollup(emissions, storage, tree=REGION_TREE):
+    """Balance for every node of ``tree`` from per-country ``emissions`` and ``storage`` dicts (Mt).
+
+    Returns one row per node with ``Level`` (Total, Region or Country),
+    ``Name`` and ``Parent``, followed by ``BALANCE_COLUMNS``. Countries
+    missing from a dict count as zero.
+    """
+    nodes = _nodes(tree)
+    parents = region_parents(tree)
+    countries = [name for name, level in nodes if level == "Country"]
+    column = {c: i for i, c in enumerate(countries)}
+
+    membership = np.zeros((len(nodes), len(countries)))
+    for row, (name, level) in enumerate(nodes):
+        members = [name] if level == "Country" else region_countries(name, tree)
+        membership[row, [column[c] for c in members]] = 1.0
+    per_country = np.array([[emissions.get(c, 0.0), storage.get(c, 0.0)] for c in countries], dtype=float)
+    totals = membership @ per_country.reshape(len(countries), 2)  # nodes × (emissions, storage)
+
+    emitted, stored = totals[:, 0], totals[:, 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        removal = np.where(emitted > 0, stored / emitted * 100, np.nan)
+    return pd.DataFrame({
+        "Level": [level for _, level in nodes],
+        "Name": [name for name, _ in nodes],
+        "Parent": [parents.get(name, "") for name, _ in nodes],
+        "CO₂ emissions (Mt)": emitted,
+        "CO₂ stored (Mt)": stored,
+        "CO₂ not stored (Mt)": emitted - stored,
+        "% Removal": removal,
+    })
+
+
+@functools.lru_cache(maxsize=4)
+def _balance(cube, catalog):
+    totals = cube.range_totals((cube.years[0], cube.years[-1])).sum(axis=1)
+    emissions = dict(zip(cube.countries, totals))
+    storage = pd.Series(catalog["Capacity (Mt)"]).groupby(catalog["Country"]).sum().to_dict()
+    # Shared between reruns and sessions, so handed out read-only
+    return readonly_frame(rollup(emissions, storage))
+
+
+def balance():
+    """Rollup of cumulative emissions against catalog storage, shared by every view."""
+    return _balance(load_cube(), load_catalog())
+
+
+def children(table, node):
+    """Rows of ``table`` directly below ``node``."""
+    return table[table["Parent"] == node]
@@ -0,0 +1,125 @@
+"""Vectorized CO₂ storage-capacity equations from the notebook.
+
+Equation 1 (volumetric):  M = rho * Rf * A * h * ϕ * (1 - Sw)
+Equation 2 (OOIP based):  M = rho * Rf * OOIP / Bo
+
+Both are evaluated for every row of a reservoir input table in one NumPy pass.
+Saline aquifers (dedicated storage) use Rf = 1 and the irreducible water
+saturation as Sw. Missing pressures and temperatures are derived from depth
+with hydrostatic and geothermal gradients. CO₂ density comes from the
+tabulated surface in ``ccs.co2_density``.
+"""
+import functools
+
+import numpy as np
+import pandas as pd
+
+from ccs.co2_density import co2_density
+from ccs.emissions import data_file, file_sha256
+
+RESERVOIR_INPUTS_CSV = data_file("reservoir_inputs.csv")
+
+SURFACE_PRESSURE = 101325.0       # Pa
+HYDROSTATIC_GRADIENT = 10.0e3     # Pa/m
+SURFACE_TEMPERATURE = 288.15      # K
+GEOTHERMAL_GRADIENT = 0.03        # K/m
+
+INPUT_COLUMNS = {
+    "P": "P (Pa)",
+    "T": "T (K)",
+    "depth": "Depth (m)",
+    "Rf": "Rf",
+    "A": "A (m2)",
+    "h": "h (m)",
+    "phi": "Porosity",
+    "k": "k (mD)",
+    "Sw": "Sw",
+    "OOIP": "OOIP (m3)",
+    "Bo": "Bo",
+}
+
+
+def pressure_from_depth(depth, gradient=HYDROSTATIC_GRADIENT, surface=SURFACE_PRESSURE):
+    return surface + gradient * np.asarray(depth, dtype=float)
+
+
+def temperature_from_depth(depth, gradient=GEOTHERMAL_GRADIENT, surface=SURFACE_TEMPERATURE):
+    return surface + gradient * np.asarray(depth, dtype=float)
+
+
+def volumetric_capacity(rho, Rf, A, h, phi, Sw):
+    """Equation 1, in kg."""
+    return rho * Rf * A * h * phi * (1 - Sw)
+
+
+def ooip_capacity(rho, Rf, OOIP, Bo):
+    """Equation 2, in kg."""
+    return rho * Rf * OOIP / Bo
+
+
+def evaluate(inputs, hydrostatic_gradient=HYDROSTATIC_GRADIENT, geothermal_gradient=GEOTHERMAL_GRADIENT,
+             surface_pressure=SURFACE_PRESSURE, surface_temperature=SURFACE_TEMPERATURE, density=co2_density):
+    """Evaluate both equations for every row of ``inputs``.
+
+    Returns a copy of ``inputs`` with P and T filled from depth where missing
+    and the columns ``rho (kg/m3)``, ``Eq. 1 (Mt)`` and ``Eq. 2 (Mt)`` added.
+    """
+    cols = {key: inputs[col].to_numpy(dtype=float) if col in inputs else np.full(len(inputs), np.nan)
+            for key, col in INPUT_COLUMNS.items()}
+
+    P = np.where(np.isnan(cols["P"]), pressure_from_depth(cols["depth"], hydrostatic_gradient, surface_pressure), cols["P"])
+    T = np.where(np.isnan(cols["T"]), temperature_from_depth(cols["depth"], geothermal_gradient, surface_temperature), cols["T"])
+    rho = density(P, T)
+
+    out = inputs.copy()
+    out[INPUT_COLUMNS["P"]] = P
+    out[INPUT_COLUMNS["T"]] = T
+    out["rho (kg/m3)"] = rho
+    out["Eq. 1 (Mt)"] = volumetric_capacity(rho, cols["Rf"], cols["A"], cols["h"], cols["phi"], cols["Sw"]) / 1e9
+    out["Eq. 2 (Mt)"] = ooip_capacity(rho, cols["Rf"], cols["OOIP"], cols["Bo"]) / 1e9
+    return out
+
+
+def reservoir_capacity(inputs, **kwargs):
+    """Capacity per reservoir, summing the zones of multi-zone reservoirs.
+
+    ``Capacity (Mt)`` is Equation 1; reservoirs without published inputs fall
+    back to their ``Reported capacity (Mt)``.
+    """
+    zones = evaluate(inputs, **kwargs)
+    codes, reservoirs = pd.factorize(zones["Reservoir"])
+    n = len(reservoirs)
+
+    def zone_sum(values):
+        has_value = ~np.isnan(values)
+        total = np.bincount(codes, weights=np.where(has_value, values, 0.0), minlength=n)
+        return np.where(np.bincount(codes, weights=has_value, minlength=n) > 0, total, np.nan)
+
+    eq1 = zone_sum(zones["Eq. 1 (Mt)"].to_numpy())
+    eq2 = zone_sum(zones["Eq. 2 (Mt)"].to_numpy())
+    reported = zone_sum(zones["Reported capacity (Mt)"].to_numpy(dtype=float)) \
+        if "Reported capacity (Mt)" in zones else np.full(n, np.nan)
+    return pd.DataFrame({
+        "Reservoir": reservoirs,
+        "Capacity (Mt)": np.round(np.where(np.isnan(eq1), reported, eq1), 2),
+        "Eq. 1 (Mt)": eq1,
+        "Eq. 2 (Mt)": eq2,
+        "Computed": ~np.isnan(eq1),
+    })
+
+
+def load_inputs(path=RESERVOIR_INPUTS_CSV):
+    return pd.read_csv(path)
+
+
+@functools.lru_cache(maxsize=4)
+def _capacities(path, sha256):
+    return reservoir_capacity(load_inputs(path))
+
+
+def default_capacities(path=RESERVOIR_INPUTS_CSV, sha256=None):
+    """Per-reservoir capacities for ``Data/reservoir_inputs.csv``, recomputed only when the file changes.
+
+    Callers that already hashed the file pass ``sha256`` to skip hashing it again.
+    """
+    return _capacities(path, sha256 or file_sha256(path))
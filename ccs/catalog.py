@@ -0,0 +1,112 @@
+"""Reservoir catalog shared by the capacity view and the map.
+
+``Data/reservoirs.csv`` is the single list of storage reservoirs: region,
+country, field, formation, coordinates, display properties and map icon. It
+is loaded once per data version into a struct-of-arrays (one read-only NumPy
+array per column) with prebuilt country, region and formation indexes, so
+filters are dictionary lookups instead of scans. Capacities are not stored in
+the CSV; they come from ``ccs.capacity`` so every view shows the same numbers.
+"""
+import functools
+
+import numpy as np
+import pandas as pd
+
+from ccs.capacity import RESERVOIR_INPUTS_CSV, default_capacities
+from ccs.emissions import data_file, file_sha256, load_table
+
+RESERVOIRS_CSV = data_file("reservoirs.csv")
+
+NUMERIC_COLUMNS = ["Latitude", "Longitude", "Depth (m)", "Thickness (m)", "Porosity (%)", "Permeability (mD)"]
+TEXT_COLUMNS = ["Reservoir", "Region", "Country", "Field", "Formation", "Icon"]
+INDEXED_COLUMNS = {"country": "Country", "region": "Region", "formation": "Formation"}
+
+
+def _index(values):
+    """``{value: row positions}`` in first-appearance order."""
+    codes, uniques = pd.factorize(values)
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+    index = {}
+    for i, value in enumerate(uniques):
+        rows = order[bounds[i]:bounds[i + 1]]
+        rows.flags.writeable = False
+        index[value] = rows
+    return index
+
+
+class ReservoirCatalog:
+
+    def __init__(self, columns, version=None):
+        self.columns = {}
+        for name, values in columns.items():
+            values = np.array(values)
+            values.flags.writeable = False
+            self.columns[name] = values
+        self.version = version
+        self.indexes = {key: _index(self.columns[col]) for key, col in INDEXED_COLUMNS.items()}
+        self.reservoir_index = {r: i for i, r in enumerate(self.columns["Reservoir"])}
+
+    @classmethod
+    def from_frame(cls, df, capacities=None, version=None):
+        capacities = default_capacities() if capacities is None else capacities
+        capacity = df["Reservoir"].map(capacities.set_index("Reservoir")["Capacity (Mt)"])
+        columns = {col: df[col].fillna("").astype(str).to_numpy(dtype=object) for col in TEXT_COLUMNS}
+        columns.update({col: df[col].to_numpy(dtype=float) for col in NUMERIC_COLUMNS})
+        columns["Capacity (Mt)"] = capacity.to_numpy(dtype=float)
+        return cls(columns, version)
+
+    def __len__(self):
+        return len(self.columns["Reservoir"])
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    # --- Index lookups ---
+    @property
+    def countries(self):
+        return list(self.indexes["country"])
+
+    @property
+    def regions(self):
+        return list(self.indexes["region"])
+
+    @property
+    def formations(self):
+        return list(self.indexes["formation"])
+
+    def rows(self, country=None, region=None, formation=None):
+        """Row positions matching every given filter; each filter is a value or a list of values."""
+        selected = None
+        for key, wanted in (("country", country), ("region", region), ("formation", formation)):
+            if wanted is None:
+                continue
+            values = [wanted] if isinstance(wanted, str) else wanted
+            index = self.indexes[key]
+            hits = np.concatenate([index[v] for v in values if v in index] or [np.empty(0, dtype=np.intp)])
+            selected = hits if selected is None else np.intersect1d(selected, hits)
+        if selected is None:
+            return np.arange(len(self))
+        return np.sort(selected)
+
+    def countries_in(self, rows):
+        return list(pd.unique(self.columns["Country"][rows]))
+
+    def frame(self, rows=None, columns=None):
+        """A small DataFrame for the given rows, for tables and charts."""
+        rows = np.arange(len(self)) if rows is None else rows
+        columns = columns or list(self.columns)
+        return pd.DataFrame({col: self.columns[col][rows] for col in columns}, index=np.asarray(rows))
+
+
+@functools.lru_cache(maxsize=4)
+def _load(path, sha256, inputs_path, inputs_sha256):
+    capacities = default_capacities(inputs_path, inputs_sha256)
+    # Capacities come from the inputs file, so a change to either file is a new version
+    return ReservoirCatalog.from_frame(load_table(path, path.parent / ".cache"), capacities,
+                                       version=f"{sha256[:12]}-{inputs_sha256[:12]}")
+
+
+def load_catalog(path=RESERVOIRS_CSV, inputs_path=RESERVOIR_INPUTS_CSV):
+    """Catalog for the current contents of ``path`` and ``inputs_path``; rebuilt only when either changes."""
+    return _load(path, file_sha256(path), inputs_path, file_sha256(inputs_path))
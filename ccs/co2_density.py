@@ -0,0 +1,184 @@
+"""Tabulated CO₂ density surface replacing per-call CoolProp lookups.
+
+``Data/co2_density.npz`` holds the density (kg/m³, float32) on a rectilinear
+pressure × temperature grid covering storage conditions: 0.5–70 MPa and
+273.15–423.15 K, refined below 12 MPa and 330 K around the critical point.
+Lookups use bilinear interpolation and take whole arrays of P and T; states
+outside the grid are clamped to its edges.
+
+Against CoolProp's reference equation of state the relative error stays
+below ``MAX_RELATIVE_ERROR`` everywhere except next to the phase boundary,
+where density is discontinuous: within ``SATURATION_MARGIN`` of the
+saturation pressure below Tc, and within 3 K / 1 MPa of the critical point.
+
+``Data/co2_density_reference.npz`` keeps CoolProp densities at off-grid
+states away from the phase boundary, including the least accurate ones, so
+the bound is tested without CoolProp (``reference_error``, run by ``tests/``).
+
+CoolProp is a build-only dependency, needed to rebuild the table and its
+reference sample or to check against the full equation of state::
+
+    python -m ccs.co2_density build       # table and reference sample
+    python -m ccs.co2_density reference   # reference sample only
+    python -m ccs.co2_density check
+"""
+import argparse
+import functools
+import sys
+
+import numpy as np
+
+from ccs.emissions import PACKAGE_DATA_DIR
+
+# Shipped with the code, never taken from CCS_DATA_DIR
+TABLE_PATH = PACKAGE_DATA_DIR / "co2_density.npz"
+REFERENCE_PATH = PACKAGE_DATA_DIR / "co2_density_reference.npz"
+REFERENCE_SAMPLES = 2000
+
+# (start, stop, step) segments of each axis
+PRESSURE_AXIS = [(0.5e6, 12e6, 0.05e6), (12e6, 70e6, 0.25e6)]     # Pa
+TEMPERATURE_AXIS = [(273.15, 330.0, 0.25), (330.0, 423.15, 0.5)]   # K
+
+CRITICAL_PRESSURE = 7.3773e6   # Pa
+CRITICAL_TEMPERATURE = 304.1282  # K
+MAX_RELATIVE_ERROR = 0.005
+SATURATION_MARGIN = 0.5e6      # Pa
+
+
+def _axis(segments):
+    return np.unique(np.round(np.concatenate([np.arange(a, b + 1e-9, s) for a, b, s in segments]), 6))
+
+
+class DensityTable:
+
+    def __init__(self, pressure, temperature, rho):
+        self.pressure = np.asarray(pressure, dtype=float)
+        self.temperature = np.asarray(temperature, dtype=float)
+        self.rho = np.asarray(rho)
+
+    @classmethod
+    def load(cls, path=TABLE_PATH):
+        with np.load(path) as data:
+            return cls(data["pressure"], data["temperature"], data["rho"])
+
+    def save(self, path=TABLE_PATH):
+        np.savez_compressed(path, pressure=self.pressure, temperature=self.temperature,
+                            rho=self.rho.astype(np.float32))
+
+    def __call__(self, P, T):
+        """Density in kg/m³ for arrays of pressure (Pa) and temperature (K)."""
+        P, T = np.broadcast_arrays(np.asarray(P, dtype=float), np.asarray(T, dtype=float))
+        P_axis, T_axis = self.pressure, self.temperature
+        p = np.clip(P, P_axis[0], P_axis[-1])
+        t = np.clip(T, T_axis[0], T_axis[-1])
+
+        i = np.clip(np.searchsorted(P_axis, p) - 1, 0, len(P_axis) - 2)
+        j = np.clip(np.searchsorted(T_axis, t) - 1, 0, len(T_axis) - 2)
+        wp = (p - P_axis[i]) / (P_axis[i + 1] - P_axis[i])
+        wt = (t - T_axis[j]) / (T_axis[j + 1] - T_axis[j])
+
+        rho = self.rho
+        out = (rho[i, j] * (1 - wp) * (1 - wt) + rho[i + 1, j] * wp * (1 - wt)
+               + rho[i, j + 1] * (1 - wp) * wt + rho[i + 1, j + 1] * wp * wt)
+        # NaN inputs (e.g. missing depth) stay NaN instead of being clamped
+        return np.where(np.isnan(P) | np.isnan(T), np.nan, out)
+
+
+@functools.lru_cache(maxsize=None)
+def default_table():
+    return DensityTable.load()
+
+
+def co2_density(P, T):
+    """CO₂ density in kg/m³ interpolated from the shipped table."""
+    return default_table()(P, T)
+
+
+# --- Generator and accuracy check (need CoolProp) ---
+def build(path=TABLE_PATH):
+    from CoolProp.CoolProp import PropsSI
+
+    pressure, temperature = _axis(PRESSURE_AXIS), _axis(TEMPERATURE_AXIS)
+    P, T = np.meshgrid(pressure, temperature, indexing="ij")
+    rho = PropsSI("D", "P", P.ravel(), "T", T.ravel(), "CO2").reshape(P.shape)
+    table = DensityTable(pressure, temperature, rho.astype(np.float32))
+    table.save(path)
+    return table
+
+
+def near_phase_boundary(P, T):
+    """Mask of states excluded from the error bound."""
+    from CoolProp.CoolProp import PropsSI
+
+    subcritical = T < CRITICAL_TEMPERATURE
+    p_sat = np.full(T.shape, np.nan)
+    if subcritical.any():
+        p_sat[subcritical] = PropsSI("P", "T", T[subcritical], "Q", 0, "CO2")
+    near_saturation = subcritical & (np.abs(P - p_sat) < SATURATION_MARGIN)
+    near_critical = (np.abs(T - CRITICAL_TEMPERATURE) < 3) & (np.abs(P - CRITICAL_PRESSURE) < 1e6)
+    return near_saturation | near_critical
+
+
+def check(table=None, samples=50_000, seed=0):
+    """Max relative error against CoolProp at random off-grid states."""
+    from CoolProp.CoolProp import PropsSI
+
+    table = table or DensityTable.load()
+    rng = np.random.default_rng(seed)
+    P = rng.uniform(table.pressure[0], table.pressure[-1], samples)
+    T = rng.uniform(table.temperature[0], table.temperature[-1], samples)
+    reference = PropsSI("D", "P", P, "T", T, "CO2")
+    error = np.abs(table(P, T) / reference - 1)
+    return float(error[~near_phase_boundary(P, T)].max())
+
+
+def write_reference(table=None, path=REFERENCE_PATH, samples=REFERENCE_SAMPLES, seed=1):
+    """Save CoolProp densities at off-grid states outside the excluded phase-boundary band.
+
+    Half the states are random; the other half are those where ``table`` is
+    least accurate among 25× as many candidates, so the sample keeps the
+    worst case of a full ``check``.
+    """
+    from CoolProp.CoolProp import PropsSI
+
+    table = table or DensityTable.load()
+    rng = np.random.default_rng(seed)
+    P = rng.uniform(table.pressure[0], table.pressure[-1], samples * 25)
+    T = rng.uniform(table.temperature[0], table.temperature[-1], samples * 25)
+    keep = ~near_phase_boundary(P, T)
+    P, T = P[keep], T[keep]
+    rho = PropsSI("D", "P", P, "T", T, "CO2")
+    error = np.abs(table(P, T) / rho - 1)
+    worst = np.argsort(error)[::-1][:samples // 2]
+    rest = rng.choice(np.setdiff1d(np.arange(len(P)), worst), samples - len(worst), replace=False)
+    rows = np.sort(np.concatenate([worst, rest]))
+    np.savez_compressed(path, pressure=P[rows], temperature=T[rows], rho=rho[rows])
+    return len(rows)
+
+
+def reference_error(table=None, path=REFERENCE_PATH):
+    """Max relative error against the shipped CoolProp reference sample; does not need CoolProp."""
+    table = table or default_table()
+    with np.load(path) as data:
+        return float(np.max(np.abs(table(data["pressure"], data["temperature"]) / data["rho"] - 1)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or check the tabulated CO2 density surface")
+    parser.add_argument("command", choices=["build", "reference", "check"])
+    parser.add_argument("--samples", type=int, default=50_000)
+    args = parser.parse_args(argv)
+
+    table = build() if args.command == "build" else None
+    if table is not None:
+        print(f"Wrote {TABLE_PATH.name}: {table.rho.shape[0]} pressures x {table.rho.shape[1]} temperatures")
+    if args.command in ("build", "reference"):
+        print(f"Wrote {REFERENCE_PATH.name}: {write_reference(table)} reference states")
+    error = check(table, samples=args.samples)
+    print(f"Max relative error vs CoolProp: {error:.4%} (bound {MAX_RELATIVE_ERROR:.2%})")
+    if error > MAX_RELATIVE_ERROR:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""Dense Country × Year × Source emissions cube with prefix sums over years.
+
+Built once per data version from the long-format frame. Totals over any year
+range for a country or region are two lookups in the cumulative arrays, and
+the table/chart frames are sliced straight out of the cube instead of
+filtering and grouping the long frame on every rerun.
+
+The shared cube also carries its 5-year and decadal rollups (``ccs.rollups``),
+built with it and extended rather than rebuilt when a new data version only
+appends years.
+"""
+import numpy as np
+import pandas as pd
+
+from ccs.emissions import SOURCES, get_store
+from ccs.regions import REGIONS
+from ccs.rollups import RESOLUTIONS, Rollup, build_rollups
+
+VALUE_COL = "Emissions (Mt)"
+
+
+class EmissionsCube:
+
+    def __init__(self, countries, years, sources, values, present, exists=None, regions=REGIONS):
+        self.countries = list(countries)
+        self.years = np.asarray(years)
+        self.sources = list(sources)
+        # NaN emissions are stored as 0 so sums match pandas' skipna behaviour;
+        # ``present`` keeps track of which cells were actually reported.
+        self.values = values
+        self.present = present
+        # Country-years that have a row in the source data, even if every source is empty
+        self.exists = present.any(axis=2) if exists is None else exists
+        self.country_index = {c: i for i, c in enumerate(self.countries)}
+        self.source_index = {s: i for i, s in enumerate(self.sources)}
+
+        self.prefix = _prefix(values)
+
+        self.regions = list(regions)
+        self.region_index = {r: i for i, r in enumerate(self.regions)}
+        self.region_mask = np.zeros((len(self.regions), len(self.countries)), dtype=bool)
+        for r, members in enumerate(regions.values()):
+            idx = [self.country_index[c] for c in members if c in self.country_index]
+            self.region_mask[r, idx] = True
+        mask = self.region_mask.astype(values.dtype)
+        # One extra row of fixed pseudo-random country weights gives per-year
+        # checksums in the same pass, used to recognise appended versions
+        weights = np.random.default_rng(0).integers(1, 2**20, len(self.countries))
+        sums = np.einsum("rc,cys->rys", np.vstack([mask, weights.astype(values.dtype)]), values)
+        self.region_values = sums[:-1]
+        # Integer weights keep the country-year checksum exact whatever the number of years
+        self.checksums = (sums[-1], weights @ self.exists.astype(np.int64))
+        self.region_prefix = _prefix(self.region_values)
+        self.region_exists = (self.region_mask[:, :, None] & self.exists[None, :, :]).any(axis=1)
+        self.rollups = {}  # resolution -> Rollup, see rollup()
+
+    @classmethod
+    def from_long(cls, df, regions=REGIONS, sources=SOURCES):
+        country_codes, countries = pd.factorize(df["Country"], sort=True)
+        years = np.arange(df["Year"].min(), df["Year"].max() + 1)
+        year_codes = df["Year"].to_numpy() - years[0]
+        source_codes = pd.Categorical(df["Source"], categories=sources).codes
+
+        shape = (len(countries), len(years), len(sources))
+        emissions = df[VALUE_COL].to_numpy(dtype=float)
+        reported = ~np.isnan(emissions)
+        # Duplicate (Country, Year, Source) rows are summed, like groupby().sum() and ccs.ingest
+        cells = np.ravel_multi_index((country_codes, year_codes, source_codes), shape)
+        values = np.bincount(cells, weights=np.where(reported, emissions, 0.0), minlength=np.prod(shape))
+        values = values.reshape(shape)
+        present = np.zeros(shape, dtype=bool)
+        present.flat[cells[reported]] = True
+        exists = np.zeros(shape[:2], dtype=bool)
+        exists[country_codes, year_codes] = True
+
+        return cls(countries, years, sources, values, present, exists, regions)
+
+    # --- Index helpers ---
+    def year_span(self, years):
+        """Slice bounds on the year axis for an inclusive ``(first, last)`` range."""
+        first = int(np.clip(years[0] - self.years[0], 0, len(self.years)))
+        last = int(np.clip(years[1] - self.years[0] + 1, first, len(self.years)))
+        return first, last
+
+    def _sources(self, source):
+        if source is None or source == "All":
+            return slice(None)
+        if isinstance(source, str):
+            return self.source_index[source]
+        return [self.source_index[s] for s in source]
+
+    # --- O(1) range totals ---
+    def country_total(self, country, years, source=None):
+        first, last = self.year_span(years)
+        c = self.country_index[country]
+        diff = self.prefix[c, last, self._sources(source)] - self.prefix[c, first, self._sources(source)]
+        return float(np.sum(diff))
+
+    def region_total(self, region, years, source=None):
+        first, last = self.year_span(years)
+        r = self.region_index[region]
+        diff = self.region_prefix[r, last, self._sources(source)] - self.region_prefix[r, first, self._sources(source)]
+        return float(np.sum(diff))
+
+    def range_totals(self, years):
+        """Country × Source totals for a year range, shape ``(countries, sources)``."""
+        first, last = self.year_span(years)
+        return self.prefix[:, last, :] - self.prefix[:, first, :]
+
+    # --- Table View frames ---
+    def country_table(self, country, years, source):
+        first, last = self.year_span(years)
+        c = self.country_index[country]
+        rows = np.flatnonzero(self.exists[c, first:last]) + first
+        if source == "All":
+            return pd.DataFrame({
+                "Country": country,
+                "Year": self.years[rows],
+                VALUE_COL: self.values[c, rows, :].sum(axis=1),
+                "Source": "All",
+            })
+        s = self.source_index[source]
+        return pd.DataFrame({
+            "Country": country,
+            "Year": self.years[rows],
+            "Source": source,
+            VALUE_COL: np.where(self.present[c, rows, s], self.values[c, rows, s], np.nan),
+        })
+
+    def region_table(self, region, years, source):
+        first, last = self.year_span(years)
+        r = self.region_index[region]
+        rows = np.flatnonzero(self.region_exists[r, first:last]) + first
+        if source == "All":
+            return pd.DataFrame({
+                "Year": self.years[rows],
+                VALUE_COL: self.region_values[r, rows, :].sum(axis=1),
+                "Source": "All",
+            })
+        s = self.source_index[source]
+        return pd.DataFrame({
+            "Year": self.years[rows],
+            "Source": source,
+            VALUE_COL: self.region_values[r, rows, s],
+        })
+
+    # --- Chart View frames ---
+    def by_year(self, years, sources, country=None, region=None):
+        """Emissions per (Year, Source) for one country or one region."""
+        first, last = self.year_span(years)
+        if country is not None:
+            c = self.country_index[country]
+            block, exists = self.values[c, first:last], self.exists[c, first:last]
+        else:
+            r = self.region_index[region]
+            block, exists = self.region_values[r, first:last], self.region_exists[r, first:last]
+        rows = np.flatnonzero(exists)
+        sources = sorted(sources)
+        cols = [self.source_index[s] for s in sources]
+        return pd.DataFrame({
+            "Year": np.repeat(self.years[first:last][rows], len(cols)),
+            "Source": np.tile(sources, len(rows)),
+            VALUE_COL: block[rows][:, cols].ravel(),
+        })
+
+    def by_period(self, years, sources, resolution, country=None, region=None):
+        """Emissions per (Period, Source) for one country or region at a ``RESOLUTIONS`` step.
+
+        Periods inside ``years`` are read from the rollup; a period cut by
+        either end of the range is summed over its selected years only.
+        """
+        rollup = self.rollup(resolution)
+        first, last = int(years[0]), int(years[1])
+        periods = np.flatnonzero((rollup.starts + rollup.step > first) & (rollup.starts <= last))
+        if country is not None:
+            i = self.country_index[country]
+            prefix, exists = self.prefix[i], self.exists[i]
+            block, shown = rollup.country_values[i, periods], rollup.country_exists[i, periods]
+        else:
+            i = self.region_index[region]
+            prefix, exists = self.region_prefix[i], self.region_exists[i]
+            block, shown = rollup.region_values[i, periods], rollup.region_exists[i, periods]
+
+        # Fancy indexing above copied the rollup rows, so the edges can be overwritten
+        data_first, data_last = int(self.years[0]), int(self.years[-1])
+        for j in {0, len(periods) - 1} if len(periods) else ():
+            start = int(rollup.starts[periods[j]])
+            bounds = (max(start, data_first), min(start + rollup.step - 1, data_last))
+            clipped = (max(bounds[0], first), min(bounds[1], last))
+            if clipped != bounds:
+                a, b = self.year_span(clipped)
+                block[j], shown[j] = prefix[b] - prefix[a], exists[a:b].any()
+
+        rows = np.flatnonzero(shown)
+        labels = rollup.labels(first, last)[periods][rows]
+        sources = sorted(sources)
+        cols = [self.source_index[s] for s in sources]
+        return pd.DataFrame({
+            "Period": np.repeat(labels, len(cols)),
+            "Source": np.tile(sources, len(rows)),
+            VALUE_COL: block[rows][:, cols].ravel(),
+        })
+
+    def by_country(self, years, sources, region):
+        """Emissions per (Country, Source) summed over a year range for a region's countries."""
+        first, last = self.year_span(years)
+        r = self.region_index[region]
+        members = np.flatnonzero(self.region_mask[r] & self.exists[:, first:last].any(axis=1))
+        sources = sorted(sources)
+        cols = [self.source_index[s] for s in sources]
+        totals = self.range_totals(years)[np.ix_(members, cols)]
+        return pd.DataFrame({
+            "Country": np.repeat(np.asarray(self.countries, dtype=object)[members], len(cols)),
+            "Source": np.tile(sources, len(members)),
+            VALUE_COL: totals.ravel(),
+        })
+
+
+    # --- Period rollups ---
+    def rollup(self, resolution):
+        """The ``Rollup`` for a ``RESOLUTIONS`` name, built on first use if not precomputed."""
+        if resolution not in self.rollups:
+            self.rollups[resolution] = Rollup.from_cube(self, RESOLUTIONS[resolution])
+        return self.rollups[resolution]
+
+
+def _prefix(values):
+    """Cumulative sums along the year axis with a leading zero slot."""
+    prefix = np.zeros((values.shape[0], values.shape[1] + 1, values.shape[2]))
+    np.cumsum(values, axis=1, out=prefix[:, 1:, :])
+    return prefix
+
+
+def _build_cube(frame):
+    cube = EmissionsCube.from_long(frame)
+    cube.rollups = build_rollups(cube, get_store().previous("cube"))
+    return cube
+
+
+def load_cube():
+    """Shared cube, with every period rollup, for the current emissions data version."""
+    return get_store().derived("cube", _build_cube)
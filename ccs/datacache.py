@@ -0,0 +1,197 @@
+"""Columnar ``.npy`` cache of the CSV files in ``Data/``.
+
+Each CSV is converted once into one ``.npy`` file per column plus an entry in
+``manifest.json``. Numeric columns are memory-mapped read-only when loaded, so
+every worker process on the machine shares the same page-cache pages instead
+of parsing text. String columns are stored as ``int32`` category codes with the
+categories kept in the manifest.
+
+Artifacts are keyed on the SHA-256 of the source CSV and rebuilt automatically
+when it changes. The check-build-replace sequence holds an exclusive lock on
+``.lock`` in the cache directory, so Streamlit servers and command-line runs
+sharing a cache never build or replace the same table at once. Build them
+ahead of time with::
+
+    python -m ccs.datacache
+"""
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import numpy as np
+import pandas as pd
+
+from ccs.emissions import DATA_DIR, file_sha256
+
+CACHE_DIR = DATA_DIR / ".cache"
+MANIFEST = "manifest.json"
+LOCK_FILE = ".lock"
+FORMAT_VERSION = 1
+
+_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def _cache_lock(cache_dir):
+    """Exclusive lock on ``cache_dir`` across threads and processes."""
+    with _lock, open(cache_dir / LOCK_FILE, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    # Blocks up to ~10 s per call
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        try:
+            yield
+        finally:
+            # Released when the file is closed; explicit so the order is clear
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def read_manifest(cache_dir=CACHE_DIR):
+    try:
+        with open(cache_dir / MANIFEST, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"version": FORMAT_VERSION, "tables": {}}
+    if manifest.get("version") != FORMAT_VERSION:
+        return {"version": FORMAT_VERSION, "tables": {}}
+    return manifest
+
+
+def _write_manifest(manifest, cache_dir):
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".json")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, cache_dir / MANIFEST)
+
+
+def build_table(csv_path, cache_dir=CACHE_DIR, sha256=None):
+    """Convert one CSV into per-column ``.npy`` files and return its manifest entry."""
+    sha256 = sha256 or file_sha256(csv_path)
+    stat = csv_path.stat()
+    df = pd.read_csv(csv_path)
+
+    table_dir = f"{csv_path.stem}-{sha256[:12]}"
+    tmp_dir = tempfile.mkdtemp(dir=cache_dir, prefix=".build-")
+    columns = []
+    for i, col in enumerate(df.columns):
+        series = df[col]
+        column = {"name": col, "file": f"c{i}.npy"}
+        if pd.api.types.is_numeric_dtype(series):
+            values = series.to_numpy()
+            column["kind"] = "numeric"
+        else:
+            codes, categories = pd.factorize(series)
+            values = codes.astype(np.int32)
+            column["kind"] = "category"
+            column["categories"] = [str(c) for c in categories]
+        np.save(os.path.join(tmp_dir, column["file"]), values)
+        columns.append(column)
+
+    target = cache_dir / table_dir
+    if target.exists():
+        shutil.rmtree(tmp_dir)
+    else:
+        os.replace(tmp_dir, target)
+
+    return {
+        "source": csv_path.name,
+        "dir": table_dir,
+        "sha256": sha256,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "rows": len(df),
+        "columns": columns,
+    }
+
+
+def _entry_dir(entry, cache_dir):
+    return cache_dir / entry["dir"]
+
+
+def ensure_table(csv_path, cache_dir=CACHE_DIR, force=False):
+    """Return an up-to-date manifest entry for ``csv_path``, rebuilding it if needed."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    with _cache_lock(cache_dir):
+        manifest = read_manifest(cache_dir)
+        entry = manifest["tables"].get(csv_path.name)
+        fresh = entry is not None and _entry_dir(entry, cache_dir).exists()
+        if fresh and not force:
+            # Cheap size/mtime check first, the SHA-256 decides when they differ
+            stat = csv_path.stat()
+            if entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns:
+                sha256 = file_sha256(csv_path)
+                fresh = entry["sha256"] == sha256
+                if fresh:
+                    # Touched but unchanged: remember the new mtime to skip hashing next time
+                    entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+                    _write_manifest(manifest, cache_dir)
+        if fresh and not force:
+            return entry
+
+        old_dir = entry["dir"] if entry else None
+        entry = build_table(csv_path, cache_dir)
+        manifest["tables"][csv_path.name] = entry
+        _write_manifest(manifest, cache_dir)
+        if old_dir and old_dir != entry["dir"]:
+            # Processes that still map the old files keep their pages until they unmap
+            shutil.rmtree(cache_dir / old_dir, ignore_errors=True)
+        return entry
+
+
+def load_table(csv_path, cache_dir=CACHE_DIR):
+    """Load ``csv_path`` from the binary cache, memory-mapping numeric columns read-only."""
+    entry = ensure_table(csv_path, cache_dir)
+    table_dir = _entry_dir(entry, cache_dir)
+    data = {}
+    for column in entry["columns"]:
+        values = np.load(table_dir / column["file"], mmap_mode="r")
+        if column["kind"] == "category":
+            categories = np.asarray(column["categories"], dtype=object)
+            decoded = np.empty(len(values), dtype=object)
+            valid = values >= 0
+            decoded[valid] = categories[values[valid]]
+            decoded[~valid] = np.nan
+            values = decoded
+        data[column["name"]] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def build_all(data_dir=DATA_DIR, cache_dir=CACHE_DIR, force=False):
+    return [ensure_table(path, cache_dir, force=force) for path in sorted(data_dir.glob("*.csv"))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the binary cache for Data/*.csv")
+    parser.add_argument("--force", action="store_true", help="rebuild even if artifacts are current")
+    parser.add_argument("--data-dir", default=str(DATA_DIR))
+    args = parser.parse_args(argv)
+
+    data_dir = Path(args.data_dir)
+    for entry in build_all(data_dir, data_dir / ".cache", force=args.force):
+        print(f"{entry['source']}: {entry['rows']} rows -> {entry['dir']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Shape-preserving downsampling of chart series.
+
+A line chart cannot show more points than it has pixels across, so long
+series are reduced with Largest-Triangle-Three-Buckets (LTTB, Steinarsson
+2013) before they are sent to the browser. LTTB keeps the first and last
+points and, in each bucket in between, the point that forms the largest
+triangle with the point kept before it and the average of the next bucket.
+Peaks and troughs survive, unlike with every-n-th-point decimation.
+"""
+import numpy as np
+
+
+def lttb(x, y, threshold):
+    """Indices of at most ``threshold`` points of ``(x, y)`` chosen by LTTB.
+
+    ``x`` must be increasing; categorical axes can pass their positions.
+    Series with ``threshold`` points or fewer are returned whole. Missing
+    values count as zero when choosing points but keep their own value.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n) if threshold >= n else np.array([0, n - 1][:threshold])
+
+    # Buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    starts, ends = edges[:-1], edges[1:]
+    csum_x, csum_y = np.concatenate([[0.0], np.cumsum(x)]), np.concatenate([[0.0], np.cumsum(y)])
+    # Average of each following bucket (the last point for the final one)
+    next_starts = np.append(starts[1:], n - 1)
+    next_ends = np.append(ends[1:], n)
+    count = next_ends - next_starts
+    avg_x = (csum_x[next_ends] - csum_x[next_starts]) / count
+    avg_y = (csum_y[next_ends] - csum_y[next_starts]) / count
+
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for b, (start, end) in enumerate(zip(starts, ends)):
+        bx, by = x[start:end], y[start:end]
+        area = np.abs((x[a] - avg_x[b]) * (by - y[a]) - (x[a] - bx) * (avg_y[b] - y[a]))
+        a = start + int(np.argmax(area))
+        selected[b + 1] = a
+    return selected
@@ -0,0 +1,182 @@
+"""Process-wide store for the CO₂ emissions by source dataset.
+
+The Streamlit script reruns on every widget interaction, but modules are only
+imported once per server process. The store below keeps the long-format
+emissions frame in memory and hands the same read-only object to every
+session and section, reloading it only when the CSV on disk changes.
+"""
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from ccs.tracing import span
+
+# The repository's own data, including assets such as the CO₂ density table
+PACKAGE_DATA_DIR = Path(__file__).resolve().parent.parent / "Data"
+# CCS_DATA_DIR points the app at another data directory, e.g. one from ccs.synthetic or ccs.ingest
+DATA_DIR = Path(os.environ.get("CCS_DATA_DIR") or PACKAGE_DATA_DIR)
+EMISSIONS_CSV = DATA_DIR / "co2-by-source.csv"
+
+SOURCES = ["Coal", "Oil", "Gas", "Flaring", "Cement"]
+
+
+def data_file(name):
+    """``DATA_DIR / name``, or the repository's copy when the data directory does not have it."""
+    path = DATA_DIR / name
+    return path if path.exists() else PACKAGE_DATA_DIR / name
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def reshape_emissions(df_wide):
+    """Melt the wide by-source table into Country / Year / Source / Emissions (Mt)."""
+    df_long = df_wide.melt(
+        id_vars=["Entity", "Year"],
+        value_vars=SOURCES,
+        var_name="Source",
+        value_name="Emissions"
+    )
+    # Convert to millions and rename columns
+    df_long["Emissions"] = df_long["Emissions"] / 1e6
+    df_long = df_long.rename(columns={"Entity": "Country", "Emissions": "Emissions (Mt)"})
+
+    # Drop rows without year
+    df_long = df_long.dropna(subset=["Year"])
+    df_long["Year"] = df_long["Year"].astype(int)
+    return df_long.reset_index(drop=True)
+
+
+def readonly_frame(df):
+    """``df`` rebuilt on read-only arrays so shared copies cannot be mutated.
+
+    Columns that are already read-only, such as those memory-mapped from the
+    ``ccs.datacache`` files, are wrapped in a read-only view and stay shared.
+    Writeable columns are copied first, since their owner could still write
+    to them.
+    """
+    columns = {}
+    for col in df.columns:
+        values = df[col].to_numpy()
+        values = values.copy() if values.flags.writeable else values.view()
+        values.flags.writeable = False
+        columns[col] = values
+    return pd.DataFrame(columns, copy=False)
+
+
+def load_table(csv_path, cache_dir):
+    # Imported lazily: ccs.datacache depends on this module for paths and hashing
+    from ccs.datacache import load_table
+    return load_table(csv_path, cache_dir)
+
+
+class EmissionsStore:
+    """Lazily loaded, read-only emissions frame invalidated by file mtime/hash."""
+
+    def __init__(self, path=EMISSIONS_CSV):
+        self.path = Path(path)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._frame = None
+        self._mtime = None
+        self._sha256 = None
+        self._version = 0
+        self._derived = {}
+        self._previous = {}
+
+    def _is_current(self):
+        if self._frame is None:
+            return False
+        mtime = self.path.stat().st_mtime_ns
+        if mtime == self._mtime:
+            return True
+        # Touched but not necessarily changed: compare contents before reloading
+        if file_sha256(self.path) == self._sha256:
+            self._mtime = mtime
+            return True
+        return False
+
+    def _load(self):
+        mtime = self.path.stat().st_mtime_ns
+        sha256 = file_sha256(self.path)
+        with span("load_table"):
+            wide = load_table(self.path, self.path.parent / ".cache")
+        with span("melt"):
+            self._frame = readonly_frame(reshape_emissions(wide))
+        self._mtime = mtime
+        self._sha256 = sha256
+        self._version += 1
+        # Kept for one version so derived data can be extended instead of rebuilt
+        self._previous, self._derived = self._derived, {}
+
+    def get(self):
+        """Return the shared long-format frame. Callers must not modify it in place."""
+        with self._lock:
+            if self._is_current():
+                self.hits += 1
+            else:
+                self.misses += 1
+                self._load()
+            return self._frame
+
+    def derived(self, name, build):
+        """Return ``build(frame)``, computed once per data version and shared like the frame."""
+        frame = self.get()
+        with self._lock:
+            if frame is not self._frame:
+                # Reloaded by another session in between; don't cache a stale result
+                return build(frame)
+            if name not in self._derived:
+                self._derived[name] = build(frame)
+            return self._derived[name]
+
+    def previous(self, name):
+        """``name`` as derived from the previous data version, or None.
+
+        For ``derived`` builders that can update the old result incrementally;
+        call it from inside the builder, where the version cannot change.
+        """
+        return self._previous.get(name)
+
+    @property
+    def version(self):
+        return self._version
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "version": self._version,
+            "sha256": self._sha256,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._frame = None
+            self._mtime = None
+            self._sha256 = None
+            self._derived = {}
+            self._previous = {}
+
+
+_store = EmissionsStore()
+
+
+def get_store():
+    return _store
+
+
+def load_emissions():
+    """Long-format emissions from ``Data/co2-by-source.csv``, shared across sessions."""
+    return _store.get()
@@ -0,0 +1,169 @@
+"""Plotly figures shared by several views, built from whole columns and cached.
+
+Each figure is made in one ``go.Figure`` call from arrays, with its labels on
+the traces (``texttemplate``) instead of one layout annotation per bar, so the
+layout stays the same size however many bars there are. Figures are cached by
+their inputs: a rerun with an unchanged selection reuses the built figure and
+only pays for Streamlit's serialization.
+
+Emissions charts are kept to what a chart can show: line series longer than
+``MAX_POINTS`` are reduced with LTTB, lines switch to WebGL (``scattergl``)
+above ``WEBGL_POINTS`` points in total, and bar charts over countries keep
+the ``MAX_BARS`` largest and sum the rest into one "Other" bar. What was
+reduced is returned with the figure so the view can say so.
+"""
+import functools
+
+import numpy as np
+import plotly.graph_objects as go
+
+from ccs.cube import VALUE_COL
+from ccs.downsample import lttb
+
+# Points per line series: about the width of a full-width chart in pixels
+MAX_POINTS = 800
+# Total points above which lines are drawn with WebGL (Plotly Express uses 1000 too)
+WEBGL_POINTS = 1000
+# Categories on a bar chart's country axis
+MAX_BARS = 60
+# Mt are sent with three decimals (1 kt); hover shows two
+DECIMALS = 3
+
+
+@functools.lru_cache(maxsize=64)
+def _balance_figure(names, not_stored, stored, removal, title):
+    return go.Figure(
+        data=[
+            go.Bar(x=names, y=not_stored, name="CO₂ not removed", marker_color="silver",
+                   hovertemplate="Not removed: %{y:.2f} Mt"),
+            # Top of the stack, so its outside label sits above the whole bar
+            go.Bar(x=names, y=stored, name="CO₂ removed", marker_color="#6AA84F", customdata=removal,
+                   hovertemplate="Removed: %{y:.2f} Mt<br>% Removal: %{customdata:.2f}%",
+                   texttemplate="%{customdata:.1f}%", textposition="outside", cliponaxis=False),
+        ],
+        layout=dict(
+            title=dict(text=title, x=0.5),
+            barmode="stack",
+            yaxis_title="Total emissions (Mt CO₂)",
+            legend=dict(orientation="h", y=-0.2, x=0.5, xanchor="center"),
+            uniformtext=dict(mode="hide", minsize=8),
+        ),
+    )
+
+
+def balance_figure(df, title, label_column="Name"):
+    """Stacked removed / not removed bars with the % removal above each bar.
+
+    ``df`` has ``label_column`` and the ``ccs.balance.BALANCE_COLUMNS``. The
+    returned figure is shared, so it must not be modified.
+    """
+    return _balance_figure(tuple(df[label_column]), tuple(df["CO₂ not stored (Mt)"]), tuple(df["CO₂ stored (Mt)"]),
+                           tuple(df["% Removal"]), title)
+
+
+class Decimation:
+    """How an emissions chart was reduced from its data."""
+
+    def __init__(self, points, shown, series, webgl, grouped=0):
+        self.points = points  # data points before reduction
+        self.shown = shown  # points (or bars) in the figure
+        self.series = series  # line series that were downsampled
+        self.webgl = webgl
+        self.grouped = grouped  # countries summed into the "Other" bar
+
+    @property
+    def applied(self):
+        return self.shown < self.points
+
+    def describe(self):
+        """One sentence for the view, or "" when the chart shows every point as SVG."""
+        parts = []
+        if self.series:
+            parts.append(f"Downsampled with LTTB: {self.shown:,} of {self.points:,} points shown in {self.series} series.")
+        if self.grouped:
+            parts.append(f"The {self.grouped:,} smallest countries are summed into \"Other\".")
+        if self.webgl:
+            parts.append("Drawn with WebGL.")
+        return " ".join(parts)
+
+
+def _series(x, source, y, sources):
+    """``(source, x, y)`` per source, in ``sources`` order."""
+    for name in sources:
+        rows = source == name
+        if rows.any():
+            yield name, x[rows], y[rows]
+
+
+def _top_categories(x, source, y, max_bars):
+    """Keep the ``max_bars`` categories with the largest totals; the rest become one "Other" category."""
+    categories, codes = np.unique(x, return_inverse=True)
+    totals = np.bincount(codes, weights=np.nan_to_num(y), minlength=len(categories))
+    if len(categories) <= max_bars:
+        return x, source, y, 0
+    keep = np.zeros(len(categories), dtype=bool)
+    keep[np.argsort(-totals, kind="stable")[:max_bars - 1]] = True
+    rest = ~keep[codes]
+    other = f"Other ({int((~keep).sum())} countries)"
+    rest_sources, rest_codes = np.unique(source[rest], return_inverse=True)
+    rest_y = np.bincount(rest_codes, weights=np.nan_to_num(y[rest]), minlength=len(rest_sources))
+    # Kept categories in their original order, "Other" last
+    kept = ~rest
+    x = np.concatenate([x[kept], np.full(len(rest_sources), other, dtype=object)])
+    source = np.concatenate([source[kept], rest_sources])
+    y = np.concatenate([y[kept], rest_y])
+    return x, source, y, int((~keep).sum())
+
+
+@functools.lru_cache(maxsize=32)
+def _emissions_figure(chart_type, x_title, x, source, y, sources, color_map, title):
+    x = np.asarray(x, dtype=object if x and isinstance(x[0], str) else None)
+    source, y = np.asarray(source, dtype=object), np.asarray(y, dtype=float)
+    colors = dict(color_map)
+    categorical = x.dtype == object
+    points = len(y)
+    traces, shown, downsampled, grouped = [], 0, 0, 0
+
+    if chart_type == "Line Chart":
+        webgl = points > WEBGL_POINTS
+        trace = go.Scattergl if webgl else go.Scatter
+        for name, sx, sy in _series(x, source, y, sources):
+            if len(sy) > MAX_POINTS:
+                keep = lttb(np.arange(len(sx)) if categorical else sx, sy, MAX_POINTS)
+                sx, sy = sx[keep], sy[keep]
+                downsampled += 1
+            shown += len(sy)
+            traces.append(trace(x=sx, y=np.round(sy, DECIMALS), name=name, mode="lines+markers",
+                                line_color=colors.get(name), marker_color=colors.get(name), legendgroup=name,
+                                hovertemplate=f"{name}<br>%{{x}}: %{{y:.2f}} Mt<extra></extra>"))
+    else:
+        webgl = False
+        if categorical:
+            x, source, y, grouped = _top_categories(x, source, y, MAX_BARS)
+        for name, sx, sy in _series(x, source, y, sources):
+            shown += len(sy)
+            traces.append(go.Bar(x=sx, y=np.round(sy, DECIMALS), name=name, marker_color=colors.get(name),
+                                 hovertemplate=f"{name}<br>%{{x}}: %{{y:.2f}} Mt<extra></extra>"))
+
+    figure = go.Figure(
+        data=traces,
+        layout=dict(
+            title=dict(text=title),
+            # Categories keep the order given, e.g. "Other" last
+            xaxis=dict(title_text=x_title, categoryorder="trace" if categorical else None),
+            yaxis_title=VALUE_COL,
+            legend_title_text="Source",
+            barmode="group",
+        ),
+    )
+    return figure, Decimation(points, shown, downsampled, webgl, grouped)
+
+
+def emissions_figure(df, x_axis, chart_type, sources, title, color_map):
+    """Line or grouped bar chart of ``df`` (``x_axis``, ``Source``, ``Emissions (Mt)``) per source.
+
+    Returns the figure and a ``Decimation`` describing any downsampling. The
+    figure is shared, so it must not be modified.
+    """
+    return _emissions_figure(chart_type, x_axis, tuple(df[x_axis].tolist()), tuple(df["Source"]),
+                             tuple(df[VALUE_COL]), tuple(sorted(sources)), tuple(color_map.items()), title)
@@ -0,0 +1,170 @@
+"""Trend projections of emissions and years-to-fill of storage capacity.
+
+Every Country × Source series of the emissions cube gets a trend fitted over
+its last ``window`` years, all of them at once: the closed-form weighted
+least-squares sums are taken along the year axis of the ``(countries, years,
+sources)`` array, with unreported years weighted zero. Three models:
+
+* ``linear``: ``y = a + b·t``
+* ``log-linear``: ``ln y = a + b·t`` on the positive years, i.e. constant growth
+* ``damped``: the linear fit with its slope shrinking by ``DAMPING`` per year,
+  so the projection levels off instead of growing or falling forever
+
+``t`` counts years from the last historical year, so ``a`` is the fitted level
+there. Projections are clipped at zero. Fits and projections are cached per
+cube, which is rebuilt only when the data changes.
+"""
+import functools
+
+import numpy as np
+import pandas as pd
+
+from ccs.cube import load_cube
+
+MODELS = ("linear", "log-linear", "damped")
+DEFAULT_WINDOW = 30
+DEFAULT_HORIZON = 100
+DAMPING = 0.9
+# Series with fewer reported years than this are projected flat at their mean
+MIN_POINTS = 3
+
+
+class TrendFit:
+    """Level and slope per Country × Source, shape ``(countries, sources)``."""
+
+    def __init__(self, model, level, slope, rmse, last_year):
+        self.model = model
+        self.level = level
+        self.slope = slope
+        self.rmse = rmse  # in Mt, for every model
+        self.last_year = last_year
+
+    def project(self, horizon):
+        """Projected emissions for the next ``horizon`` years, shape ``(countries, horizon, sources)``."""
+        h = np.arange(1, horizon + 1, dtype=float)[None, :, None]
+        level, slope = self.level[:, None, :], self.slope[:, None, :]
+        if self.model == "linear":
+            values = level + slope * h
+        elif self.model == "log-linear":
+            with np.errstate(over="ignore"):
+                values = np.exp(level + slope * h)
+        else:
+            values = level + slope * DAMPING * (1 - DAMPING ** h) / (1 - DAMPING)
+        return np.clip(np.nan_to_num(values, nan=0.0, posinf=0.0), 0.0, None)
+
+
+def _least_squares(t, y, w):
+    """Weighted fit of ``y ≈ a + b·t`` along axis 1 for every series at once."""
+    sw = w.sum(axis=1)
+    st, sy = (w * t).sum(axis=1), (w * y).sum(axis=1)
+    stt, sty = (w * t * t).sum(axis=1), (w * t * y).sum(axis=1)
+    det = sw * stt - st ** 2
+    enough = (sw >= MIN_POINTS) & (det > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(enough, (sw * sty - st * sy) / det, 0.0)
+        level = np.where(sw > 0, (sy - slope * st) / sw, 0.0)
+    return level, slope
+
+
+def fit_trends(cube, model="linear", window=DEFAULT_WINDOW):
+    """Fit ``model`` to every Country × Source series over the last ``window`` years of ``cube``."""
+    if model not in MODELS:
+        raise ValueError(f"Unknown trend model: {model!r} (expected one of {', '.join(MODELS)})")
+    y = cube.values[:, -window:, :]
+    w = cube.present[:, -window:, :].astype(float)
+    t = (cube.years[-window:] - cube.years[-1]).astype(float)[None, :, None]
+
+    if model == "log-linear":
+        positive = w * (y > 0)
+        level, slope = _least_squares(t, np.log(np.where(y > 0, y, 1.0)), positive)
+        fitted = np.exp(level[:, None, :] + slope[:, None, :] * t)
+        # Series that were never positive stay at zero
+        level = np.where(positive.sum(axis=1) > 0, level, -np.inf)
+        fitted = np.where(np.isfinite(level)[:, None, :], fitted, 0.0)
+    else:
+        level, slope = _least_squares(t, y, w)
+        fitted = level[:, None, :] + slope[:, None, :] * t
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rmse = np.sqrt((w * (y - fitted) ** 2).sum(axis=1) / w.sum(axis=1))
+    return TrendFit(model, level, slope, rmse, int(cube.years[-1]))
+
+
+@functools.lru_cache(maxsize=16)
+def _projection(cube, model, window, horizon):
+    fit = fit_trends(cube, model, window)
+    values = fit.project(horizon)
+    values.flags.writeable = False
+    return fit, values
+
+
+def projection(model="linear", window=DEFAULT_WINDOW, horizon=DEFAULT_HORIZON, cube=None):
+    """``(fit, values)`` for the current data, cached per cube and settings.
+
+    ``values`` is read-only, shape ``(countries, horizon, sources)``, covering
+    the years after the last historical one.
+    """
+    return _projection(cube or load_cube(), model, int(window), int(horizon))
+
+
+def projection_frame(country=None, region=None, model="linear", window=DEFAULT_WINDOW, horizon=DEFAULT_HORIZON):
+    """History and projection of total emissions for one country or region, for charts."""
+    cube = load_cube()
+    fit, values = projection(model, window, horizon, cube)
+    if country is not None:
+        history, exists = cube.values[cube.country_index[country]], cube.exists[cube.country_index[country]]
+        future = values[cube.country_index[country]]
+    else:
+        r = cube.region_index[region]
+        history, exists = cube.region_values[r], cube.region_exists[r]
+        future = np.einsum("c,chs->hs", cube.region_mask[r].astype(float), values)
+    rows = np.flatnonzero(exists)
+    return pd.concat([
+        pd.DataFrame({"Year": cube.years[rows], "Emissions (Mt)": history[rows].sum(axis=1), "Series": "Historical"}),
+        pd.DataFrame({"Year": fit.last_year + np.arange(1, horizon + 1), "Emissions (Mt)": future.sum(axis=1),
+                      "Series": f"Projected ({model})"}),
+    ], ignore_index=True)
+
+
+def _years_to_fill(capacity, annual):
+    """Years until cumulative ``annual`` emissions (rows × horizon) reach ``capacity``; inf past the horizon."""
+    cumulative = np.cumsum(annual, axis=1)
+    full = cumulative >= capacity[:, None]
+    reached = full.any(axis=1)
+    year = np.argmax(full, axis=1)
+    rows = np.arange(len(capacity))
+    before = np.where(year > 0, cumulative[rows, np.maximum(year - 1, 0)], 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Linear within the year that fills the reservoirs
+        fraction = (capacity - before) / annual[rows, year]
+    years = np.where(reached, year + np.nan_to_num(fraction), np.inf)
+    return np.where(capacity > 0, years, 0.0)
+
+
+def years_to_fill(capacity_by_country, model="linear", window=DEFAULT_WINDOW, horizon=DEFAULT_HORIZON):
+    """Years of projected emissions that storage could absorb, per country and per region.
+
+    ``capacity_by_country`` maps countries to total storage in Mt; countries
+    without an entry count as zero. Counting starts the year after the last
+    historical one and is ``inf`` when the projection never fills the storage
+    within ``horizon`` years.
+    """
+    cube = load_cube()
+    fit, values = projection(model, window, horizon, cube)
+    annual = values.sum(axis=2)  # countries × horizon
+    capacity = np.array([float(capacity_by_country.get(c, 0.0)) for c in cube.countries])
+
+    region_annual = cube.region_mask.astype(float) @ annual
+    region_capacity = cube.region_mask.astype(float) @ capacity
+    names = list(cube.countries) + list(cube.regions)
+    levels = ["Country"] * len(cube.countries) + ["Region"] * len(cube.regions)
+    annual = np.vstack([annual, region_annual])
+    capacity = np.concatenate([capacity, region_capacity])
+    return pd.DataFrame({
+        "Level": levels,
+        "Name": names,
+        "Capacity (Mt)": capacity,
+        f"Emissions {fit.last_year + 1} (Mt)": annual[:, 0],
+        f"Emissions {fit.last_year + horizon} (Mt)": annual[:, -1],
+        "Years to fill": _years_to_fill(capacity, annual),
+    })
@@ -0,0 +1,116 @@
+"""Small computation graph with memoized nodes, for widget-driven reruns.
+
+A view declares its computations once as nodes of a ``Graph``: each node is
+a function of named inputs (normalized widget values, the data cube) and of
+other nodes. Each user session evaluates the graph through its own
+``Session``, which remembers every node's last inputs and result. On a
+rerun only the nodes whose inputs, or whose upstream nodes, changed are
+recomputed; everything else is served from the session's memo::
+
+    graph = Graph("emissions")
+
+    @graph.node("cube", "country", "years")
+    def table(cube, country, years):
+        ...
+
+    session.rerun(cube=cube, country="Brazil", years=(1990, 2023))
+    session["table"]
+    session.log()   # which nodes were recomputed and which were cached
+
+Nothing here depends on Streamlit; the app keeps the ``Session`` in
+``st.session_state``.
+"""
+import logging
+
+import numpy as np
+
+from ccs.tracing import annotate, span
+
+logger = logging.getLogger("ccs.graph")
+
+
+def normalize(value):
+    """Hashable, order-stable form of a widget value: lists become tuples, NumPy scalars Python ones."""
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(normalize(v) for v in value))
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class Node:
+
+    def __init__(self, name, func, inputs, after):
+        self.name = name
+        self.func = func
+        self.inputs = inputs
+        self.after = after
+
+
+class Graph:
+    """Node definitions shared by every session of a view."""
+
+    def __init__(self, name):
+        self.name = name
+        self.nodes = {}
+
+    def node(self, *inputs, after=()):
+        """Register the decorated function as a node.
+
+        It is called with the values of ``inputs`` and then the results of the
+        ``after`` nodes, positionally, and its name is the node's name.
+        """
+        def register(func):
+            self.nodes[func.__name__] = Node(func.__name__, func, tuple(inputs), tuple(after))
+            return func
+        return register
+
+    def session(self):
+        return Session(self)
+
+
+class Session:
+    """One user's memo of a ``Graph``: last key and result of every node."""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.inputs = {}
+        self.memo = {}  # node -> (key, result, version)
+        self.recomputed = []
+        self.cached = []
+
+    def rerun(self, **inputs):
+        """Start a rerun with these inputs; more can be added with ``set`` as widgets are drawn."""
+        self.inputs = {}
+        self.recomputed, self.cached = [], []
+        self.set(**inputs)
+
+    def set(self, **inputs):
+        self.inputs.update({name: normalize(value) for name, value in inputs.items()})
+
+    def _version(self, name):
+        self[name]
+        return self.memo[name][2]
+
+    def __getitem__(self, name):
+        node = self.graph.nodes[name]
+        # Upstream nodes are keyed by how often they were recomputed, not by their (unhashable) results
+        key = tuple(self.inputs[i] for i in node.inputs) + tuple(self._version(a) for a in node.after)
+        memo = self.memo.get(name)
+        if memo is not None and memo[0] == key:
+            if name not in self.cached and name not in self.recomputed:
+                self.cached.append(name)
+            return memo[1]
+        with span(name):
+            result = node.func(*(self.inputs[i] for i in node.inputs), *(self.memo[a][1] for a in node.after))
+        self.memo[name] = (key, result, (memo[2] + 1) if memo else 1)
+        self.recomputed.append(name)
+        return result
+
+    def log(self):
+        """Log (and add to the open trace) the nodes recomputed and cached in this rerun."""
+        logger.info("%s rerun: recomputed %s; cached %s", self.graph.name,
+                    ", ".join(self.recomputed) or "nothing", ", ".join(self.cached) or "nothing")
+        annotate(graph={"name": self.graph.name, "recomputed": list(self.recomputed), "cached": list(self.cached)})
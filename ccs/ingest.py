@@ -0,0 +1,459 @@
+"""Streaming ingestion of large emissions files into Country × Year × Source totals.
+
+The app reads ``co2-by-source.csv`` whole, which is fine for eight countries
+but not for a multi-million-row facility inventory or the full global
+by-source dataset. Here a file is read in chunks with explicit dtypes; each
+chunk is validated, its entities are mapped to the app's countries, and its
+rows are added straight into dense Country × Year × Source arrays before the
+next chunk is read. Peak memory is one chunk plus the arrays, whatever the
+size of the file.
+
+Two layouts are understood:
+
+- ``wide``: one row per entity and year with a column per source, like
+  ``co2-by-source.csv`` and the ``annual-co-emissions-from-*.csv`` files.
+  Source columns are recognised by name ("Coal", "Annual CO₂ emissions from
+  coal", …); values are in tonnes.
+- ``facility``: one row per facility (or any finer unit) and year, with
+  country, source and emissions columns. Rows for the same country, year and
+  source are summed.
+
+The result is an ``EmissionsCube`` or a compact ``co2-by-source.csv`` the app
+can serve from its own directory; the reservoir files it does not find there
+are read from the repository's ``Data/``::
+
+    python -m ccs.ingest global-co2-by-source.csv -o /tmp/datos/co2-by-source.csv --all-countries
+    python -m ccs.ingest facilities.csv --country-column country --source-column sector \\
+        --value-column co2_t -o /tmp/datos/co2-by-source.csv
+    CCS_DATA_DIR=/tmp/datos streamlit run ccs_app.py
+"""
+import argparse
+import collections
+import csv
+import logging
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ccs.cube import VALUE_COL, EmissionsCube
+from ccs.emissions import SOURCES
+from ccs.regions import COUNTRY_CODES, REGIONS, REGION_TREE, region_countries
+
+logger = logging.getLogger("ccs.ingest")
+
+DEFAULT_CHUNKSIZE = 250_000
+# Column names of the facility layout unless given explicitly
+FACILITY_COLUMNS = {"country": "Country", "year": "Year", "source": "Source", "value": "Emissions"}
+# Tonnes per unit of the input values; the cube is in Mt
+UNITS = {"t": 1e-6, "kt": 1e-3, "Mt": 1.0}
+# Plausible years; anything else is treated as a parse error in the file
+YEAR_RANGE = (1750, 2100)
+
+# Words that identify a source in a column name or a facility's source label.
+# Flaring comes before Gas so "gas flaring" is flaring, not gas.
+SOURCE_WORDS = [
+    ("Flaring", ("flaring", "flare")),
+    ("Cement", ("cement", "clinker")),
+    ("Coal", ("coal", "lignite", "anthracite")),
+    ("Oil", ("oil", "petroleum", "diesel", "gasoline")),
+    ("Gas", ("gas", "lng")),
+]
+# Other spellings of the app's countries in public inventories
+COUNTRY_ALIASES = {
+    "United States of America": "United States",
+    "US": "United States",
+    "U.S.": "United States",
+    "Venezuela (Bolivarian Republic of)": "Venezuela",
+    "Bolivarian Republic of Venezuela": "Venezuela",
+    "Brasil": "Brazil",
+    "México": "Mexico",
+}
+
+
+def _normalize(name):
+    return " ".join(re.sub(r"[^\w]+", " ", str(name).casefold()).split())
+
+
+def source_of(label):
+    """App source named by a column name or a source label, or None."""
+    words = set(_normalize(label).split())
+    for source, keys in SOURCE_WORDS:
+        if words.intersection(keys):
+            return source
+    return None
+
+
+class CountryMapper:
+    """Resolves entity names and ISO codes to the app's country names.
+
+    By default only the countries of ``ccs.regions.REGION_TREE`` are kept.
+    With ``keep_all`` every other entity is kept under its own name unless it
+    is an aggregate: rows whose code is empty or an ``OWID_`` code (World,
+    continents, income groups) are dropped when the file has a code column.
+    """
+
+    def __init__(self, countries=None, keep_all=False):
+        root = next(iter(REGION_TREE))
+        self.countries = list(countries or region_countries(root))
+        self.keep_all = keep_all
+        self.lookup = {}
+        for country in self.countries:
+            self.lookup[_normalize(country)] = country
+            if country in COUNTRY_CODES:
+                self.lookup[_normalize(COUNTRY_CODES[country])] = country
+        for alias, country in COUNTRY_ALIASES.items():
+            if country in self.countries:
+                self.lookup[_normalize(alias)] = country
+        self._resolved = {}
+
+    def resolve(self, entity, code=None):
+        key = (entity, code)
+        if key not in self._resolved:
+            self._resolved[key] = self._resolve(entity, code)
+        return self._resolved[key]
+
+    def _resolve(self, entity, code):
+        for name in (entity, code):
+            if isinstance(name, str) and _normalize(name) in self.lookup:
+                return self.lookup[_normalize(name)]
+        if not self.keep_all or not isinstance(entity, str) or not entity.strip():
+            return None
+        if code is not None and (not isinstance(code, str) or not code.strip() or code.startswith("OWID_")):
+            return None
+        return entity.strip()
+
+
+class IngestReport:
+    """Row counts of one ingestion, for logging and for spotting mapping problems."""
+
+    def __init__(self):
+        self.chunks = 0
+        self.rows = 0
+        self.kept = 0
+        self.unmapped = collections.Counter()  # entity -> rows
+        self.bad_years = 0
+        self.bad_values = 0  # negative or non-numeric emissions, dropped
+        self.other_sources = collections.Counter()  # facility source label -> rows
+        self.ignored_columns = []  # wide layout columns that are not an app source
+        self.seconds = 0.0
+
+    def summary(self):
+        lines = [f"{self.rows:,} rows in {self.chunks} chunks, {self.kept:,} kept ({self.seconds:.1f} s)"]
+        if self.unmapped:
+            top = ", ".join(f"{name} ({rows:,})" for name, rows in self.unmapped.most_common(5))
+            lines.append(f"{sum(self.unmapped.values()):,} rows of {len(self.unmapped)} unmapped entities: {top}")
+        if self.ignored_columns:
+            lines.append(f"ignored columns: {', '.join(self.ignored_columns)}")
+        if self.other_sources:
+            top = ", ".join(f"{name} ({rows:,})" for name, rows in self.other_sources.most_common(5))
+            lines.append(f"{sum(self.other_sources.values()):,} values from other sources: {top}")
+        if self.bad_years:
+            lines.append(f"{self.bad_years:,} rows with a missing or invalid year")
+        if self.bad_values:
+            lines.append(f"{self.bad_values:,} negative or non-numeric emissions dropped")
+        return "\n".join(lines)
+
+
+class CubeAccumulator:
+    """Country × Year × Source sums that grow as chunks bring new countries and years."""
+
+    def __init__(self, sources=SOURCES):
+        self.sources = list(sources)
+        self.countries = []
+        self.country_index = {}
+        self.codes = {}  # country -> first ISO code seen
+        self.first_year = None
+        self.values = np.zeros((0, 0, len(self.sources)))
+        self.present = np.zeros((0, 0, len(self.sources)), dtype=bool)
+        self.exists = np.zeros((0, 0), dtype=bool)
+
+    def country(self, name, code=None):
+        """Row index of ``name``, adding it if new; -1 for None."""
+        if name is None:
+            return -1
+        if name not in self.country_index:
+            self.country_index[name] = len(self.countries)
+            self.countries.append(name)
+        if isinstance(code, str) and code.strip():
+            self.codes.setdefault(name, code.strip())
+        return self.country_index[name]
+
+    def _grow(self, first, last):
+        """Make room for every known country and the years ``first``–``last``."""
+        n_countries, n_years = self.exists.shape
+        old_first = self.first_year if n_years else first
+        new_first = min(old_first, first)
+        new_last = max(old_first + n_years - 1, last) if n_years else last
+        new_years = new_last - new_first + 1
+        if len(self.countries) <= n_countries and new_years == n_years:
+            return
+        # Countries grow geometrically so a stream of new names is not quadratic
+        rows = max(len(self.countries), n_countries, 2 * n_countries if len(self.countries) > n_countries else 0)
+        offset = old_first - new_first
+        for name in ("values", "present", "exists"):
+            old = getattr(self, name)
+            new = np.zeros((rows, new_years) + old.shape[2:], dtype=old.dtype)
+            new[:n_countries, offset:offset + n_years] = old
+            setattr(self, name, new)
+        self.first_year = new_first
+
+    def add(self, country, year, source, value):
+        """Add rows given as parallel arrays of country index, year, source index and Mt.
+
+        NaN values mark a country-year that exists but did not report that source.
+        """
+        if not len(country):
+            return
+        self._grow(int(year.min()), int(year.max()))
+        n_countries, n_years, n_sources = self.values.shape
+        cell = country * n_years + (year - self.first_year)
+        self.exists.ravel()[cell] = True
+        reported = ~np.isnan(value)
+        flat = cell[reported] * n_sources + source[reported]
+        size = self.values.size
+        self.values += np.bincount(flat, weights=value[reported], minlength=size).reshape(self.values.shape)
+        self.present.ravel()[flat] = True
+
+    def snapshot(self):
+        return {"countries": list(self.countries), "codes": dict(self.codes), "first_year": self.first_year,
+                "values": self.values.copy(), "present": self.present.copy(), "exists": self.exists.copy()}
+
+    def restore(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.country_index = {c: i for i, c in enumerate(self.countries)}
+
+    def _trimmed(self):
+        """Arrays for the countries with rows, sorted by name like ``EmissionsCube.from_long``."""
+        n = min(len(self.countries), self.exists.shape[0])
+        rows = np.flatnonzero(self.exists[:n].any(axis=1))
+        order = rows[np.argsort(np.asarray(self.countries, dtype=object)[rows].astype(str), kind="stable")]
+        years = np.flatnonzero(self.exists[rows].any(axis=0))
+        span = slice(years[0], years[-1] + 1) if len(years) else slice(0, 0)
+        return ([self.countries[i] for i in order], np.arange(span.start, span.stop) + (self.first_year or 0),
+                self.values[order, span], self.present[order, span], self.exists[order, span])
+
+    def cube(self, regions=REGIONS):
+        countries, years, values, present, exists = self._trimmed()
+        if not countries:
+            raise ValueError("No rows were ingested")
+        return EmissionsCube(countries, years, self.sources, values, present, exists, regions)
+
+    def long_frame(self):
+        """Country / Year / Source / Emissions (Mt), like ``ccs.emissions.reshape_emissions``."""
+        countries, years, values, present, exists = self._trimmed()
+        c, y = np.nonzero(exists)
+        n_sources = len(self.sources)
+        return pd.DataFrame({
+            "Country": np.repeat(np.asarray(countries, dtype=object)[c], n_sources),
+            "Year": np.repeat(years[y], n_sources),
+            "Source": np.tile(self.sources, len(c)),
+            VALUE_COL: np.where(present[c, y], values[c, y], np.nan).ravel(),
+        })
+
+    def wide_frame(self):
+        """A ``co2-by-source.csv`` table in tonnes, one row per country and year that exists."""
+        countries, years, values, present, exists = self._trimmed()
+        c, y = np.nonzero(exists)
+        df = pd.DataFrame(np.where(present[c, y], values[c, y] * 1e6, np.nan), columns=self.sources)
+        df.insert(0, "Year", years[y])
+        df.insert(0, "Code", [self.codes.get(countries[i], COUNTRY_CODES.get(countries[i], "")) for i in c])
+        df.insert(0, "Entity", np.asarray(countries, dtype=object)[c])
+        return df
+
+
+# --- Reading ---
+def _header(path):
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def detect_layout(columns):
+    """``"wide"`` if the file has Entity/Year and per-source columns, else ``"facility"``."""
+    values = [col for col in columns if col not in ("Entity", "Code", "Year")]
+    if "Entity" in columns and "Year" in columns and any(source_of(col) for col in values):
+        return "wide"
+    return "facility"
+
+
+def _years(chunk, column, report):
+    """Integer years and the mask of valid ones."""
+    years = pd.to_numeric(chunk[column], errors="coerce").to_numpy(dtype=float)
+    valid = np.isfinite(years) & (years == np.round(years)) & (years >= YEAR_RANGE[0]) & (years <= YEAR_RANGE[1])
+    report.bad_years += int((~valid).sum())
+    return np.where(valid, years, 0).astype(np.int64), valid
+
+
+def _values(chunk, column, scale, report):
+    """Emissions in Mt with NaN for missing cells; invalid ones are counted and become NaN."""
+    raw = chunk[column]
+    values = pd.to_numeric(raw, errors="coerce").to_numpy(dtype=float)
+    invalid = (np.isnan(values) & raw.notna().to_numpy()) | (values < 0)
+    report.bad_values += int(invalid.sum())
+    values[invalid] = np.nan
+    return values * scale
+
+
+def _country_rows(chunk, entity_col, code_col, mapper, accumulator, report):
+    """Accumulator country index per row, -1 where the entity is not kept."""
+    codes, entities = pd.factorize(chunk[entity_col])
+    first = np.unique(codes, return_index=True)[1] if len(codes) else np.array([], dtype=int)
+    first = first[codes[first] >= 0]
+    iso = chunk[code_col].to_numpy()[first] if code_col else [None] * len(first)
+    index = np.full(len(entities), -1)
+    for i, code in zip(codes[first], iso):
+        code = None if code_col is None else (code if isinstance(code, str) else "")
+        index[i] = accumulator.country(mapper.resolve(entities[i], code), code)
+    rows = np.where(codes >= 0, index[codes], -1)
+    dropped = rows < 0
+    if dropped.any():
+        names = chunk[entity_col].to_numpy()[dropped]
+        report.unmapped.update(pd.Series(names).fillna("(missing)").value_counts().to_dict())
+    return rows
+
+
+def _read(path, usecols, text, numeric, chunksize, strict):
+    """Chunks with text columns as str and numeric ones as float64 (or str to coerce when not strict)."""
+    dtype = {col: str for col in text}
+    dtype.update({col: "float64" if strict else str for col in numeric})
+    return pd.read_csv(path, usecols=usecols, dtype=dtype, chunksize=chunksize, keep_default_na=True)
+
+
+def _ingest_wide(path, columns, mapper, accumulator, report, chunksize, strict):
+    code_col = "Code" if "Code" in columns else None
+    value_cols = [col for col in columns if col not in ("Entity", "Code", "Year")]
+    mapped = [(col, source_of(col)) for col in value_cols]
+    report.ignored_columns = [col for col, source in mapped if source is None]
+    mapped = [(col, accumulator.sources.index(source)) for col, source in mapped if source is not None]
+    text = ["Entity"] + ([code_col] if code_col else [])
+    usecols = text + ["Year"] + [col for col, _ in mapped]
+
+    for chunk in _read(path, usecols, text, ["Year"] + [col for col, _ in mapped], chunksize, strict):
+        report.chunks += 1
+        report.rows += len(chunk)
+        country = _country_rows(chunk, "Entity", code_col, mapper, accumulator, report)
+        year, valid = _years(chunk, "Year", report)
+        keep = valid & (country >= 0)
+        report.kept += int(keep.sum())
+        for col, s in mapped:
+            values = _values(chunk, col, UNITS["t"], report)[keep]
+            accumulator.add(country[keep], year[keep], np.full(len(values), s), values)
+
+
+def _ingest_facility(path, names, unit, mapper, accumulator, report, chunksize, strict):
+    text = [names["country"], names["source"]]
+    usecols = text + [names["year"], names["value"]]
+    source_labels = {}
+
+    for chunk in _read(path, usecols, text, [names["year"], names["value"]], chunksize, strict):
+        report.chunks += 1
+        report.rows += len(chunk)
+        country = _country_rows(chunk, names["country"], None, mapper, accumulator, report)
+        year, valid = _years(chunk, names["year"], report)
+
+        labels, uniques = pd.factorize(chunk[names["source"]])
+        lookup = np.array([source_labels.setdefault(u, _source_index(u, accumulator)) for u in uniques] + [-1])
+        source = lookup[labels]  # factorize marks missing labels with -1, the trailing entry
+        other = source < 0
+        if other.any():
+            report.other_sources.update(chunk[names["source"]][other].fillna("(missing)").value_counts().to_dict())
+
+        values = _values(chunk, names["value"], UNITS[unit], report)
+        keep = valid & (country >= 0) & ~other
+        report.kept += int(keep.sum())
+        accumulator.add(country[keep], year[keep], source[keep], values[keep])
+
+
+def _source_index(label, accumulator):
+    source = source_of(label)
+    return accumulator.sources.index(source) if source in accumulator.sources else -1
+
+
+def ingest(path, layout=None, chunksize=DEFAULT_CHUNKSIZE, countries=None, keep_all=False,
+           columns=None, unit="t", accumulator=None):
+    """Stream ``path`` into a ``CubeAccumulator`` and return it with an ``IngestReport``.
+
+    ``layout`` is ``"wide"`` or ``"facility"`` and is detected from the header
+    when omitted. For the facility layout ``columns`` maps ``country``,
+    ``year``, ``source`` and ``value`` to the file's column names (defaults in
+    ``FACILITY_COLUMNS``) and ``unit`` is the unit of the values (``t``,
+    ``kt`` or ``Mt``). Several files can be folded into one ``accumulator``.
+    Missing columns raise ``ValueError``.
+    """
+    path = Path(path)
+    header = _header(path)
+    layout = layout or detect_layout(header)
+    names = {**FACILITY_COLUMNS, **(columns or {})}
+    required = ["Entity", "Year"] if layout == "wide" else list(names.values())
+    missing = [col for col in required if col not in header]
+    if missing:
+        raise ValueError(f"{path.name} is missing columns for the {layout} layout: {', '.join(missing)}")
+    if unit not in UNITS:
+        raise ValueError(f"Unknown unit {unit!r}; expected one of {', '.join(UNITS)}")
+
+    mapper = CountryMapper(countries, keep_all)
+    start = time.perf_counter()
+    # Numeric columns are parsed as float64 directly; a file with text in them
+    # is read again with those columns as strings and coerced chunk by chunk.
+    accumulator = accumulator or CubeAccumulator()
+    state = accumulator.snapshot()
+    for strict in (True, False):
+        report = IngestReport()
+        try:
+            if layout == "wide":
+                _ingest_wide(path, header, mapper, accumulator, report, chunksize, strict)
+            else:
+                _ingest_facility(path, names, unit, mapper, accumulator, report, chunksize, strict)
+            break
+        except ValueError:
+            if not strict:
+                raise
+            logger.info("%s has non-numeric values; reading it again with coercion", path.name)
+            accumulator.restore(state)
+    report.seconds = time.perf_counter() - start
+    logger.info("%s: %s", path.name, report.summary().replace("\n", "; "))
+    return accumulator, report
+
+
+def ingest_cube(path, regions=REGIONS, **kwargs):
+    """``EmissionsCube`` of a large emissions file, built chunk by chunk."""
+    accumulator, _ = ingest(path, **kwargs)
+    return accumulator.cube(regions)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ccs.ingest",
+                                     description="Aggregate large emissions files into a co2-by-source.csv")
+    parser.add_argument("files", nargs="+", help="CSV files, folded into one table")
+    parser.add_argument("-o", "--output", required=True, help="co2-by-source.csv to write")
+    parser.add_argument("--layout", choices=["wide", "facility"], help="default: detected from the header")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="rows per chunk")
+    parser.add_argument("--all-countries", action="store_true",
+                        help="keep every country, not only those of the app's regions")
+    for key, default in FACILITY_COLUMNS.items():
+        parser.add_argument(f"--{key}-column", default=default, help=f"facility layout (default: {default})")
+    parser.add_argument("--unit", choices=list(UNITS), default="t", help="facility values (default: t)")
+    args = parser.parse_args(argv)
+
+    columns = {key: getattr(args, f"{key}_column") for key in FACILITY_COLUMNS}
+    accumulator = CubeAccumulator()
+    try:
+        for path in args.files:
+            _, report = ingest(path, args.layout, args.chunksize, keep_all=args.all_countries,
+                               columns=columns, unit=args.unit, accumulator=accumulator)
+            print(f"{path}:\n  " + report.summary().replace("\n", "\n  "))
+    except ValueError as error:
+        parser.exit(2, f"error: {error}\n")
+    if not accumulator.countries:
+        parser.exit(1, "error: no rows matched the app's countries (see --all-countries)\n")
+
+    df = accumulator.wide_frame()
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(args.output, index=False, quoting=csv.QUOTE_ALL, float_format="%.0f")
+    print(f"{args.output}: {df['Entity'].nunique()} countries, {len(df):,} country-years")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""Folium map of the reservoir catalog for the Reservoirs Location view.
+
+The map HTML for each view ("America" or one country) is built once per
+catalog version and reused on every rerun and by every session. Custom
+markers use small pre-sized sprites instead of the full-resolution artwork in
+``Sources/Icons``, each embedded once per page as a CSS class that all its
+markers share rather than once per marker. Build the sprites with::
+
+    python -m ccs.maps sprites
+
+Views with more than ``LARGE_CATALOG_THRESHOLD`` sites (national well or
+aquifer inventories) switch to a large-catalog mode: every point goes into a
+single client-side clustered layer, and only the points inside the current
+viewport are sent, thinned on a pixel grid at low zoom. Sites sharing a
+location are fanned out on a small sunflower spiral, the same way every time,
+instead of being jittered.
+"""
+import argparse
+import base64
+import functools
+from pathlib import Path
+
+import folium
+import numpy as np
+import pandas as pd
+from folium.plugins import FastMarkerCluster
+
+from ccs.catalog import load_catalog
+from ccs.regions import COUNTRY_CENTER
+from ccs.spatial import catalog_index
+
+ICON_DIR = Path(__file__).resolve().parent.parent / "Sources" / "Icons"
+SPRITE_DIR = ICON_DIR / "sprites"
+SPRITE_SIZE = 40  # px, the size markers are displayed at
+SPRITE_ICONS = ["Aquifer", "Reservoir"]
+
+AMERICA_VIEW = {"center": [10, -60], "zoom": 2}
+COUNTRY_ZOOM = 4
+
+# Sites per view before switching to one clustered layer; each folium marker costs ~3 ms to render
+LARGE_CATALOG_THRESHOLD = 300
+MAX_VIEW_POINTS = 20_000         # points sent to the browser per viewport at most
+THIN_CELL_PX = 4                 # at low zoom, keep one point per cell of this many pixels
+SPREAD_RADIUS = 0.004            # degrees between co-located sites
+GOLDEN_ANGLE = np.pi * (3 - np.sqrt(5))
+
+# Builds each marker of the clustered layer in the browser from
+# [lat, lon, field, formation, capacity, sites]; ``sites`` > 1 when thinning merged nearby points into it
+CLUSTER_CALLBACK = """
+function (row) {
+    var html = "<b>" + row[2] + "</b><br>Formation: " + row[3] + "<br>Capacity: " + row[4];
+    if (row[5] > 1) { html += "<br>+" + (row[5] - 1) + " nearby sites (zoom in)"; }
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {sites: row[5]});
+    marker.bindTooltip(html);
+    marker.bindPopup(html);
+    return marker;
+}
+"""
+# Cluster badges count the sites behind each marker, not the markers sent
+CLUSTER_ICON = """
+function (cluster) {
+    var sites = 0;
+    cluster.getAllChildMarkers().forEach(function (m) { sites += m.options.sites || 1; });
+    var size = sites < 100 ? "small" : (sites < 1000 ? "medium" : "large");
+    return L.divIcon({html: "<div><span>" + sites.toLocaleString() + "</span></div>",
+                      className: "marker-cluster marker-cluster-" + size, iconSize: new L.Point(40, 40)});
+}
+"""
+
+
+def sprite_path(name, size=SPRITE_SIZE):
+    return SPRITE_DIR / f"{name}-{size}.png"
+
+
+def icon_path(name):
+    """Sprite for ``name`` if it has been built, otherwise the full-size icon."""
+    sprite = sprite_path(name)
+    return sprite if sprite.exists() else ICON_DIR / f"{name}.png"
+
+
+@functools.lru_cache(maxsize=None)
+def icon_css(names):
+    """One ``.ccs-icon-<name>`` class per icon with its image as a data URI, for shared marker icons."""
+    rules = []
+    for name in names:
+        data = base64.b64encode(icon_path(name).read_bytes()).decode("ascii")
+        rules.append(f".ccs-icon-{name} {{background: url(data:image/png;base64,{data}) center / contain no-repeat;}}")
+    return "<style>" + "\n".join(rules) + "</style>"
+
+
+def build_sprites(names=SPRITE_ICONS, size=SPRITE_SIZE):
+    """Downscale each icon to fit a ``size`` × ``size`` transparent square."""
+    from PIL import Image
+
+    SPRITE_DIR.mkdir(exist_ok=True)
+    written = []
+    for name in names:
+        with Image.open(ICON_DIR / f"{name}.png") as image:
+            image = image.convert("RGBA")
+            image.thumbnail((size, size), Image.LANCZOS)
+            sprite = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+            sprite.paste(image, ((size - image.width) // 2, (size - image.height) // 2))
+        sprite.save(sprite_path(name, size), optimize=True)
+        written.append(sprite_path(name, size))
+    return written
+
+
+def view_options(catalog):
+    return ["America"] + sorted(catalog.countries)
+
+
+def view_rows(catalog, view):
+    return catalog.rows() if view == "America" else catalog.rows(country=view)
+
+
+def view_center(view):
+    """Initial ``(center, zoom)`` of a view."""
+    if view == "America":
+        return AMERICA_VIEW["center"], AMERICA_VIEW["zoom"]
+    return COUNTRY_CENTER.get(view, AMERICA_VIEW["center"]), COUNTRY_ZOOM
+
+
+def is_large(catalog, view):
+    return len(view_rows(catalog, view)) > LARGE_CATALOG_THRESHOLD
+
+
+@functools.lru_cache(maxsize=4)
+def display_coordinates(catalog):
+    """Latitude and longitude to draw each site at.
+
+    Sites at the same rounded location are spread on a sunflower spiral in
+    catalog order, so they never overlap and always land in the same place.
+    """
+    lat, lon = catalog["Latitude"], catalog["Longitude"]
+    spots = pd.DataFrame({"lat": np.round(lat, 5), "lon": np.round(lon, 5)}).groupby(["lat", "lon"], sort=False)
+    rank = spots.cumcount().to_numpy()
+    shared = spots["lat"].transform("size").to_numpy() > 1
+
+    radius = np.where(shared, SPREAD_RADIUS * np.sqrt(rank + 0.5), 0.0)
+    angle = rank * GOLDEN_ANGLE
+    shown_lat = lat + radius * np.sin(angle)
+    shown_lon = lon + radius * np.cos(angle) / np.cos(np.radians(np.clip(lat, -85, 85)))
+    shown_lat.flags.writeable = False
+    shown_lon.flags.writeable = False
+    return shown_lat, shown_lon
+
+
+def visible_rows(catalog, rows, bounds=None, zoom=None, max_points=MAX_VIEW_POINTS):
+    """Rows of ``rows`` to send for the current viewport, and how many sites each one stands for.
+
+    ``bounds`` is Leaflet's ``{"_southWest": {"lat", "lng"}, "_northEast": ...}``;
+    it is padded by half a viewport on each side so short pans do not need a
+    rerun. When more than ``max_points`` remain, points are thinned to one per
+    ``THIN_CELL_PX`` pixel cell at ``zoom``, keeping the largest capacity and
+    counting the sites it replaces, and capped at ``max_points``.
+    """
+    lat, lon = display_coordinates(catalog)
+    rows = np.asarray(rows)
+    if bounds:
+        south, west = bounds["_southWest"]["lat"], bounds["_southWest"]["lng"]
+        north, east = bounds["_northEast"]["lat"], bounds["_northEast"]["lng"]
+        pad_lat, pad_lon = (north - south) / 2, (east - west) / 2
+        # Spread offsets are far smaller than the padding, so catalog coordinates are close enough
+        in_view = catalog_index(catalog).in_bbox(south - pad_lat, west - pad_lon, north + pad_lat, east + pad_lon)[0]
+        inside = np.zeros(len(catalog), dtype=bool)
+        inside[in_view] = True
+        rows = rows[inside[rows]]
+    if len(rows) <= max_points:
+        return rows, np.ones(len(rows), dtype=np.int64)
+
+    # Largest sites first, so each pixel cell keeps its largest one
+    capacity = np.nan_to_num(catalog["Capacity (Mt)"][rows], nan=-np.inf)
+    rows = rows[np.argsort(-capacity, kind="stable")]
+    cell = THIN_CELL_PX * 360 / (256 * 2 ** (zoom if zoom is not None else AMERICA_VIEW["zoom"]))
+    cells = pd.DataFrame({"y": np.floor(lat[rows] / cell), "x": np.floor(lon[rows] / cell)})
+    codes = cells.groupby(["y", "x"], sort=False).ngroup().to_numpy()
+    # First row of each cell is its largest site
+    rows, sites = rows[np.unique(codes, return_index=True)[1]], np.bincount(codes)
+    if len(rows) > max_points:
+        # Still too many cells: keep the busiest ones
+        busiest = np.argsort(-sites, kind="stable")[:max_points]
+        rows, sites = rows[busiest], sites[busiest]
+    order = np.argsort(rows)
+    return rows[order], sites[order]
+
+
+def _format_capacity(value):
+    return "n/a" if np.isnan(value) else f"{value:.2f} Mt"
+
+
+def cluster_layer(catalog, rows, sites=None):
+    """One feature group holding every point in ``rows`` as a client-side marker cluster."""
+    lat, lon = display_coordinates(catalog)
+    sites = np.ones(len(rows), dtype=np.int64) if sites is None else sites
+    data = list(zip(
+        np.round(lat[rows], 6).tolist(),
+        np.round(lon[rows], 6).tolist(),
+        catalog["Field"][rows].tolist(),
+        catalog["Formation"][rows].tolist(),
+        [_format_capacity(v) for v in catalog["Capacity (Mt)"][rows]],
+        sites.tolist(),
+    ))
+    layer = folium.FeatureGroup(name="Reservoirs")
+    FastMarkerCluster(data, callback=CLUSTER_CALLBACK, icon_create_function=CLUSTER_ICON).add_to(layer)
+    return layer
+
+
+def _bounds_key(bounds):
+    if not bounds:
+        return None
+    return tuple(round(bounds[corner][axis], 2) for corner in ("_southWest", "_northEast") for axis in ("lat", "lng"))
+
+
+@functools.lru_cache(maxsize=64)
+def _viewport_layer(view, version, bounds_key, zoom, catalog):
+    bounds = None if bounds_key is None else {
+        "_southWest": {"lat": bounds_key[0], "lng": bounds_key[1]},
+        "_northEast": {"lat": bounds_key[2], "lng": bounds_key[3]},
+    }
+    rows, sites = visible_rows(catalog, view_rows(catalog, view), bounds, zoom)
+    return cluster_layer(catalog, rows, sites), len(rows), int(sites.sum())
+
+
+def viewport_layer(view, catalog, bounds=None, zoom=None):
+    """Clustered layer for the part of ``view`` around ``bounds``.
+
+    Returns the layer, the number of markers it holds and the number of sites
+    they stand for. Cached per view, catalog version and viewport rounded to
+    0.01°.
+    """
+    return _viewport_layer(view, catalog.version, _bounds_key(bounds), zoom, catalog)
+
+
+def flow_layer(result):
+    """Source–sink flows of a ``ccs.matching.MatchResult`` as lines whose width grows with the flow."""
+    layer = folium.FeatureGroup(name="Source–sink flows")
+    flows = result.flows
+    if flows.empty:
+        return layer
+    widths = 1 + 7 * np.sqrt(flows["Flow (Mt)"] / flows["Flow (Mt)"].max())
+    for i in range(len(flows)):
+        flow = flows.iloc[i]
+        folium.PolyLine(
+            [[flow["Source latitude"], flow["Source longitude"]], [flow["Sink latitude"], flow["Sink longitude"]]],
+            weight=float(widths.iloc[i]), color="#6AA84F", opacity=0.7,
+            tooltip=f"{flow['Source']} → {flow['Reservoir']}: {flow['Flow (Mt)']:.2f} Mt over {flow['Distance (km)']:.0f} km",
+        ).add_to(layer)
+
+    # One marker per source that ships anything
+    origins = flows.drop_duplicates("Source").set_index("Source")
+    summary = result.sources.set_index("Source")
+    for source, origin in origins.iterrows():
+        folium.CircleMarker(
+            [origin["Source latitude"], origin["Source longitude"]], radius=6, color="gray", fill=True,
+            tooltip=f"{source}: {summary.at[source, 'Allocated (Mt)']:.2f} of "
+                    f"{summary.at[source, 'Emissions (Mt)']:.2f} Mt stored",
+        ).add_to(layer)
+    return layer
+
+
+def base_map(view):
+    map_center, zoom_level = view_center(view)
+    return folium.Map(location=map_center, zoom_start=zoom_level)
+
+
+def build_map(catalog, view):
+    rows = view_rows(catalog, view)
+    map_center, zoom_level = view_center(view)
+    lat, lon = display_coordinates(catalog)
+
+    m = folium.Map(location=map_center, zoom_start=zoom_level)
+    # Sprites are sent once in the page header; markers only name their class
+    icons = tuple(sorted({name for name in catalog["Icon"][rows] if name}))
+    if icons:
+        m.get_root().header.add_child(folium.Element(icon_css(icons)))
+    for row in rows:
+        tooltip_html = f"""
+            <b>{catalog['Field'][row]}</b><br>
+            Formation: {catalog['Formation'][row]}<br>
+            Thickness: {catalog['Thickness (m)'][row]:g} m<br>
+            Porosity: {catalog['Porosity (%)'][row]:g}%<br>
+            Capacity: {_format_capacity(catalog['Capacity (Mt)'][row])}
+            """
+
+        # Aquifer / reservoir showcase sites get their own icon, the rest a plain marker
+        if catalog["Icon"][row]:
+            icon = folium.DivIcon(icon_size=(SPRITE_SIZE, SPRITE_SIZE), class_name=f"ccs-icon-{catalog['Icon'][row]}")
+        else:
+            icon = folium.Icon(color="blue", icon="circle", prefix="fa")
+
+        folium.Marker(
+            location=[lat[row], lon[row]],
+            popup=tooltip_html,
+            tooltip=tooltip_html,
+            icon=icon
+        ).add_to(m)
+    return m
+
+
+@functools.lru_cache(maxsize=32)
+def _map_html(view, version, catalog, flows):
+    m = build_map(catalog, view)
+    if flows is not None:
+        flow_layer(flows).add_to(m)
+    return m.get_root().render()
+
+
+def map_html(view, catalog=None, flows=None):
+    """Standalone HTML document for ``view``, cached per catalog version.
+
+    ``flows`` is an optional (cached) ``MatchResult`` drawn on top of the sites.
+    """
+    catalog = load_catalog() if catalog is None else catalog
+    return _map_html(view, catalog.version, catalog, flows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the map icon sprites")
+    parser.add_argument("command", choices=["sprites"])
+    parser.add_argument("--size", type=int, default=SPRITE_SIZE)
+    args = parser.parse_args(argv)
+
+    for path in build_sprites(size=args.size):
+        print(f"Wrote {path.relative_to(ICON_DIR.parent.parent)} ({path.stat().st_size / 1024:.1f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Source–sink matching: allocate emissions to storage sites under capacity limits.
+
+The allocation is a transportation problem. Every source ships its emissions
+to storage sites along candidate arcs, every site takes at most its capacity,
+and total Mt·km of transport is minimised. Whatever cannot be placed goes to
+a per-source "unallocated" slack. The LP is solved twice: first for the
+least unallocated total, i.e. the most that can be stored, then for the
+least distance with the unallocated total held at that minimum. A slack
+penalty in a single solve cannot guarantee the first goal, since an
+augmenting path may cross any number of long arcs.
+
+Candidate arcs are the ``k`` nearest sites of each source from the spatial
+index (all sites when ``k`` is None), which keeps the problem sparse: thousands
+of sources × thousands of sites stay a few tens of thousands of variables.
+It is solved as a sparse LP with HiGHS through ``scipy.optimize.linprog``.
+"""
+import functools
+
+import numpy as np
+import pandas as pd
+
+from ccs.capacity import default_capacities
+from ccs.cube import load_cube
+from ccs.emissions import get_store
+from ccs.regions import COUNTRY_CENTER
+from ccs.spatial import catalog_index
+
+EMITTER_COLUMNS = ["Source", "Latitude", "Longitude", "Emissions (Mt)"]
+DEFAULT_NEIGHBOURS = 20
+
+
+class MatchResult:
+    """Flows, per-source and per-site summaries of one allocation."""
+
+    def __init__(self, flows, sources, sinks, cost):
+        self.flows = flows
+        self.sources = sources
+        self.sinks = sinks
+        self.cost = cost  # Mt·km
+
+    @property
+    def allocated(self):
+        return float(self.sources["Allocated (Mt)"].sum())
+
+    @property
+    def unallocated(self):
+        return float(self.sources["Unallocated (Mt)"].sum())
+
+
+def read_emitters(path_or_buffer):
+    """Point emitters from a CSV with ``Source, Latitude, Longitude, Emissions (Mt)`` columns."""
+    df = pd.read_csv(path_or_buffer)
+    missing = [col for col in EMITTER_COLUMNS if col not in df]
+    if missing:
+        raise ValueError(f"Emitter file is missing columns: {', '.join(missing)}")
+    df = df[EMITTER_COLUMNS].dropna()
+    return df[df["Emissions (Mt)"] > 0].reset_index(drop=True)
+
+
+def country_sources(years, countries=None, cube=None):
+    """Country-level emissions over an inclusive year range, placed at each country's center."""
+    cube = cube or load_cube()
+    totals = cube.range_totals(years).sum(axis=1)
+    countries = [c for c in (countries or cube.countries) if c in COUNTRY_CENTER and c in cube.country_index]
+    idx = [cube.country_index[c] for c in countries]
+    return pd.DataFrame({
+        "Source": countries,
+        "Latitude": [COUNTRY_CENTER[c][0] for c in countries],
+        "Longitude": [COUNTRY_CENTER[c][1] for c in countries],
+        "Emissions (Mt)": totals[idx],
+    })
+
+
+def match(sources, catalog, capacity=None, k=DEFAULT_NEIGHBOURS, max_distance_km=None):
+    """Allocate ``sources`` to the sites of ``catalog`` minimising transport distance.
+
+    ``sources`` has the ``EMITTER_COLUMNS``. ``capacity`` is one value per
+    catalog row in Mt and defaults to ``catalog["Capacity (Mt)"]``; sites
+    without a capacity take nothing. Arcs longer than ``max_distance_km`` are
+    dropped.
+    """
+    from scipy.optimize import linprog
+    from scipy.sparse import coo_matrix, csr_matrix, hstack, identity, vstack
+
+    capacity = np.nan_to_num(np.asarray(catalog["Capacity (Mt)"] if capacity is None else capacity, dtype=float))
+    emissions = sources["Emissions (Mt)"].to_numpy(dtype=float)
+    m, n = len(sources), len(catalog)
+    k = n if k is None else min(k, n)
+
+    if m and n:
+        distance, sink = catalog_index(catalog).nearest(sources["Latitude"].to_numpy(),
+                                                        sources["Longitude"].to_numpy(), k=k)
+        source = np.repeat(np.arange(m), k)
+        distance, sink = distance.ravel(), sink.ravel()
+        keep = (sink >= 0) & (capacity[np.maximum(sink, 0)] > 0)
+        if max_distance_km is not None:
+            keep &= distance <= max_distance_km
+        source, sink, distance = source[keep], sink[keep], distance[keep]
+    else:
+        source, sink, distance = np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp), np.empty(0)
+    arcs = len(source)
+    if not m or not arcs:
+        # Nothing to solve: every source stays unallocated
+        return _result(sources, catalog, capacity, source, sink, distance, np.empty(0), emissions.copy())
+
+    # Each source ships exactly its emissions, split between arcs and its slack
+    a_eq = hstack([coo_matrix((np.ones(arcs), (source, np.arange(arcs))), shape=(m, arcs)), identity(m)], format="csr")
+    # Each site receives at most its capacity
+    a_ub = hstack([coo_matrix((np.ones(arcs), (sink, np.arange(arcs))), shape=(n, arcs)),
+                   coo_matrix((n, m))], format="csr")
+
+    # Phase 1: the least that must stay unallocated
+    unplaced = np.concatenate([np.zeros(arcs), np.ones(m)])
+    solution = linprog(unplaced, A_ub=a_ub, b_ub=capacity, A_eq=a_eq, b_eq=emissions, bounds=(0, None),
+                       method="highs-ipm")
+    if solution.status != 0:
+        raise RuntimeError(f"Source–sink matching failed: {solution.message}")
+
+    # Phase 2: least Mt·km with the unallocated total held at that minimum (plus solver tolerance)
+    limit = solution.fun + 1e-9 * max(1.0, emissions.sum())
+    cost = np.concatenate([distance, np.zeros(m)])
+    solution = linprog(cost, A_ub=vstack([a_ub, csr_matrix(unplaced)], format="csr"),
+                       b_ub=np.append(capacity, limit), A_eq=a_eq, b_eq=emissions, bounds=(0, None),
+                       method="highs-ipm")
+    if solution.status != 0:
+        raise RuntimeError(f"Source–sink matching failed: {solution.message}")
+
+    return _result(sources, catalog, capacity, source, sink, distance, solution.x[:arcs], solution.x[arcs:])
+
+
+def _result(sources, catalog, capacity, source, sink, distance, flow, slack):
+    """``MatchResult`` of arc flows and per-source unallocated amounts."""
+    emissions = sources["Emissions (Mt)"].to_numpy(dtype=float)
+    m, n = len(sources), len(catalog)
+    used = flow > 1e-9
+    flows = pd.DataFrame({
+        "Source": sources["Source"].to_numpy()[source[used]],
+        "Reservoir": catalog["Reservoir"][sink[used]],
+        "Country": catalog["Country"][sink[used]],
+        "Distance (km)": distance[used],
+        "Flow (Mt)": flow[used],
+        "Source latitude": sources["Latitude"].to_numpy()[source[used]],
+        "Source longitude": sources["Longitude"].to_numpy()[source[used]],
+        "Sink latitude": catalog["Latitude"][sink[used]],
+        "Sink longitude": catalog["Longitude"][sink[used]],
+    }).sort_values("Flow (Mt)", ascending=False, ignore_index=True)
+
+    allocated = np.bincount(source, weights=flow, minlength=m)
+    moved = np.bincount(source, weights=flow * distance, minlength=m)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_distance = np.where(allocated > 0, moved / allocated, np.nan)
+        share = np.where(emissions > 0, allocated / emissions * 100, 0.0)
+    source_summary = pd.DataFrame({
+        "Source": sources["Source"].to_numpy(),
+        "Emissions (Mt)": emissions,
+        "Allocated (Mt)": allocated,
+        "Unallocated (Mt)": slack,
+        "% Allocated": share,
+        "Mean distance (km)": mean_distance,
+    })
+
+    received = np.bincount(sink, weights=flow, minlength=n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        utilisation = np.where(capacity > 0, received / capacity * 100, np.nan)
+    sink_summary = pd.DataFrame({
+        "Country": catalog["Country"],
+        "Reservoir": catalog["Reservoir"],
+        "Capacity (Mt)": capacity,
+        "Stored (Mt)": received,
+        "% Used": utilisation,
+    })
+    return MatchResult(flows, source_summary, sink_summary, float(flow @ distance))
+
+
+def capacity_values(catalog, capacity_column="Capacity (Mt)"):
+    """Per-site capacity from a column of ``ccs.capacity.default_capacities``.
+
+    ``"Capacity (Mt)"`` is the catalog value; ``"Eq. 1 (Mt)"`` and ``"Eq. 2 (Mt)"``
+    fall back to it for sites without that estimate.
+    """
+    if capacity_column == "Capacity (Mt)":
+        return catalog["Capacity (Mt)"]
+    computed = default_capacities().set_index("Reservoir")[capacity_column]
+    values = pd.Series(catalog["Reservoir"]).map(computed)
+    return values.fillna(pd.Series(catalog["Capacity (Mt)"])).to_numpy()
+
+
+@functools.lru_cache(maxsize=16)
+def _country_match(years, capacity_column, data_version, catalog_version, catalog):
+    # A handful of countries: every site is a candidate
+    return match(country_sources(years), catalog, capacity_values(catalog, capacity_column), k=None)
+
+
+def country_match(years, catalog, capacity_column="Capacity (Mt)"):
+    """Country-level allocation for a year range, cached per data and catalog version."""
+    load_cube()  # refreshes the store, so the version below is current
+    return _country_match(tuple(int(y) for y in years), capacity_column, get_store().version,
+                          catalog.version, catalog)
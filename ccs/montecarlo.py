@@ -0,0 +1,204 @@
+"""Monte Carlo P90/P50/P10 storage capacity.
+
+ϕ, Sw, h, Rf and A are sampled for every reservoir zone at once and pushed
+through Equation 1. Samples are generated in chunks sized to a memory budget
+and folded into per-target log-spaced histograms, so 10⁶ samples × thousands
+of reservoirs never have to be held in memory. Chunks can be spread over a
+process pool; every chunk has its own seed derived from the run seed, so
+results do not depend on the number of workers.
+
+Percentiles follow the resource convention: P90 is the low estimate (90%
+probability of being exceeded), P10 the high one.
+"""
+import concurrent.futures
+import os
+
+import numpy as np
+import pandas as pd
+
+from ccs.capacity import INPUT_COLUMNS, evaluate
+
+# Multipliers applied to each zone's base value
+DEFAULT_DISTRIBUTIONS = {
+    "phi": ("triangular", 0.8, 1.0, 1.2),
+    "Sw": ("triangular", 0.8, 1.0, 1.2),
+    "h": ("triangular", 0.8, 1.0, 1.2),
+    "Rf": ("triangular", 0.8, 1.0, 1.2),
+    "A": ("triangular", 0.7, 1.0, 1.3),
+}
+PARAMETERS = ["Rf", "A", "h", "phi", "Sw"]
+# Fractions that must stay within [0, 1] after scaling
+FRACTIONS = {"Rf", "phi", "Sw"}
+
+PERCENTILES = {"P90": 0.10, "P50": 0.50, "P10": 0.90}
+
+
+def _support(spec):
+    """Lowest and highest multiplier a distribution can produce."""
+    kind = spec[0]
+    if kind == "uniform":
+        return spec[1], spec[2]
+    if kind == "triangular":
+        return spec[1], spec[3]
+    if kind == "normal":
+        return spec[1] - 3 * spec[2], spec[1] + 3 * spec[2]
+    raise ValueError(f"Unknown distribution: {kind!r}")
+
+
+def _sample(rng, spec, size):
+    kind = spec[0]
+    if kind == "uniform":
+        return rng.uniform(spec[1], spec[2], size)
+    if kind == "triangular":
+        return rng.triangular(spec[1], spec[2], spec[3], size)
+    if kind == "normal":
+        # Clipped at ±3σ so the histogram bounds stay finite
+        return np.clip(rng.normal(spec[1], spec[2], size), *_support(spec))
+    raise ValueError(f"Unknown distribution: {kind!r}")
+
+
+def _scaled(name, base, multiplier):
+    value = base * multiplier
+    if name in FRACTIONS:
+        value = np.clip(value, 0.0, 1.0)
+    return value
+
+
+class _Model:
+    """Everything a worker needs to turn random draws into histogram counts."""
+
+    def __init__(self, rho, base, distributions, reducers, lower, upper, bins):
+        self.rho = rho
+        self.base = base
+        self.distributions = distributions
+        self.reducers = reducers
+        self.lower = lower
+        self.upper = upper
+        self.bins = bins
+
+    def capacities(self, rng, n):
+        size = (n, len(self.rho))
+        zone = np.broadcast_to(self.rho / 1e9, size).copy()
+        for name in PARAMETERS:
+            value = _scaled(name, self.base[name], _sample(rng, self.distributions[name], size))
+            if name == "Sw":
+                np.subtract(1, value, out=value)
+            zone *= value
+        # Zone samples -> reservoir, country, ... totals, concatenated along the target axis
+        return np.concatenate([zone if order is None else np.add.reduceat(zone[:, order], starts, axis=1)
+                               for order, starts in self.reducers], axis=1)
+
+    def run_chunk(self, seed, n):
+        values = self.capacities(np.random.default_rng(seed), n)
+        log_lo, log_hi = np.log(self.lower), np.log(self.upper)
+        span = np.where(log_hi > log_lo, log_hi - log_lo, 1.0)
+        position = (np.log(np.maximum(values, self.lower)) - log_lo) / span
+        bin_idx = np.clip((position * self.bins).astype(np.int64), 0, self.bins - 1)
+        offsets = np.arange(values.shape[1]) * self.bins
+        counts = np.bincount((bin_idx + offsets).ravel(), minlength=values.shape[1] * self.bins)
+        return counts.reshape(values.shape[1], self.bins), values.sum(axis=0)
+
+
+def _run_chunk(model, seed, n):
+    return model.run_chunk(seed, n)
+
+
+def _reducer(labels):
+    """Column order and reduceat starts that sum columns sharing a label."""
+    codes, uniques = pd.factorize(pd.Series(labels), sort=True)
+    order = np.argsort(codes, kind="stable")
+    starts = np.flatnonzero(np.r_[True, np.diff(codes[order]) != 0])
+    if len(starts) == len(codes) and (order == np.arange(len(codes))).all():
+        # One column per label already in order: nothing to sum
+        return (None, starts), list(uniques)
+    return (order, starts), list(uniques)
+
+
+def _percentiles(counts, lower, upper, bins, total):
+    """Log-linear interpolation of the requested quantiles inside each histogram."""
+    cdf = np.cumsum(counts, axis=1) / total
+    log_lo, log_hi = np.log(lower), np.log(upper)
+    out = {}
+    for name, q in PERCENTILES.items():
+        idx = np.array([np.searchsorted(row, q) for row in cdf]).clip(0, bins - 1)
+        below = np.where(idx > 0, cdf[np.arange(len(cdf)), idx - 1], 0.0)
+        inside = counts[np.arange(len(cdf)), idx] / total
+        frac = np.where(inside > 0, (q - below) / np.where(inside > 0, inside, 1), 0.0)
+        out[name] = np.exp(log_lo + (idx + frac) / bins * (log_hi - log_lo))
+    return out
+
+
+def simulate(inputs, n_samples=100_000, distributions=None, groups=None, seed=0,
+             memory_limit=256 * 2**20, workers=1, bins=2048):
+    """Probabilistic Equation 1 capacity for every reservoir in ``inputs``.
+
+    ``inputs`` is a reservoir input table as read by ``ccs.capacity.load_inputs``;
+    rows without Equation 1 inputs are skipped. ``groups`` maps a level name
+    (e.g. ``"Country"``) to a Series indexed by reservoir name giving each
+    reservoir's group. Returns ``{level: DataFrame}`` with P90/P50/P10 and the
+    sample mean, in Mt, for ``"Reservoir"`` and every level in ``groups``.
+    """
+    distributions = {**DEFAULT_DISTRIBUTIONS, **(distributions or {})}
+    zones = evaluate(inputs)
+    zones = zones[np.isfinite(zones["Eq. 1 (Mt)"])].reset_index(drop=True)
+    if zones.empty:
+        return {}
+
+    base = {name: zones[INPUT_COLUMNS[name]].to_numpy(dtype=float) for name in PARAMETERS}
+    rho = zones["rho (kg/m3)"].to_numpy()
+
+    # Analytic sample bounds per zone: Equation 1 increases with every factor but Sw
+    support = {name: _support(distributions[name]) for name in PARAMETERS}
+    low = {name: _scaled(name, base[name], support[name][0]) for name in PARAMETERS}
+    high = {name: _scaled(name, base[name], support[name][1]) for name in PARAMETERS}
+    zone_lo = rho * low["Rf"] * low["A"] * low["h"] * low["phi"] * (1 - high["Sw"]) / 1e9
+    zone_hi = rho * high["Rf"] * high["A"] * high["h"] * high["phi"] * (1 - low["Sw"]) / 1e9
+
+    reservoirs = zones["Reservoir"].to_numpy()
+    levels = {"Reservoir": reservoirs}
+    for level, mapping in (groups or {}).items():
+        levels[level] = pd.Series(reservoirs).map(mapping).fillna("Unassigned").to_numpy()
+
+    reducers, labels, lower, upper = [], {}, [], []
+    for level, zone_labels in levels.items():
+        reducer, labels[level] = _reducer(zone_labels)
+        reducers.append(reducer)
+        order, starts = reducer
+        order = np.arange(len(zone_lo)) if order is None else order
+        lower.append(np.add.reduceat(zone_lo[order], starts))
+        upper.append(np.add.reduceat(zone_hi[order], starts))
+    lower, upper = np.concatenate(lower), np.concatenate(upper)
+    lower = np.maximum(lower, upper * 1e-9)
+
+    model = _Model(rho, base, distributions, reducers, lower, upper, bins)
+
+    # Roughly a dozen float64 arrays of (chunk, zones) are alive at once
+    chunk = int(max(1, min(n_samples, memory_limit // (12 * 8 * max(len(rho), len(lower))))))
+    sizes = [chunk] * (n_samples // chunk) + ([n_samples % chunk] if n_samples % chunk else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    counts = np.zeros((len(lower), bins), dtype=np.int64)
+    sums = np.zeros(len(lower))
+    if workers == 1 or len(sizes) == 1:
+        results = (model.run_chunk(s, n) for s, n in zip(seeds, sizes))
+        for c, s in results:
+            counts += c
+            sums += s
+    else:
+        workers = workers or os.cpu_count()
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            for c, s in pool.map(_run_chunk, [model] * len(sizes), seeds, sizes):
+                counts += c
+                sums += s
+
+    stats = _percentiles(counts, lower, upper, bins, n_samples)
+    out, start = {}, 0
+    for level in levels:
+        stop = start + len(labels[level])
+        out[level] = pd.DataFrame({
+            level: labels[level],
+            **{name: values[start:stop] for name, values in stats.items()},
+            "Mean": sums[start:stop] / n_samples,
+        })
+        start = stop
+    return out
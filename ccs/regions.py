@@ -0,0 +1,40 @@
+"""Country groupings used across the app."""
+
+# Region tree: every node lists its child regions or, at the bottom, its countries
+REGION_TREE = {
+    "America": ["North America", "South America"],
+    "North America": ["United States", "Canada", "Mexico"],
+    "South America": ["Argentina", "Brazil", "Colombia", "Venezuela", "Ecuador"]
+}
+
+
+def region_countries(region, tree=REGION_TREE):
+    """Countries under ``region``, in tree order."""
+    countries = []
+    for child in tree[region]:
+        countries += region_countries(child, tree) if child in tree else [child]
+    return countries
+
+
+def region_parents(tree=REGION_TREE):
+    """``{node: parent}`` for every region and country below a root."""
+    return {child: node for node, children in tree.items() for child in children}
+
+
+REGIONS = {region: region_countries(region) for region in REGION_TREE}
+
+# ISO 3166 alpha-3 codes, as in the Code column of the emissions files
+COUNTRY_CODES = {"United States": "USA", "Canada": "CAN", "Mexico": "MEX", "Argentina": "ARG", "Brazil": "BRA",
+                 "Colombia": "COL", "Venezuela": "VEN", "Ecuador": "ECU"}
+
+# Geographic centers, used to center maps and to place country-level emissions as point sources
+COUNTRY_CENTER = {
+    "Canada": [56.1304, -106.3468],
+    "United States": [37.0902, -95.7129],
+    "Mexico": [23.6345, -102.5528],
+    "Argentina": [-38.4161, -63.6167],
+    "Brazil": [-14.235004, -51.92528],
+    "Colombia": [4.5709, -74.2973],
+    "Venezuela": [6.4238, -66.5897],
+    "Ecuador": [-1.8312, -78.1834]
+}
@@ -0,0 +1,97 @@
+"""Emissions summed over fixed periods: annual, 5-year and decadal rollups.
+
+Periods are calendar-aligned (1990–1994, 1995–1999, … and 1990–1999, …), so
+the same period always has the same bounds whatever the first year of the
+data. A rollup holds Country × Period × Source and Region × Period × Source
+sums, read from the cube's prefix sums once per data version.
+
+When a new data version only appends years to the previous one, the periods
+that ended before the old last year are copied from the previous rollup and
+only the rest is computed. Appends are recognised by per-year checksums kept
+on each cube, not by comparing the cubes cell by cell.
+"""
+import numpy as np
+
+RESOLUTIONS = {"Annual": 1, "5-year": 5, "Decade": 10}
+
+
+class Rollup:
+
+    def __init__(self, step, starts, last_year, country_values, country_exists, region_values, region_exists,
+                 reused=0):
+        self.step = step
+        self.starts = starts  # first calendar year of each period
+        self.last_year = last_year  # last year of data; the final period may end earlier than its bounds
+        self.country_values = country_values  # (countries, periods, sources)
+        self.country_exists = country_exists  # (countries, periods)
+        self.region_values = region_values
+        self.region_exists = region_exists
+        self.reused = reused  # periods copied from the previous version
+
+    @classmethod
+    def from_cube(cls, cube, step, previous=None):
+        """Rollup of ``cube``; with the ``previous`` version's rollup, only periods it cannot supply are computed."""
+        first, last = int(cube.years[0]), int(cube.years[-1])
+        starts = np.arange(first - first % step, last + 1, step)
+        # The previous version's last period may have been partial; it is recomputed
+        keep = 0 if previous is None else max(0, len(previous.starts) - 1)
+        computed = _period_sums(cube, starts[keep:], step)
+        if keep:
+            computed = [np.concatenate([old[:, :keep], new], axis=1) for old, new in zip(
+                (previous.country_values, previous.country_exists, previous.region_values, previous.region_exists),
+                computed)]
+        return cls(step, starts, last, *computed, reused=keep)
+
+    def labels(self, first=None, last=None):
+        """``"1990–1994"``-style labels, clipped to the data and to ``first``/``last``."""
+        ends = np.minimum(self.starts + self.step - 1, self.last_year)
+        starts = self.starts if first is None else np.maximum(self.starts, first)
+        ends = ends if last is None else np.minimum(ends, last)
+        if self.step == 1:
+            return starts.astype(str)
+        return np.array([f"{a}–{b}" if a != b else str(a) for a, b in zip(starts, ends)], dtype=object)
+
+
+def _period_sums(cube, starts, step):
+    """Country and region sums and existence flags for periods beginning at ``starts``."""
+    first, last = _bounds(cube, starts, step)
+    country_values = cube.prefix[:, last, :] - cube.prefix[:, first, :]
+    region_values = cube.region_prefix[:, last, :] - cube.region_prefix[:, first, :]
+    country_exists = _any_between(cube.exists, first, last)
+    region_exists = _any_between(cube.region_exists, first, last)
+    return country_values, country_exists, region_values, region_exists
+
+
+def _bounds(cube, starts, step):
+    """Prefix-sum slots ``[first, last)`` of each period on the cube's year axis."""
+    y0, n = int(cube.years[0]), len(cube.years)
+    first = np.clip(starts - y0, 0, n)
+    last = np.clip(starts + step - y0, 0, n)
+    return first, last
+
+
+def _any_between(flags, first, last):
+    counts = np.zeros((flags.shape[0], flags.shape[1] + 1), dtype=np.int64)
+    np.cumsum(flags, axis=1, out=counts[:, 1:])
+    return (counts[:, last] - counts[:, first]) > 0
+
+
+def is_append(previous, cube):
+    """True if ``cube`` is ``previous`` with years added at the end and nothing else changed.
+
+    Compares the per-year checksums of values and country-years (``EmissionsCube.checksums``,
+    computed while the cube is built) instead of the cubes themselves, so the check is O(years).
+    """
+    old = len(previous.years)
+    if not (previous.countries == cube.countries and previous.sources == cube.sources
+            and previous.regions == cube.regions and len(cube.years) >= old
+            and int(previous.years[0]) == int(cube.years[0])):
+        return False
+    return all(np.array_equal(a, b[:old]) for a, b in zip(previous.checksums, cube.checksums))
+
+
+def build_rollups(cube, previous=None):
+    """Every ``RESOLUTIONS`` rollup of ``cube``, extending those of ``previous`` when it is an append."""
+    reuse = previous is not None and is_append(previous, cube)
+    return {name: Rollup.from_cube(cube, step, previous.rollup(name) if reuse else None)
+            for name, step in RESOLUTIONS.items()}
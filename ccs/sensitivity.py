@@ -0,0 +1,137 @@
+"""One-at-a-time sensitivity of Equation 1 capacity (tornado charts).
+
+Every input is moved to the low and high end of its range, and by a small
+step either side for the local elasticity, while the others stay at their
+base values. All cases for all reservoir zones are stacked into one array and
+pushed through the density table and Equation 1 in a single pass. ρ is varied
+through pressure and temperature, so it moves along the real CO₂ surface.
+"""
+import functools
+
+import numpy as np
+import pandas as pd
+
+from ccs.capacity import INPUT_COLUMNS, RESERVOIR_INPUTS_CSV, evaluate, load_inputs, volumetric_capacity
+from ccs.co2_density import co2_density
+from ccs.emissions import file_sha256, readonly_frame
+
+# ("relative", low, high) multiplies the base value, ("absolute", low, high) adds to it
+RANGES = {
+    "phi": ("relative", 0.8, 1.2),
+    "h": ("relative", 0.8, 1.2),
+    "Sw": ("relative", 0.8, 1.2),
+    "Rf": ("relative", 0.8, 1.2),
+    "A": ("relative", 0.7, 1.3),
+    "P": ("relative", 0.9, 1.1),
+    "T": ("absolute", -10.0, 10.0),
+}
+LABELS = {
+    "phi": "Porosity (ϕ)",
+    "h": "Thickness (h)",
+    "Sw": "Water saturation (Sw)",
+    "Rf": "Storage efficiency (Rf)",
+    "A": "Area (A)",
+    "P": "Pressure (ρ via P)",
+    "T": "Temperature (ρ via T)",
+}
+# Relative step used for the local elasticity d ln M / d ln x
+ELASTICITY_STEP = 0.01
+FRACTIONS = {"Rf", "phi", "Sw"}
+
+
+def _apply(name, base, spec, position):
+    kind, low, high = spec
+    shift = low if position == "low" else high
+    value = base * shift if kind == "relative" else base + shift
+    if name in FRACTIONS:
+        value = np.clip(value, 0.0, 1.0)
+    return value
+
+
+def _cases(base, ranges):
+    """Stacked inputs, shape ``(cases, zones)`` per variable, and a description of each case."""
+    names = list(ranges)
+    cases = [("Base", None)]
+    for name in names:
+        cases += [(name, "low"), (name, "high"), (name, "-step"), (name, "+step")]
+
+    stacked = {name: np.repeat(base[name][None, :], len(cases), axis=0) for name in base}
+    for i, (name, position) in enumerate(cases):
+        if position in ("low", "high"):
+            stacked[name][i] = _apply(name, base[name], ranges[name], position)
+        elif position is not None:
+            step = ELASTICITY_STEP if position == "+step" else -ELASTICITY_STEP
+            stacked[name][i] = base[name] * (1 + step)
+    return stacked, cases
+
+
+def sensitivity(inputs, ranges=None, density=co2_density):
+    """Tornado data and elasticities for every reservoir in ``inputs``, plus their total.
+
+    Rows without Equation 1 inputs are skipped. Returns a long frame with one
+    row per reservoir and parameter: ``Low (Mt)`` and ``High (Mt)`` are the
+    capacities at the two ends of the range, ``Swing (Mt)`` their absolute
+    difference and ``Elasticity`` the percent change in capacity per percent
+    change of the input around the base case. The ``"Total"`` reservoir is the
+    sum over all of them.
+    """
+    ranges = {**RANGES, **(ranges or {})}
+    zones = evaluate(inputs)
+    zones = zones[np.isfinite(zones["Eq. 1 (Mt)"])].reset_index(drop=True)
+    columns = ["Reservoir", "Parameter", "Low (Mt)", "Base (Mt)", "High (Mt)", "Swing (Mt)", "Elasticity"]
+    if zones.empty:
+        return pd.DataFrame(columns=columns)
+
+    base = {name: zones[INPUT_COLUMNS[name]].to_numpy(dtype=float) for name in ["P", "T", "Rf", "A", "h", "phi", "Sw"]}
+    stacked, cases = _cases(base, ranges)
+
+    # One density lookup and one Equation 1 evaluation for every case and zone
+    rho = density(stacked["P"], stacked["T"])
+    zone_mt = volumetric_capacity(rho, stacked["Rf"], stacked["A"], stacked["h"], stacked["phi"], stacked["Sw"]) / 1e9
+
+    codes, reservoirs = pd.factorize(zones["Reservoir"])
+    n = len(reservoirs)
+    per_reservoir = np.stack([np.bincount(codes, weights=row, minlength=n) for row in zone_mt])
+    # Cases × (reservoirs + total)
+    capacity = np.concatenate([per_reservoir, per_reservoir.sum(axis=1, keepdims=True)], axis=1)
+    targets = list(reservoirs) + ["Total"]
+
+    base_mt = capacity[0]
+    index = {case: i for i, case in enumerate(cases)}
+    frames = []
+    for name in ranges:
+        low, high = capacity[index[(name, "low")]], capacity[index[(name, "high")]]
+        down, up = capacity[index[(name, "-step")]], capacity[index[(name, "+step")]]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            elasticity = (up - down) / base_mt / (2 * ELASTICITY_STEP)
+        frames.append(pd.DataFrame({
+            "Reservoir": targets,
+            "Parameter": LABELS.get(name, name),
+            "Low (Mt)": low,
+            "Base (Mt)": base_mt,
+            "High (Mt)": high,
+            "Swing (Mt)": np.abs(high - low),
+            "Elasticity": elasticity,
+        }))
+    out = pd.concat(frames, ignore_index=True)
+    order = {r: i for i, r in enumerate(targets)}
+    out = out.sort_values(["Reservoir", "Swing (Mt)"], key=lambda s: s.map(order) if s.name == "Reservoir" else s,
+                          ascending=[True, False], kind="stable")
+    return out.reset_index(drop=True)[columns]
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_sensitivity(reservoirs, sha256):
+    inputs = load_inputs()
+    # Shared between reruns and sessions, so handed out read-only
+    return readonly_frame(sensitivity(inputs[inputs["Reservoir"].isin(reservoirs)]))
+
+
+def reservoir_sensitivity(reservoirs):
+    """Sensitivity for a set of reservoirs from ``Data/reservoir_inputs.csv``, cached per set.
+
+    The set is order-insensitive, so switching countries back and forth reuses
+    earlier results instead of re-evaluating. Results are dropped when the
+    inputs file changes.
+    """
+    return _cached_sensitivity(tuple(sorted(set(reservoirs))), file_sha256(RESERVOIR_INPUTS_CSV))
@@ -0,0 +1,106 @@
+"""Spatial index over the reservoir catalog.
+
+Sites are stored as unit vectors on the sphere in a KD-tree, so "k nearest"
+and "within R km" are exact great-circle queries: the straight-line (chord)
+distance between unit vectors grows monotonically with the great-circle
+distance. Bounding boxes use a latitude-sorted copy of the coordinates and a
+longitude test that handles boxes crossing the antimeridian.
+
+Every query takes arrays of points or boxes, so one call resolves thousands of
+emitter locations. The KD-tree (and scipy) is only built on the first
+nearest-neighbour or radius query; bounding boxes do not need it.
+"""
+import functools
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def unit_vectors(lat, lon):
+    """``(n, 3)`` unit vectors for latitudes and longitudes in degrees."""
+    lat, lon = np.radians(np.asarray(lat, dtype=float)), np.radians(np.asarray(lon, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def chord_from_km(km):
+    return 2 * np.sin(np.minimum(np.asarray(km, dtype=float), np.pi * EARTH_RADIUS_KM) / (2 * EARTH_RADIUS_KM))
+
+
+def km_from_chord(chord):
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(np.asarray(chord, dtype=float) / 2, 0, 1))
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between broadcastable arrays of points."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+class SpatialIndex:
+
+    def __init__(self, lat, lon):
+        self.lat = np.asarray(lat, dtype=float)
+        self.lon = np.asarray(lon, dtype=float)
+        # Latitude-sorted view for bounding boxes
+        self.lat_order = np.argsort(self.lat, kind="stable")
+        self.sorted_lat = self.lat[self.lat_order]
+
+    @functools.cached_property
+    def tree(self):
+        from scipy.spatial import cKDTree
+
+        return cKDTree(unit_vectors(self.lat, self.lon))
+
+    @classmethod
+    def from_catalog(cls, catalog):
+        return cls(catalog["Latitude"], catalog["Longitude"])
+
+    def __len__(self):
+        return len(self.lat)
+
+    def nearest(self, lat, lon, k=1):
+        """``(distance_km, index)``, each shaped ``(points, k)``, nearest first.
+
+        When ``k`` exceeds the number of sites the missing slots hold ``inf``
+        and ``-1``.
+        """
+        points = unit_vectors(np.atleast_1d(lat), np.atleast_1d(lon))
+        chord, index = self.tree.query(points, k=k)
+        chord, index = chord.reshape(len(points), k), index.reshape(len(points), k)
+        missing = index >= len(self)
+        return np.where(missing, np.inf, km_from_chord(np.where(missing, 0, chord))), np.where(missing, -1, index)
+
+    def within(self, lat, lon, radius_km):
+        """Sites within ``radius_km`` of each point, as one sorted index array per point."""
+        points = unit_vectors(np.atleast_1d(lat), np.atleast_1d(lon))
+        radius = np.broadcast_to(chord_from_km(radius_km), len(points))
+        hits = self.tree.query_ball_point(points, radius, return_sorted=True)
+        return [np.asarray(h, dtype=np.intp) for h in hits]
+
+    def in_bbox(self, south, west, north, east):
+        """Sites inside each ``(south, west, north, east)`` box, as one sorted index array per box.
+
+        Boxes whose ``west`` is greater than ``east``, or whose longitudes run
+        past ±180 as Leaflet reports after panning, wrap across the antimeridian.
+        """
+        south, west, north, east = np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=float))
+                                                         for v in (south, west, north, east)))
+        out = []
+        for s, w, n, e in zip(south, west, north, east):
+            lo = np.searchsorted(self.sorted_lat, s, side="left")
+            hi = np.searchsorted(self.sorted_lat, n, side="right")
+            band = self.lat_order[lo:hi]
+            width = (e - w) % 360 if e - w < 360 else 360
+            if width < 360:
+                band = band[(self.lon[band] - w) % 360 <= width]
+            out.append(np.sort(band))
+        return out
+
+
+@functools.lru_cache(maxsize=4)
+def catalog_index(catalog):
+    """Spatial index of a catalog, built once per catalog version."""
+    return SpatialIndex.from_catalog(catalog)
@@ -0,0 +1,214 @@
+"""Synthetic datasets with the same schemas as ``Data/``, for benchmarks and load tests.
+
+Every builder is seeded, so the same arguments always give the same rows.
+The first entities are the eight real countries. Larger datasets add
+``Country 0009``, ``Country 0010``, … grouped into regions of
+``COUNTRIES_PER_REGION`` under a single root. Emissions follow smooth
+per-source trends with noise and the data's gaps: ``Other industry`` is
+mostly missing and some coal years are empty. Reservoir sites are scattered
+around their country's center.
+
+``python -m ccs.synthetic DIR --scale 100`` writes a whole ``Data/``-style
+directory at 100× today's size, which the app reads with ``CCS_DATA_DIR=DIR``.
+"""
+import argparse
+import csv
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ccs.capacity import INPUT_COLUMNS
+from ccs.regions import COUNTRY_CENTER, COUNTRY_CODES, REGION_TREE, REGIONS, region_parents
+
+WIDE_COLUMNS = ["Entity", "Code", "Year", "Other industry", "Flaring", "Cement", "Gas", "Oil", "Coal"]
+# Share of missing cells per column, close to Data/co2-by-source.csv
+MISSING = {"Other industry": 0.6, "Coal": 0.12, "Flaring": 0.005, "Cement": 0.005, "Gas": 0.005, "Oil": 0.005}
+# Typical national emissions in tonnes per year, before the per-country scale
+SOURCE_SCALE = {"Other industry": 1e7, "Flaring": 1e7, "Cement": 1e7, "Gas": 2e8, "Oil": 4e8, "Coal": 3e8}
+COUNTRIES_PER_REGION = 20
+# Sources with their own annual-co-emissions-from-*.csv file
+PER_SOURCE = ["Cement", "Coal", "Flaring", "Gas", "Oil"]
+# Size of today's reservoir catalog, the unit of --scale
+BASE_RESERVOIRS = 28
+ROOT = "World"
+# Latitude and longitude box for synthetic country centers
+AMERICAS_BOX = (-50.0, -120.0, 60.0, -40.0)
+
+
+def country_names(n):
+    """The eight real countries first, then numbered synthetic ones."""
+    real = REGIONS["America"]
+    return real[:n] + [f"Country {i:04d}" for i in range(len(real) + 1, n + 1)]
+
+
+def region_tree(countries, per_region=COUNTRIES_PER_REGION):
+    """A two-level tree in the shape of ``ccs.regions.REGION_TREE``, with numbered regions under ``ROOT``."""
+    regions = {f"Region {i // per_region + 1:03d}": list(countries[i:i + per_region])
+               for i in range(0, len(countries), per_region)}
+    return {ROOT: list(regions), **regions}
+
+
+def country_centers(countries, seed=0):
+    """``{country: [lat, lon]}``; real countries keep their centers."""
+    rng = np.random.default_rng(seed)
+    south, west, north, east = AMERICAS_BOX
+    return {c: COUNTRY_CENTER.get(c) or [float(rng.uniform(south, north)), float(rng.uniform(west, east))]
+            for c in countries}
+
+
+def emissions_table(n_entities=8, first_year=1990, last_year=2023, seed=0):
+    """A ``co2-by-source.csv``-style wide table in tonnes, one row per entity and year."""
+    rng = np.random.default_rng(seed)
+    entities = country_names(n_entities)
+    years = np.arange(first_year, last_year + 1)
+    n_years = len(years)
+    sources = WIDE_COLUMNS[3:]
+
+    # Country size, then a per-source level, growth rate and year-to-year noise
+    size = rng.lognormal(0.0, 1.2, n_entities)[:, None, None]
+    level = np.array([SOURCE_SCALE[s] for s in sources])[None, None, :] * rng.lognormal(0.0, 0.5, (n_entities, 1, len(sources)))
+    growth = rng.normal(0.015, 0.02, (n_entities, 1, len(sources)))
+    t = np.arange(n_years)[None, :, None]
+    noise = rng.normal(0.0, 0.04, (n_entities, n_years, len(sources)))
+    values = size * level * np.exp(growth * t + noise)
+    for s, share in enumerate(MISSING[source] for source in sources):
+        values[..., s][rng.random((n_entities, n_years)) < share] = np.nan
+
+    df = pd.DataFrame(values.reshape(-1, len(sources)).round(0), columns=sources)
+    df.insert(0, "Year", np.tile(years, n_entities))
+    # Synthetic countries get codes X0009, X0010, …
+    df.insert(0, "Code", np.repeat([COUNTRY_CODES.get(e, f"X{i + 1:04d}") for i, e in enumerate(entities)], n_years))
+    df.insert(0, "Entity", np.repeat(entities, n_years))
+    return df[WIDE_COLUMNS]
+
+
+def reservoir_table(n, countries=None, tree=REGION_TREE, seed=0):
+    """A ``reservoirs.csv``-style catalog of ``n`` sites spread over ``countries`` (default: the real eight).
+
+    ``Region`` is each country's parent in ``tree``.
+    """
+    rng = np.random.default_rng(seed)
+    countries = list(countries or REGIONS["America"])
+    centers = country_centers(countries, seed)
+    parents = region_parents(tree)
+
+    country = np.asarray(countries, dtype=object)[rng.integers(0, len(countries), n)]
+    center = np.array([centers[c] for c in country]).reshape(n, 2)
+    depth = rng.uniform(800, 3500, n)
+    return pd.DataFrame({
+        "Reservoir": [f"Synthetic reservoir {i:06d}" for i in range(n)],
+        "Region": [parents.get(c, ROOT) for c in country],
+        "Country": country,
+        "Field": [f"Field {i // 4:06d}" for i in range(n)],
+        "Formation": [f"Formation {i:03d}" for i in rng.integers(0, 200, n)],
+        "Latitude": np.clip(center[:, 0] + rng.normal(0, 3, n), -85, 85),
+        "Longitude": center[:, 1] + rng.normal(0, 4, n),
+        "Depth (m)": depth.round(1),
+        "Thickness (m)": rng.uniform(5, 250, n).round(1),
+        "Porosity (%)": rng.uniform(5, 30, n).round(1),
+        "Permeability (mD)": rng.lognormal(4, 1.5, n).round(2),
+        "Icon": rng.choice(["Reservoir", "Aquifer", ""], n, p=[0.6, 0.3, 0.1]),
+    })
+
+
+def reservoir_capacities(reservoirs, seed=0):
+    """``Reservoir, Capacity (Mt)`` for a synthetic catalog, as ``ccs.capacity.default_capacities`` returns."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"Reservoir": reservoirs["Reservoir"],
+                         "Capacity (Mt)": rng.lognormal(3.5, 1.5, len(reservoirs)).round(2)})
+
+
+def reservoir_inputs(n, seed=0, reservoirs=None):
+    """A ``reservoir_inputs.csv``-style table of ``n`` single-zone reservoirs for the capacity equations.
+
+    With ``reservoirs`` (from ``reservoir_table``) the names, depth, thickness,
+    porosity and permeability are taken from it, so both files describe the
+    same sites.
+    """
+    rng = np.random.default_rng(seed)
+    if reservoirs is not None:
+        n = len(reservoirs)
+    depth = rng.uniform(800, 3500, n) if reservoirs is None else reservoirs["Depth (m)"].to_numpy()
+    aquifer = rng.random(n) < 0.3 if reservoirs is None else reservoirs["Icon"].to_numpy() == "Aquifer"
+    inputs = {
+        "P": depth * 1.0e4 + 101325.0,
+        "T": 288.15 + 0.03 * depth + rng.normal(0, 5, n),
+        "depth": depth,
+        "Rf": np.where(aquifer, 1.0, rng.uniform(0.1, 0.6, n)),
+        "A": rng.lognormal(17, 1.2, n),
+        "h": rng.uniform(5, 250, n) if reservoirs is None else reservoirs["Thickness (m)"].to_numpy(),
+        "phi": rng.uniform(0.05, 0.3, n) if reservoirs is None else reservoirs["Porosity (%)"].to_numpy() / 100,
+        "k": rng.lognormal(4, 1.5, n) if reservoirs is None else reservoirs["Permeability (mD)"].to_numpy(),
+        "Sw": rng.uniform(0.15, 0.7, n),
+        "OOIP": np.where(aquifer, np.nan, rng.lognormal(17, 1.5, n)),
+        "Bo": np.where(aquifer, np.nan, rng.uniform(1.0, 1.4, n)),
+    }
+    names = [f"Synthetic reservoir {i:06d}" for i in range(n)] if reservoirs is None else reservoirs["Reservoir"]
+    df = pd.DataFrame({"Reservoir": names, "Zone": "Main"})
+    for key, col in INPUT_COLUMNS.items():
+        df[col] = inputs[key]
+    df["Reported capacity (Mt)"] = np.nan
+    return df
+
+
+def source_table(wide, source):
+    """One ``annual-co-emissions-from-<source>.csv`` table: reported years only, as in ``Data/``."""
+    column = f"Annual CO₂ emissions from {source.lower()}"
+    df = wide[["Entity", "Year", source]].dropna(subset=[source]).rename(columns={source: column})
+    df[column] = df[column].round(0).astype("int64")
+    return df.reset_index(drop=True)
+
+
+def write_dataset(directory, n_entities=8, n_reservoirs=28, first_year=1990, last_year=2023, seed=0):
+    """Write a complete ``Data/``-style directory and return the written paths.
+
+    The directory can be served by the app with ``CCS_DATA_DIR=<directory>``;
+    the tabulated CO₂ density is always read from the repository's ``Data/``.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    written = []
+
+    wide = emissions_table(n_entities, first_year, last_year, seed)
+    path = directory / "co2-by-source.csv"
+    # Same layout as the published file: every field quoted, whole tonnes
+    wide.to_csv(path, index=False, quoting=csv.QUOTE_ALL, float_format="%.0f")
+    written.append(path)
+    for source in PER_SOURCE:
+        path = directory / f"annual-co-emissions-from-{source.lower()}.csv"
+        source_table(wide, source).to_csv(path, index=False)
+        written.append(path)
+
+    countries = country_names(n_entities)
+    tree = region_tree(countries) if n_entities > len(REGIONS["America"]) else REGION_TREE
+    reservoirs = reservoir_table(n_reservoirs, countries, tree, seed)
+    path = directory / "reservoirs.csv"
+    reservoirs.to_csv(path, index=False)
+    written.append(path)
+    path = directory / "reservoir_inputs.csv"
+    reservoir_inputs(n_reservoirs, seed, reservoirs).to_csv(path, index=False)
+    written.append(path)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic Data/ directory for benchmarks and load tests")
+    parser.add_argument("directory")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiple of today's 8 countries and 28 reservoirs (e.g. 10, 100, 1000)")
+    parser.add_argument("--entities", type=int, help="number of countries (overrides --scale)")
+    parser.add_argument("--reservoirs", type=int, help="number of reservoirs (overrides --scale)")
+    parser.add_argument("--first-year", type=int, default=1990)
+    parser.add_argument("--last-year", type=int, default=2023)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    n_entities = args.entities or max(1, round(len(REGIONS["America"]) * args.scale))
+    n_reservoirs = args.reservoirs or max(1, round(BASE_RESERVOIRS * args.scale))
+    for path in write_dataset(args.directory, n_entities, n_reservoirs, args.first_year, args.last_year, args.seed):
+        print(f"{path} ({path.stat().st_size / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""Per-rerun timing spans, cache statistics and memory, for diagnosing slow reruns.
+
+The app opens a trace at the top of each rerun and closes it at the end;
+code in between marks named spans::
+
+    with span("plotly_chart"):
+        st.plotly_chart(fig)
+
+Spans nest: the recorded name is the path, e.g. ``section/chart/plotly_chart``,
+and repeated spans add up. A closed trace is one JSON object with every span,
+the hit rates of the process-level caches and the process memory, written as
+one log line to the ``ccs.trace`` logger.
+
+Tracing is off unless a trace is open. Then ``span()`` is a context-variable
+lookup that returns a shared no-op context manager, so spans can stay in hot
+code.
+"""
+import contextvars
+import functools
+import importlib
+import json
+import logging
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger("ccs.trace")
+
+# Process-level caches reported with each trace: (label, module, attribute).
+# Only modules that are already imported are inspected.
+CACHES = [
+    ("catalog", "ccs.catalog", "_load"),
+    ("reservoir capacities", "ccs.capacity", "_capacities"),
+    ("balance rollup", "ccs.balance", "_balance"),
+    ("balance figures", "ccs.figures", "_balance_figure"),
+    ("emissions figures", "ccs.figures", "_emissions_figure"),
+    ("projections", "ccs.forecast", "_projection"),
+    ("sensitivity", "ccs.sensitivity", "_cached_sensitivity"),
+    ("country matching", "ccs.matching", "_country_match"),
+    ("spatial index", "ccs.spatial", "catalog_index"),
+    ("map HTML", "ccs.maps", "_map_html"),
+    ("viewport layers", "ccs.maps", "_viewport_layer"),
+]
+
+_current = contextvars.ContextVar("ccs_trace", default=None)
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    __slots__ = ("trace", "name", "start")
+
+    def __init__(self, trace, name):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.trace.stack.append(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        path = "/".join(self.trace.stack)
+        self.trace.stack.pop()
+        total, calls = self.trace.spans.get(path, (0.0, 0))
+        self.trace.spans[path] = (total + elapsed, calls + 1)
+        return False
+
+
+class Trace:
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+        self.spans = {}  # path -> (seconds, calls), in first-entered order
+        self.stack = []
+        self.start = time.perf_counter()
+        self.token = None
+        self.record = None
+
+
+def span(name):
+    """Context manager timing ``name`` inside the open trace; a no-op when none is open."""
+    trace = _current.get()
+    if trace is None:
+        return _NO_SPAN
+    return _Span(trace, name)
+
+
+def traced(name):
+    """Decorator form of ``span``."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def enabled():
+    return _current.get() is not None
+
+
+def annotate(**fields):
+    """Add ``fields`` to the open trace's log record; a no-op when none is open."""
+    trace = _current.get()
+    if trace is not None:
+        trace.fields.update(fields)
+
+
+def start(name, **fields):
+    """Open a trace for this thread's rerun; ``fields`` are copied into its log record."""
+    trace = Trace(name, fields)
+    trace.token = _current.set(trace)
+    return trace
+
+
+def finish(trace):
+    """Close ``trace``, log it as one JSON line and return the record."""
+    total = time.perf_counter() - trace.start
+    _current.reset(trace.token)
+    trace.record = {
+        "event": trace.name,
+        "timestamp": time.time(),
+        **trace.fields,
+        "total_ms": total * 1000,
+        "spans": [{"name": path, "ms": seconds * 1000, "calls": calls}
+                  for path, (seconds, calls) in trace.spans.items()],
+        "caches": cache_stats(),
+        "memory": memory(),
+    }
+    logger.info(json.dumps(trace.record, ensure_ascii=False, default=str))
+    return trace.record
+
+
+def cache_stats():
+    """Hits, misses and size of the process-level caches whose modules are loaded."""
+    stats = []
+    for label, module_name, attr in CACHES:
+        if module_name not in sys.modules:
+            continue
+        info = getattr(importlib.import_module(module_name), attr).cache_info()
+        calls = info.hits + info.misses
+        stats.append({"cache": label, "hits": info.hits, "misses": info.misses, "size": info.currsize,
+                      "hit_rate": info.hits / calls if calls else None})
+    if "ccs.emissions" in sys.modules:
+        store = sys.modules["ccs.emissions"].get_store().stats()
+        calls = store["hits"] + store["misses"]
+        stats.insert(0, {"cache": "emissions store", "hits": store["hits"], "misses": store["misses"],
+                         "size": int(store["version"] > 0), "hit_rate": store["hit_rate"] if calls else None})
+    return stats
+
+
+def memory():
+    """Current and peak resident memory of the process, in MiB."""
+    peak_mib = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak_mib = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    try:
+        with open("/proc/self/statm") as f:
+            rss_mib = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except OSError:
+        rss_mib = None
+    return {"rss_mib": rss_mib, "peak_rss_mib": peak_mib}
+
+
+def configure_logging(path=None):
+    """Send trace lines to ``path`` (``"-"`` for stderr) unless ``ccs.trace`` already has a handler."""
+    if logger.handlers:
+        return
+    handler = logging.StreamHandler(sys.stderr) if path in (None, "-") else logging.FileHandler(path, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
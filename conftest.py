@@ -0,0 +1 @@
+"""Lets ``pytest`` import ``ccs`` and ``sections`` from the repository root."""
@@ -0,0 +1,61 @@
+"""App sections, each imported the first time it is selected.
+
+Every section module has a ``render()`` function that draws the page; the
+module itself, and with it Plotly, folium and the data modules it uses, is
+only imported when the user first opens that section. ``show()`` records how
+long the import took and how long each render took, per section, in
+``TIMINGS`` and in the ``ccs.app`` log.
+
+``python -m sections`` measures a cold import and first render of every
+section in fresh processes, for tracking startup regressions.
+"""
+import importlib
+import logging
+import threading
+import time
+
+from ccs.tracing import span
+
+SECTIONS = {
+    "CO₂ Emissions Volume": "sections.emissions",
+    "Geological Storage Capacity": "sections.capacity",
+    "Carbon balance and emission removal": "sections.balance",
+    "Reservoirs Location": "sections.locations",
+}
+
+logger = logging.getLogger("ccs.app")
+
+# {section: {"import_ms", "first_render_ms", "last_render_ms", "renders"}} for this server process
+TIMINGS = {}
+_lock = threading.Lock()
+
+
+def load(section):
+    """Section module, importing and timing it on first use."""
+    name = SECTIONS[section]
+    start = time.perf_counter()
+    with span("import"):
+        module = importlib.import_module(name)
+    elapsed = (time.perf_counter() - start) * 1000
+    with _lock:
+        timing = TIMINGS.setdefault(section, {"renders": 0})
+        if "import_ms" not in timing:
+            timing["import_ms"] = elapsed
+            logger.info("section %r imported in %.1f ms", section, elapsed)
+    return module
+
+
+def show(section):
+    """Render ``section``, timing the render."""
+    module = load(section)
+    start = time.perf_counter()
+    with span("render"):
+        module.render()
+    elapsed = (time.perf_counter() - start) * 1000
+    with _lock:
+        timing = TIMINGS[section]
+        timing["renders"] += 1
+        timing["last_render_ms"] = elapsed
+        if timing["renders"] == 1:
+            timing["first_render_ms"] = elapsed
+            logger.info("section %r first render in %.1f ms", section, elapsed)
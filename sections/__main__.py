@@ -0,0 +1,59 @@
+"""Cold import and first-render time of every app section, each in a fresh process.
+
+    python -m sections            # table
+    python -m sections --json     # one JSON object per line, for tracking over commits
+
+Each section is rendered once in Streamlit's test runner, so the numbers
+include data loading and building the section's charts, but not the browser.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from sections import SECTIONS
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Runs in the child process: imports and renders one section, prints its timings
+PROBE = """
+import json, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+streamlit_ms = (time.perf_counter() - start) * 1000
+
+# The test runner shares this process's modules, so the timings are readable afterwards
+at = AppTest.from_string("import os, sections; sections.show(os.environ['CCS_SECTION'])", default_timeout=600)
+at.run()
+if at.exception:
+    raise SystemExit(at.exception[0].value)
+import os, sections
+timing = sections.TIMINGS[os.environ["CCS_SECTION"]]
+print(json.dumps({"streamlit_import_ms": streamlit_ms, "import_ms": timing["import_ms"],
+                  "first_render_ms": timing["first_render_ms"]}))
+"""
+
+
+def measure(section):
+    env = {**os.environ, "CCS_SECTION": section, "PYTHONPATH": str(ROOT)}
+    out = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return {"section": section, **json.loads(out.stdout.strip().splitlines()[-1])}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold import and first render of every app section")
+    parser.add_argument("--json", action="store_true", help="print one JSON object per section")
+    args = parser.parse_args(argv)
+
+    for section in SECTIONS:
+        result = measure(section)
+        if args.json:
+            print(json.dumps(result, ensure_ascii=False))
+        else:
+            print(f"{section:<40} import {result['import_ms']:8.1f} ms   first render {result['first_render_ms']:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Carbon balance and emission removal: balance rollup, projections and source–sink matching."""
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from ccs.balance import BALANCE_COLUMNS, balance, children
+from ccs.catalog import load_catalog
+from ccs.cube import load_cube
+from ccs.figures import balance_figure
+from ccs.forecast import DEFAULT_HORIZON, DEFAULT_WINDOW, MODELS, projection_frame, years_to_fill
+from ccs.matching import capacity_values, country_match, match, read_emitters
+from ccs.regions import REGION_TREE, REGIONS
+from ccs.tracing import span
+
+AMERICA_TITLE = "Emission balance in America"
+
+
+def america_table(df_balance):
+    """America's regions followed by America's own total row."""
+    return pd.concat([children(df_balance, "America"), df_balance[df_balance["Name"] == "America"]])
+
+
+def region_title(region):
+    return f"Emission balance by country in {region}"
+
+
+def render():
+    st.subheader("🟢 Carbon balance and emission removal")
+    st.markdown("""
+        Visualize the *carbon balance* and the *% of CO₂ emission removal* at different levels:
+    """)
+
+    # Every level of the country → region → America tree, computed once per data version
+    with span("rollup"):
+        df_balance = balance()
+    balance_format = {
+        "CO₂ emissions (Mt)": "{:.2f}",
+        "CO₂ stored (Mt)": "{:.2f}",
+        "CO₂ not stored (Mt)": "{:.2f}",
+        "% Removal": "{:.2f}%"
+    }
+
+    with st.expander("🌎 Total balance - America"):
+        df_america = america_table(df_balance)
+
+        with span("dataframe"):
+            st.dataframe(
+                df_america[["Name", *BALANCE_COLUMNS]].rename(columns={"Name": "Region"})
+                .style.format(balance_format).set_properties(**{'text-align': 'center'}),
+                hide_index=True
+            )
+
+        with span("plotly_chart"):
+            st.plotly_chart(balance_figure(df_america, AMERICA_TITLE), use_container_width=True)
+
+    for region in REGION_TREE["America"]:
+        with st.expander(f"🟢 Balance - {region}"):
+            df_region = children(df_balance, region)
+            region_total = df_balance[df_balance["Name"] == region].iloc[0]
+
+            with span("dataframe"):
+                st.dataframe(
+                    df_region[["Name", *BALANCE_COLUMNS]].rename(columns={"Name": "Country"})
+                    .style.format(balance_format, na_rep="—").set_properties(**{'text-align': 'center'}),
+                    hide_index=True
+                )
+
+            st.metric(f"Total % removal {region}", f"{region_total['% Removal']:.2f}%")
+            st.metric("Total CO₂ stored", f"{region_total['CO₂ stored (Mt)']:.2f} Mt CO₂")
+
+            with span("plotly_chart"):
+                st.plotly_chart(balance_figure(df_region, region_title(region)),
+                                use_container_width=True)
+
+    with st.expander("🌍 Balance - Country"):
+        df_countries = df_balance[df_balance["Level"] == "Country"]
+        selected_countries = st.multiselect(
+            "Select countries:",
+            df_countries["Name"]
+        )
+
+        df_selected = df_countries[df_countries["Name"].isin(selected_countries)]
+
+        with span("dataframe"):
+            st.dataframe(
+                df_selected[["Name", "CO₂ emissions (Mt)", "CO₂ stored (Mt)", "% Removal"]]
+                .rename(columns={"Name": "Country", "CO₂ stored (Mt)": "CO₂ Removed (Mt)"})
+                .style.format(
+                    {
+                        "CO₂ emissions (Mt)": "{:.2f}",
+                        "CO₂ Removed (Mt)": "{:.2f}",
+                        "% Removal": "{:.2f}%"
+                    }
+                ).set_properties(**{'text-align': 'center'}),
+                use_container_width=True,
+                hide_index=True
+            )
+
+        with span("plotly_chart"):
+            st.plotly_chart(balance_figure(df_selected, "Emission balance by selected countries"),
+                            use_container_width=True)
+
+    # --- Emission projections and years until storage is full ---
+    with st.expander("⏳ Projected emissions and years to fill storage"):
+        st.markdown("""
+            Trend models fitted to the last years of every country and source, projected forward.
+            *Years to fill* counts how many years of projected emissions the reservoirs could absorb,
+            starting the year after the last historical one.
+        """)
+        col_model, col_window, col_horizon = st.columns(3)
+        trend_model = col_model.selectbox("Trend model:", list(MODELS))
+        history_years = len(load_cube().years)
+        trend_window = col_window.slider("Fitted years:", 5, history_years, min(DEFAULT_WINDOW, history_years))
+        trend_horizon = col_horizon.slider("Projection horizon (years):", 10, 200, DEFAULT_HORIZON, step=10)
+
+        catalog = load_catalog()
+        storage = pd.Series(catalog["Capacity (Mt)"]).groupby(catalog["Country"]).sum().to_dict()
+        with span("years_to_fill"):
+            df_fill = years_to_fill(storage, trend_model, trend_window, trend_horizon)
+        fill_format = {col: "{:.2f}" for col in df_fill.columns[2:]}
+        fill_format["Years to fill"] = lambda years: "∞" if years == float("inf") else f"{years:.1f}"
+        with span("dataframe"):
+            st.dataframe(df_fill.style.format(fill_format, na_rep="—"),
+                         use_container_width=True, hide_index=True)
+        st.caption("∞: the projected emissions do not fill the storage within the horizon.")
+
+        projected = st.selectbox("Projection for:", list(REGIONS) + [c for c in load_cube().countries])
+        with span("projection"):
+            df_projection = projection_frame(country=None if projected in REGIONS else projected,
+                                             region=projected if projected in REGIONS else None,
+                                             model=trend_model, window=trend_window, horizon=trend_horizon)
+        fig = px.line(df_projection, x="Year", y="Emissions (Mt)", color="Series",
+                      title=f"Emissions and projection - {projected}")
+        fig.update_layout(title_x=0.5, legend=dict(orientation="h", y=-0.3, x=0.5, xanchor="center"))
+        with span("plotly_chart"):
+            st.plotly_chart(fig, use_container_width=True)
+
+    # --- Source–sink matching (transportation problem over the reservoir catalog) ---
+    with st.expander("🔗 Source–sink matching"):
+        st.markdown("""
+            Allocates emissions to the storage sites of the catalog, minimising transport distance
+            without exceeding any site's capacity.
+        """)
+        catalog = load_catalog()
+        capacity_options = {"Catalog capacity": "Capacity (Mt)", "Equation 1 (volumetric)": "Eq. 1 (Mt)",
+                            "Equation 2 (OOIP)": "Eq. 2 (Mt)"}
+        col_source, col_capacity = st.columns(2)
+        source_type = col_source.radio("Emission sources:", ["Country emissions", "Point emitters (CSV)"])
+        capacity_basis = col_capacity.selectbox("Reservoir capacity:", list(capacity_options))
+
+        match_result = None
+        if source_type == "Country emissions":
+            cube = load_cube()
+            last_year = int(cube.years[-1])
+            match_years = st.slider("Emission years:", int(cube.years[0]), last_year, (last_year, last_year))
+            st.caption("Each country's emissions are placed at its geographic center.")
+            with span("matching"):
+                match_result = country_match(match_years, catalog, capacity_options[capacity_basis])
+        else:
+            uploaded = st.file_uploader("CSV with Source, Latitude, Longitude and Emissions (Mt) columns", type="csv")
+            if uploaded is not None:
+                try:
+                    emitters = read_emitters(uploaded)
+                except ValueError as error:
+                    st.error(str(error))
+                else:
+                    with span("matching"):
+                        match_result = match(emitters, catalog, capacity_values(catalog, capacity_options[capacity_basis]))
+
+        if match_result is not None:
+            col_a, col_b, col_c = st.columns(3)
+            col_a.metric("CO₂ allocated", f"{match_result.allocated:.2f} Mt")
+            col_b.metric("CO₂ without storage", f"{match_result.unallocated:.2f} Mt")
+            mean_km = match_result.cost / match_result.allocated if match_result.allocated else 0.0
+            col_c.metric("Mean transport distance", f"{mean_km:.0f} km")
+
+            with span("dataframe"):
+                st.dataframe(match_result.sources.style.format({
+                    "Emissions (Mt)": "{:.2f}", "Allocated (Mt)": "{:.2f}", "Unallocated (Mt)": "{:.2f}",
+                    "% Allocated": "{:.2f}%", "Mean distance (km)": "{:.0f}"
+                }, na_rep="—"), use_container_width=True, hide_index=True)
+            with span("dataframe"):
+                st.dataframe(match_result.flows[["Source", "Reservoir", "Country", "Distance (km)", "Flow (Mt)"]]
+                             .style.format({"Distance (km)": "{:.0f}", "Flow (Mt)": "{:.2f}"}),
+                             use_container_width=True, hide_index=True)
+
+            df_sinks = match_result.sinks[match_result.sinks["Capacity (Mt)"] > 0]
+            fig = go.Figure()
+            fig.add_bar(x=df_sinks["Reservoir"], y=df_sinks["Stored (Mt)"], name="Allocated",
+                        marker_color="#6AA84F")
+            fig.add_bar(x=df_sinks["Reservoir"], y=df_sinks["Capacity (Mt)"] - df_sinks["Stored (Mt)"],
+                        name="Remaining capacity", marker_color="silver")
+            fig.update_layout(title="Reservoir capacity used by the allocation", barmode="stack",
+                              yaxis_title="CO₂ (Mt)", legend=dict(orientation="h", y=-0.4, x=0.5, xanchor="center"),
+                              title_x=0.5)
+            with span("plotly_chart"):
+                st.plotly_chart(fig, use_container_width=True)
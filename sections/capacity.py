@@ -0,0 +1,188 @@
+"""Geological Storage Capacity: reservoir capacities, probabilistic ranges and sensitivity."""
+import functools
+
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from ccs.capacity import load_inputs
+from ccs.catalog import load_catalog
+from ccs.montecarlo import simulate
+from ccs.sensitivity import reservoir_sensitivity
+from ccs.tracing import span
+
+MC_SAMPLES = [10_000, 100_000, 1_000_000]
+
+
+@functools.lru_cache(maxsize=4)
+def country_totals(catalog):
+    """Total capacity per country, shared by every session until the catalog changes."""
+    df = catalog.frame(columns=["Country", "Capacity (Mt)"])
+    return df.groupby("Country", as_index=False)["Capacity (Mt)"].sum().round(2)
+
+
+@st.cache_data(show_spinner="Running Monte Carlo simulation...")
+def probabilistic_capacity(n_samples, membership, catalog_version):
+    """Monte Carlo P90/P50/P10 of the reservoirs in ``membership`` (Reservoir, Country, Region) only.
+
+    ``catalog_version`` covers ``reservoir_inputs.csv``, so an edited input file is simulated again.
+    """
+    inputs = load_inputs()
+    inputs = inputs[inputs["Reservoir"].isin(membership["Reservoir"])]
+    membership = membership.set_index("Reservoir")
+    # In the server process: forking a threaded process for a pool can deadlock.
+    # The process pool is for ccs.montecarlo batch runs.
+    return simulate(inputs, n_samples, workers=1,
+                    groups={"Country": membership["Country"], "Region": membership["Region"]})
+
+
+def render():
+    st.subheader("🛢️ Geological Storage Capacity")
+    st.markdown("""
+    Here you can explore the **CO₂ geological storage capacity**.  
+    First, select a **Region**, then one or more **countries** from that region.  
+    If you select **America**, you will only see the total storage capacity per country.  
+    """)
+
+    # Reservoirs come from the shared catalog (ccs.catalog); capacities from the notebook's equations
+    with span("data"):
+        catalog = load_catalog()
+    df_reservoirs = catalog.frame(columns=["Region", "Country", "Reservoir", "Capacity (Mt)", "Depth (m)",
+                                           "Thickness (m)", "Porosity (%)", "Permeability (mD)"])
+
+    region_options = catalog.regions + ["America"]
+    region = st.selectbox("🌎 Select region:", region_options)
+
+    region_filter = None if region == "America" else region
+    region_rows = catalog.rows(region=region_filter)
+    df_region = df_reservoirs.loc[region_rows]
+
+    countries = st.multiselect("🏳️ Select country/countries:", catalog.countries_in(region_rows))
+
+    if countries:
+        df_countries = df_reservoirs.loc[catalog.rows(country=countries, region=region_filter)]
+
+        if region == "America":
+            df_country_total = country_totals(catalog)
+            df_country_total = df_country_total[df_country_total["Country"].isin(countries)].reset_index(drop=True)
+
+            st.subheader("🏳️ Total Capacity by Country")
+            with span("dataframe"):
+                st.dataframe(df_country_total.style.format({"Capacity (Mt)": "{:.2f}"}), use_container_width=True)
+
+            fig_country = px.bar(df_country_total, x="Country", y="Capacity (Mt)",
+                                 color="Country", text="Capacity (Mt)",
+                                 title="📊 Total Capacity per Country in America")
+            with span("plotly_chart"):
+                st.plotly_chart(fig_country, use_container_width=True)
+
+            st.metric(label="Total capacity (selected countries)",
+                      value=f"{df_country_total['Capacity (Mt)'].sum():.2f} Mt CO₂")
+
+        else:
+            df_countries["Reservoir_Display"] = df_countries["Country"] + " - " + df_countries["Reservoir"]
+            selected_display_reservoirs = st.multiselect(
+                "🛢️ Select reservoir(s):",
+                df_countries["Reservoir_Display"].unique()
+            )
+
+            if selected_display_reservoirs:
+                df_selected = df_countries[df_countries["Reservoir_Display"].isin(selected_display_reservoirs)]
+                st.subheader("🛢️ Selected Reservoir Data")
+                with span("dataframe"):
+                    st.dataframe(
+                        df_selected[
+                            ["Region", "Country", "Reservoir", "Capacity (Mt)", "Depth (m)", "Thickness (m)", "Porosity (%)",
+                             "Permeability (mD)"]]
+                        .style.format({
+                            "Capacity (Mt)": "{:.2f}",
+                            "Depth (m)": "{:.2f}",
+                            "Thickness (m)": "{:.2f}",
+                            "Porosity (%)": "{:.2f}",
+                            "Permeability (mD)": "{:.2f}"
+                        }).set_properties(**{'text-align': 'center'}),
+                        use_container_width=True
+                    )
+
+                if len(selected_display_reservoirs) == 1:
+                    st.metric(label="Selected reservoir capacity",
+                              value=f"{df_selected['Capacity (Mt)'].values[0]:.2f} Mt CO₂")
+
+                st.metric(label="Total capacity of selected reservoir(s)",
+                          value=f"{df_selected['Capacity (Mt)'].sum():.2f} Mt CO₂")
+                st.metric(label=f"Total capacity in {region}",
+                          value=f"{df_region['Capacity (Mt)'].sum():.2f} Mt CO₂")
+
+                fig = px.bar(df_selected, x="Reservoir", y="Capacity (Mt)",
+                             color="Country", text="Capacity (Mt)",
+                             title=f"📊 Capacity per selected reservoir(s)")
+                with span("plotly_chart"):
+                    st.plotly_chart(fig, use_container_width=True)
+
+        # --- Probabilistic capacity (Monte Carlo over ϕ, Sw, h, Rf and A) ---
+        with st.expander("🎲 Probabilistic capacity (P90 / P50 / P10)"):
+            # Only the selected countries' reservoirs are simulated, and only once asked for
+            membership = df_countries[["Reservoir", "Country", "Region"]].reset_index(drop=True)
+            with st.form("monte_carlo"):
+                n_samples = st.select_slider("Monte Carlo samples", options=MC_SAMPLES, value=100_000)
+                if st.form_submit_button("Run simulation"):
+                    st.session_state["monte_carlo_run"] = (n_samples, tuple(membership["Reservoir"]))
+            if st.session_state.get("monte_carlo_run") == (n_samples, tuple(membership["Reservoir"])):
+                with span("monte_carlo"):
+                    mc = probabilistic_capacity(n_samples, membership, catalog.version)
+            else:
+                mc = None
+                st.caption(f"Simulates the {len(membership)} reservoir(s) of the selected countries.")
+
+            if mc is not None and not mc:
+                st.info("None of the selected reservoirs has published inputs for Equation 1.")
+            elif mc:
+                st.caption("P90 is the low estimate (exceeded with 90% probability), P10 the high one. "
+                           "ϕ, Sw, h and Rf vary ±20% and the area ±30% around each reservoir's inputs.")
+
+                mc_fmt = {col: "{:.2f}" for col in ["P90", "P50", "P10", "Mean"]}
+                df_mc = mc["Reservoir"].merge(df_countries[["Country", "Reservoir"]], on="Reservoir")
+                with span("dataframe"):
+                    st.dataframe(df_mc[["Country", "Reservoir", "P90", "P50", "P10", "Mean"]].style.format(mc_fmt),
+                                 use_container_width=True)
+                with span("dataframe"):
+                    st.dataframe(mc["Country"].style.format(mc_fmt), use_container_width=True)
+                if region == "America":
+                    st.caption("Regional ranges cover the selected countries only.")
+                    with span("dataframe"):
+                        st.dataframe(mc["Region"].style.format(mc_fmt), use_container_width=True)
+
+                reported_only = sorted(set(df_countries["Reservoir"]) - set(mc["Reservoir"]["Reservoir"]))
+                if reported_only:
+                    st.caption("Reported capacity only, not simulated: " + ", ".join(reported_only))
+
+        # --- Sensitivity (one-at-a-time tornado over the capacity inputs) ---
+        with st.expander("🌪️ Sensitivity analysis (tornado)"):
+            with span("sensitivity"):
+                df_sens = reservoir_sensitivity(df_countries["Reservoir"])
+            if df_sens.empty:
+                st.info("None of the selected reservoirs has published inputs for Equation 1.")
+            else:
+                targets = list(df_sens["Reservoir"].unique())
+                target = st.selectbox("🛢️ Reservoir:", targets, index=len(targets) - 1,
+                                      format_func=lambda r: "All selected reservoirs" if r == "Total" else r)
+                df_target = df_sens[df_sens["Reservoir"] == target].iloc[::-1]
+                base_mt = df_target["Base (Mt)"].iloc[0]
+
+                fig_tornado = go.Figure()
+                fig_tornado.add_trace(go.Bar(y=df_target["Parameter"], x=df_target["Low (Mt)"] - base_mt,
+                                             base=base_mt, orientation="h", name="Low end of range"))
+                fig_tornado.add_trace(go.Bar(y=df_target["Parameter"], x=df_target["High (Mt)"] - base_mt,
+                                             base=base_mt, orientation="h", name="High end of range"))
+                fig_tornado.add_vline(x=base_mt, line_dash="dash", annotation_text=f"Base {base_mt:.2f} Mt")
+                fig_tornado.update_layout(barmode="overlay", xaxis_title="Capacity (Mt)",
+                                          title="📊 Capacity response to each input")
+                with span("plotly_chart"):
+                    st.plotly_chart(fig_tornado, use_container_width=True)
+
+                st.caption("ϕ, h, Sw and Rf vary ±20%, the area ±30%, pressure ±10% and temperature ±10 K. "
+                           "Elasticity is the % change in capacity per 1% change of the input.")
+                with span("dataframe"):
+                    st.dataframe(df_target.iloc[::-1].drop(columns="Reservoir").style.format(
+                        {"Low (Mt)": "{:.2f}", "Base (Mt)": "{:.2f}", "High (Mt)": "{:.2f}",
+                         "Swing (Mt)": "{:.2f}", "Elasticity": "{:.2f}"}), use_container_width=True)
@@ -0,0 +1,144 @@
+"""CO₂ Emissions Volume: totals, tables and charts by country or region and source.
+
+The tables, totals, chart data and figure are nodes of a small computation
+graph (``ccs.graph``) keyed on the normalized widget values. Each session
+keeps the last result of every node, so a rerun only recomputes what the
+changed widget feeds: switching Line to Bar rebuilds the figure and nothing
+else.
+"""
+import streamlit as st
+
+from ccs.cube import load_cube
+from ccs.figures import emissions_figure
+from ccs.graph import Graph
+from ccs.regions import REGIONS
+from ccs.rollups import RESOLUTIONS
+from ccs.tracing import span
+
+COLOR_MAP = {
+    "Coal": "crimson",
+    "Oil": "green",
+    "Gas": "gray",
+    "Cement": "skyblue",
+    "Flaring": "darkorange"
+}
+
+GRAPH = Graph("emissions")
+
+
+# --- Table View nodes ---
+@GRAPH.node("cube", "table_mode", "table_target", "table_years", "table_source")
+def table_frame(cube, mode, target, years, source):
+    if mode == "Country":
+        return cube.country_table(target, years, source)
+    return cube.region_table(target, years, source)
+
+
+@GRAPH.node("cube", "table_mode", "table_target", "table_years", "table_source")
+def table_total(cube, mode, target, years, source):
+    if mode == "Country":
+        return cube.country_total(target, years, source)
+    return cube.region_total(target, years, source)
+
+
+@GRAPH.node(after=("table_frame",))
+def table_styler(df):
+    return df.style.set_properties(**{'text-align': 'center'})
+
+
+# --- Chart View nodes ---
+@GRAPH.node("cube", "chart_mode", "chart_x_axis", "chart_target", "chart_years", "chart_sources", "resolution")
+def chart_frame(cube, mode, x_axis, target, years, sources, resolution):
+    if x_axis == "Country":
+        return cube.by_country(years, sources, target)
+    where = {"country": target} if mode == "Country" else {"region": target}
+    if resolution == "Annual":
+        return cube.by_year(years, sources, **where)
+    # Coarser periods are read from the cube's precomputed rollups
+    return cube.by_period(years, sources, resolution, **where)
+
+
+@GRAPH.node("chart_type", "chart_x_axis", "resolution", "chart_sources", after=("chart_frame",))
+def chart_figure(chart_type, x_axis, resolution, sources, df):
+    # Long series are downsampled and large ones drawn with WebGL
+    x_column = "Period" if resolution != "Annual" else x_axis
+    return emissions_figure(df, x_column, chart_type, sources,
+                            f"{chart_type} of Emissions ({', '.join(sources)})", COLOR_MAP)
+
+
+def render():
+    st.subheader("📊 CO₂ Emissions Volume")
+    st.markdown("""
+    Here you can explore the **total emissions volume** by country or region 
+    for a defined year range. Use the filters below to select country, emission source, 
+    and year range.
+    """)
+
+    # --- Load and prepare data (shared cube with prefix sums, built once per process) ---
+    with span("data"):
+        cube = load_cube()
+    regions = REGIONS
+    year_min, year_max = int(cube.years[0]), int(cube.years[-1])
+    # A new data version is a new cube, which invalidates every node
+    graph = st.session_state.setdefault("emissions_graph", GRAPH.session())
+    graph.rerun(cube=cube)
+
+    # --- Table View ---
+    st.markdown("### Table View")
+    mode_table = st.radio("View table by:", ["Country", "Region"])
+    sources_table = cube.sources + ["All"]
+    source_table = st.selectbox("Select emission source:", sources_table, key="table_source")
+
+    years_table = st.slider("Select year range:", year_min, year_max, (year_min, year_max), key="table_years")
+
+    if mode_table == "Country":
+        target_table = st.selectbox("Select country:", cube.countries, key="table_country")
+    else:
+        target_table = st.selectbox("Select region:", list(regions.keys()), key="table_region")
+    graph.set(table_mode=mode_table, table_target=target_table, table_years=years_table, table_source=source_table)
+
+    with span("dataframe"):
+        st.dataframe(graph["table_styler"], use_container_width=True)
+    st.metric(label=f"Total emissions of {target_table} ({source_table})",
+              value=f"{round(graph['table_total'], 2)} Mt CO₂")
+
+    # --- Chart View ---
+    st.markdown("### 📈 Visualize Emissions")
+    chart_type = st.selectbox("Select chart type:", ["Line Chart", "Bar Chart"], key="chart_type")
+    mode_chart = st.radio("View chart by:", ["Country", "Region"], key="chart_mode")
+    sources_chart = st.multiselect(
+        "Select emission sources to display:",
+        options=cube.sources,
+        default=cube.sources,
+        key="chart_sources"
+    )
+    years_chart = st.slider("Select year range for chart:", year_min, year_max, (year_min, year_max), key="chart_years")
+
+    # X-axis selection
+    x_axis_options = ["Year"]
+    if mode_chart in ["Country", "Region"]:
+        x_axis_options.append("Country")
+    x_axis = st.selectbox("Select X-axis:", x_axis_options, key="chart_x_axis")
+    # Coarser periods are read from the cube's precomputed rollups
+    resolution = "Annual"
+    if x_axis == "Year":
+        resolution = st.radio("Resolution:", list(RESOLUTIONS), horizontal=True, key="chart_resolution")
+
+    # Chart target: a country over the years, otherwise a region
+    if mode_chart == "Country" and x_axis == "Year":
+        target_chart = st.selectbox("Select country for chart:", cube.countries, key="chart_country")
+    elif mode_chart == "Country":  # X-axis = Country
+        target_chart = st.selectbox("Select region for country comparison:", list(regions.keys()), key="chart_region")
+    else:
+        target_chart = st.selectbox("Select region for chart:", list(regions.keys()), key="chart_region")
+    graph.set(chart_type=chart_type, chart_mode=mode_chart, chart_x_axis=x_axis, chart_target=target_chart,
+              chart_years=years_chart, chart_sources=sources_chart, resolution=resolution)
+
+    with span("figure"):
+        fig, decimation = graph["chart_figure"]
+
+    with span("plotly_chart"):
+        st.plotly_chart(fig, use_container_width=True)
+    if decimation.describe():
+        st.caption(decimation.describe())
+    graph.log()
@@ -0,0 +1,64 @@
+"""Reservoirs Location: map of the storage sites, source–sink flows and nearest-site search."""
+import streamlit as st
+import streamlit.components.v1 as components
+from streamlit_folium import st_folium
+
+from ccs.catalog import load_catalog
+from ccs.cube import load_cube
+from ccs.maps import base_map, flow_layer, is_large, map_html, view_center, view_options, view_rows, viewport_layer
+from ccs.matching import country_match
+from ccs.spatial import catalog_index
+from ccs.tracing import span
+
+
+def render():
+    st.subheader("📍 Reservoirs Location")
+    st.markdown("""
+            Explore the main **geological storage reservoirs** across the Americas. 
+            Click on each marker to see details about the formation, thickness, porosity, and storage capacity.
+        """)
+
+    with span("data"):
+        catalog = load_catalog()
+    selected = st.selectbox("🌎 Select map view:", view_options(catalog))
+
+    # Flows of the country-level allocation for the latest year of emissions
+    show_flows = st.checkbox("Show source–sink flows (latest year of emissions)")
+    flows = None
+    if show_flows:
+        latest_year = int(load_cube().years[-1])
+        with span("matching"):
+            flows = country_match((latest_year, latest_year), catalog)
+
+    if is_large(catalog, selected):
+        # Large inventories: one clustered layer with only the points in the current viewport
+        map_key = f"reservoir_map_{selected}"
+        viewport = st.session_state.get(map_key) or {}
+        with span("viewport_layer"):
+            layer, markers, sites = viewport_layer(selected, catalog, viewport.get("bounds"), viewport.get("zoom"))
+        layers = [layer] if flows is None else [layer, flow_layer(flows)]
+        with span("st_folium"):
+            st_folium(base_map(selected), key=map_key, feature_group_to_add=layers,
+                      returned_objects=["bounds", "zoom"], width=800, height=500)
+        st.caption(f"{sites:,} of {len(view_rows(catalog, selected)):,} sites around the current view, "
+                   f"drawn as {markers:,} markers; zoom in to separate nearby sites.")
+    else:
+        # Map HTML is built once per view and catalog version (ccs.maps) and reused across reruns
+        with span("map_html"):
+            components.html(map_html(selected, catalog, flows), width=800, height=500)
+
+    # --- Nearest storage sites to a point (spatial index over the catalog) ---
+    with st.expander("🔎 Nearest storage sites to a location"):
+        center, _ = view_center(selected)
+        col_lat, col_lon, col_k = st.columns(3)
+        point_lat = col_lat.number_input("Latitude", -90.0, 90.0, float(center[0]))
+        point_lon = col_lon.number_input("Longitude", -180.0, 180.0, float(center[1]))
+        k = col_k.number_input("Sites", 1, min(50, len(catalog)), min(5, len(catalog)))
+
+        with span("nearest"):
+            distance_km, nearest_rows = catalog_index(catalog).nearest(point_lat, point_lon, k=int(k))
+        df_nearest = catalog.frame(nearest_rows[0], ["Country", "Reservoir", "Capacity (Mt)"])
+        df_nearest.insert(0, "Distance (km)", distance_km[0])
+        with span("dataframe"):
+            st.dataframe(df_nearest.style.format({"Distance (km)": "{:.0f}", "Capacity (Mt)": "{:.2f}"}),
+                         use_container_width=True, hide_index=True)
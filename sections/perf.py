@@ -0,0 +1,38 @@
+"""Opt-in performance panel in the sidebar, fed by ``ccs.tracing``.
+
+Tracing is on when the server runs with ``CCS_TRACE=1`` or the page is opened
+with ``?trace=1``. Each traced rerun is logged as one JSON line, to
+``CCS_TRACE_LOG`` if set or to stderr, and summarised in the sidebar.
+"""
+import os
+
+import pandas as pd
+import streamlit as st
+
+from ccs import tracing
+
+
+def requested():
+    return os.environ.get("CCS_TRACE", "") not in ("", "0") or st.query_params.get("trace") == "1"
+
+
+def start(section):
+    tracing.configure_logging(os.environ.get("CCS_TRACE_LOG"))
+    return tracing.start("rerun", section=section)
+
+
+def render_panel(record):
+    with st.sidebar.expander("⏱️ Performance", expanded=True):
+        st.metric("Rerun", f"{record['total_ms']:.0f} ms")
+        spans = pd.DataFrame(record["spans"], columns=["name", "ms", "calls"])
+        spans["% of rerun"] = spans["ms"] / record["total_ms"] * 100
+        st.dataframe(spans.style.format({"ms": "{:.1f}", "% of rerun": "{:.0f}%"}),
+                     hide_index=True, use_container_width=True)
+
+        caches = pd.DataFrame(record["caches"], columns=["cache", "hits", "misses", "size", "hit_rate"])
+        st.dataframe(caches.style.format({"hit_rate": "{:.0%}"}, na_rep="—"),
+                     hide_index=True, use_container_width=True)
+
+        memory = record["memory"]
+        st.caption(f"Memory: {memory['rss_mib'] or 0:.0f} MiB resident, "
+                   f"{memory['peak_rss_mib'] or 0:.0f} MiB peak")
@@ -0,0 +1,204 @@
+"""Optional background warm-up of the shared caches when the server starts.
+
+The first user to open a section otherwise pays for importing it, loading
+and reshaping the data, and building its figures and maps. The warm-up does
+that work in a small thread pool instead: the emissions cube with its
+rollups, the default chart of every region and country, the balance rollup
+and its figures, the default projections and source–sink allocation, the
+capacity estimates with the per-country capacity and sensitivity tables, and
+the map of every view. It fills
+the same process-level caches the sections read, so it has to run in the
+server process; a process pool would warm caches nobody reads.
+
+Nothing waits for it. A request that arrives first computes what it needs
+itself or, for the emissions data, waits on the store lock for the load
+already in progress instead of starting a second one.
+
+Start the server with the warm-up already running::
+
+    python -m sections.warmup [streamlit run options]
+
+or set ``CCS_WARMUP=1`` with ``streamlit run ccs_app.py`` to start it on the
+first script run.
+"""
+import importlib
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import sections
+
+logger = logging.getLogger("ccs.app")
+
+# Background threads; kept low so a request arriving meanwhile still gets the CPU
+WORKERS = 2
+
+# {task: ms} for the tasks finished so far in this server process
+TIMINGS = {}
+_lock = threading.Lock()
+_thread = None
+
+
+def requested():
+    return os.environ.get("CCS_WARMUP", "") not in ("", "0")
+
+
+def _emissions_cube():
+    from ccs.cube import load_cube
+
+    load_cube()
+
+
+def _emissions_charts():
+    from ccs.cube import load_cube
+    from ccs.regions import COUNTRY_CENTER, REGIONS
+    from sections import emissions
+
+    cube = load_cube()
+    years = (int(cube.years[0]), int(cube.years[-1]))
+    sources = tuple(cube.sources)  # the chart's default selection
+    targets = [("Region", region) for region in REGIONS]
+    targets += [("Country", country) for country in COUNTRY_CENTER if country in cube.country_index]
+    for mode, target in targets:
+        df = emissions.chart_frame(cube, mode, "Year", target, years, sources, "Annual")
+        emissions.chart_figure("Line Chart", "Year", "Annual", sources, df)
+
+
+def _balance_figures():
+    from ccs.balance import balance, children
+    from ccs.figures import balance_figure
+    from ccs.regions import REGION_TREE
+    from sections import balance as view
+
+    df_balance = balance()
+    balance_figure(view.america_table(df_balance), view.AMERICA_TITLE)
+    for region in REGION_TREE["America"]:
+        balance_figure(children(df_balance, region), view.region_title(region))
+
+
+def _projections_and_matching():
+    from ccs import api, forecast
+    from ccs.catalog import load_catalog
+    from ccs.cube import load_cube
+    from ccs.matching import country_match
+    from ccs.regions import REGIONS
+
+    # The balance view's defaults: first model, up to DEFAULT_WINDOW fitted years, first region
+    cube = load_cube()
+    model, window = forecast.MODELS[0], min(forecast.DEFAULT_WINDOW, len(cube.years))
+    api.years_to_fill(model, window, forecast.DEFAULT_HORIZON)
+    forecast.projection_frame(region=next(iter(REGIONS)), model=model, window=window)
+    last_year = int(cube.years[-1])
+    country_match((last_year, last_year), load_catalog())
+
+
+def _capacity():
+    from ccs.capacity import default_capacities
+    from ccs.catalog import load_catalog
+    from ccs.regions import COUNTRY_CENTER
+    from ccs.sensitivity import reservoir_sensitivity
+    from ccs.spatial import catalog_index
+    from sections import capacity as view
+
+    default_capacities()
+    catalog = load_catalog()
+    catalog_index(catalog)
+    view.country_totals(catalog)
+    # The tornado of a single selected country, the view's most common first selection
+    for country in COUNTRY_CENTER:
+        rows = catalog.rows(country=country)
+        if len(rows):
+            reservoir_sensitivity(catalog["Reservoir"][rows])
+
+
+def _maps():
+    from ccs.catalog import load_catalog
+    from ccs.maps import is_large, map_html, view_options, viewport_layer
+
+    catalog = load_catalog()
+    for view in view_options(catalog):
+        if is_large(catalog, view):
+            viewport_layer(view, catalog)
+        else:
+            map_html(view, catalog)
+
+
+def imports():
+    """Section imports, run one after the other: Plotly's lazy submodule imports are not thread-safe.
+
+    Modules are imported directly rather than through ``sections.load`` so
+    ``sections.TIMINGS`` keeps the import cost seen by requests, not by the warm-up.
+    """
+    return [(f"import {name}", lambda module=module: importlib.import_module(module))
+            for name, module in sections.SECTIONS.items()]
+
+
+def tasks():
+    """``(name, callable)`` pairs run in the pool once the sections are imported."""
+    return [
+        ("emissions cube", _emissions_cube),
+        ("emissions charts", _emissions_charts),
+        ("balance", _balance_figures),
+        ("projections and matching", _projections_and_matching),
+        ("capacity", _capacity),
+        ("maps", _maps),
+    ]
+
+
+def _run(name, task):
+    start = time.perf_counter()
+    try:
+        task()
+    except Exception:
+        # A failed warm-up only means a slower first request; the view reports real errors itself
+        logger.exception("warm-up task %r failed", name)
+        return
+    elapsed = (time.perf_counter() - start) * 1000
+    with _lock:
+        TIMINGS[name] = elapsed
+    logger.info("warm-up %r done in %.0f ms", name, elapsed)
+
+
+def _warm(workers):
+    start = time.perf_counter()
+    for name, task in imports():
+        _run(name, task)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ccs-warmup") as pool:
+        for name, task in tasks():
+            pool.submit(_run, name, task)
+    logger.info("warm-up finished in %.0f ms", (time.perf_counter() - start) * 1000)
+
+
+def start(workers=WORKERS):
+    """Start the warm-up in a background thread, once per process, and return at once."""
+    global _thread
+    with _lock:
+        if _thread is not None:
+            return False
+        _thread = threading.Thread(target=_warm, args=(workers,), name="ccs-warmup", daemon=True)
+    _thread.start()
+    return True
+
+
+def done():
+    return _thread is not None and not _thread.is_alive()
+
+
+def main(argv=None):
+    """Start the warm-up, then the Streamlit server for ``ccs_app.py`` in the same process."""
+    # Streamlit, and with it Plotly, is imported before any warm-up thread runs
+    from streamlit.web import cli
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    start()
+    app = Path(__file__).resolve().parent.parent / "ccs_app.py"
+    sys.argv = ["streamlit", "run", str(app), *(sys.argv[1:] if argv is None else argv)]
+    sys.exit(cli.main())
+
+
+if __name__ == "__main__":
+    main()
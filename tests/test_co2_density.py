@@ -0,0 +1,22 @@
+"""Accuracy of the tabulated CO₂ density against the shipped CoolProp reference sample."""
+import numpy as np
+
+from ccs.co2_density import MAX_RELATIVE_ERROR, REFERENCE_PATH, co2_density, default_table, reference_error
+
+
+def test_interpolation_error_within_bound():
+    assert reference_error() <= MAX_RELATIVE_ERROR
+
+
+def test_reference_sample_spans_the_table():
+    table = default_table()
+    with np.load(REFERENCE_PATH) as data:
+        P, T = data["pressure"], data["temperature"]
+    assert len(P) >= 1000
+    assert P.min() < table.pressure[0] + 5e6 and P.max() > table.pressure[-1] - 5e6
+    assert T.min() < table.temperature[0] + 10 and T.max() > table.temperature[-1] - 10
+
+
+def test_missing_inputs_stay_missing():
+    rho = co2_density(np.array([10e6, np.nan]), np.array([320.0, 320.0]))
+    assert np.isfinite(rho[0]) and np.isnan(rho[1])